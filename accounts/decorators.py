@@ -1,4 +1,6 @@
 from functools import wraps
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
@@ -93,4 +95,18 @@ def super_admin_required(view_func):
             return redirect('accounts:dashboard')
         
         return view_func(request, *args, **kwargs)
-    return _wrapped_view
\ No newline at end of file
+    return _wrapped_view
+
+def async_login_required(view_func):
+    """
+    login_required for async views (Django 4.2's decorator only wraps sync
+    views). The lazy request.user is loaded in a thread, so the view can
+    read its fields directly.
+    """
+    @wraps(view_func)
+    async def _wrapped_view(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+    return _wrapped_view
@@ -10,8 +10,8 @@ logger = logging.getLogger(__name__)
 def get_company_name():
     """Get company name from footer"""
     try:
-        from .models import Footer
-        footer = Footer.objects.first()
+        from .site_content import get_footer
+        footer = get_footer()
         return footer.company_name if footer and footer.company_name else 'AuraStay'
     except:
         return 'AuraStay'
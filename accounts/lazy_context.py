@@ -0,0 +1,37 @@
+import time
+from functools import wraps
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+def record_context_timing(request, name, seconds):
+    """Note that ``name`` was evaluated for ``request`` (see ContextTimingMiddleware)"""
+    request.__dict__.setdefault('_context_timings', []).append((name, seconds))
+
+def lazy_value(request, name, func):
+    """
+    Context value computed by ``func()`` only when a template first uses
+    it. In DEBUG the evaluation is timed under ``name``.
+    """
+    if not settings.DEBUG:
+        return SimpleLazyObject(func)
+
+    def evaluate():
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            record_context_timing(request, name, time.perf_counter() - started)
+    return SimpleLazyObject(evaluate)
+
+def timed_processor(processor):
+    """Time a context processor call in DEBUG"""
+    @wraps(processor)
+    def wrapper(request):
+        if not settings.DEBUG:
+            return processor(request)
+        started = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            record_context_timing(request, processor.__name__, time.perf_counter() - started)
+    return wrapper
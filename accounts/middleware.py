@@ -2,8 +2,13 @@ from django.shortcuts import redirect
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.urls import reverse
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from datetime import date
 from hotels.models import HotelSubscription
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SubscriptionMiddleware:
     """Middleware to check subscription status for non-superuser requests"""
@@ -67,4 +72,40 @@ class SubscriptionMiddleware:
                 ).exists()
             return True  # Default allow for other roles
         except:
-            return False
\ No newline at end of file
+            return False
+
+
+class ContextTimingMiddleware:
+    """
+    In DEBUG, report which context processors and lazy context values
+    were evaluated for the request and how long each took. The report is
+    logged and sent as a Server-Timing header for the browser dev tools.
+    """
+    
+    async_capable = True
+    sync_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_report(request, self.get_response(request))
+    
+    async def __acall__(self, request):
+        return self.add_report(request, await self.get_response(request))
+    
+    def add_report(self, request, response):
+        timings = request.__dict__.get('_context_timings')
+        if settings.DEBUG and timings:
+            logger.debug('Context for %s %s: %s', request.method, request.path, ', '.join(
+                f'{name} {seconds * 1000:.2f}ms' for name, seconds in timings
+            ))
+            response['Server-Timing'] = ', '.join(
+                f'ctx-{name};dur={seconds * 1000:.2f}' for name, seconds in timings
+            )
+        
+        return response
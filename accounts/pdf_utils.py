@@ -1,19 +1,130 @@
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.units import inch
+from reportlab.lib.units import inch, mm
 from reportlab.platypus.frames import Frame
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
+from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpResponse
 from datetime import datetime
+from functools import lru_cache
 import io
+import os
+
+BRANDING_CACHE_KEY = 'pdf_branding'
+
+# With a cache local to each process, saves only clear their own process;
+# the others pick up branding changes when the entry expires
+BRANDING_TIMEOUT = 60 * 5
+
+DEFAULT_FOOTER_TEXT = "© 2025 AuraStay. All rights reserved. | Design: MA Qureshi | Development: Momin Ali"
+
+@lru_cache(maxsize=None)
+def get_pdf_styles():
+    """Sample style sheet plus the shared AuraStay PDF styles, built once per process"""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        'AuraTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=15,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#1e3a8a')
+    ))
+    styles.add(ParagraphStyle(
+        'AuraHeading',
+        parent=styles['Heading2'],
+        fontSize=12,
+        spaceBefore=10,
+        spaceAfter=5,
+        textColor=colors.HexColor('#374151'),
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        'AuraNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=3,
+        textColor=colors.HexColor('#374151')
+    ))
+    styles.add(ParagraphStyle(
+        'AuraThankYou',
+        parent=styles['AuraNormal'],
+        alignment=TA_CENTER,
+        fontSize=12,
+        textColor=colors.HexColor('#1e3a8a'),
+        spaceBefore=10
+    ))
+    styles.add(ParagraphStyle(
+        'AuraDate',
+        parent=styles['AuraNormal'],
+        alignment=TA_RIGHT
+    ))
+    return styles
+
+# Decoded logos are keyed by (path, mtime) so a replaced file is picked up;
+# replaced versions are evicted as new ones come in
+@lru_cache(maxsize=8)
+def _read_logo(path, mtime):
+    try:
+        return ImageReader(path)
+    except Exception:
+        return None
+
+def get_logo_reader(logo_name):
+    """Pre-decoded ImageReader for a logo under MEDIA_ROOT, or None"""
+    path = os.path.join(settings.MEDIA_ROOT, logo_name)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _read_logo(path, mtime)
+
+def get_branding():
+    """
+    Company logo and footer lines used by the page decorations.
+
+    The values are cached until SiteConfiguration or Footer is saved or
+    deleted (see accounts.signals) or BRANDING_TIMEOUT passes, so
+    rendering a PDF normally costs no queries for branding at all.
+    """
+    branding = cache.get(BRANDING_CACHE_KEY)
+    if branding is None:
+        from accounts.site_content import get_footer, get_site_configuration
+        
+        try:
+            site_config = get_site_configuration()
+        except Exception:
+            # SiteConfiguration table may not exist yet
+            site_config = None
+        
+        try:
+            footer_info = get_footer()
+        except Exception:
+            footer_info = None
+        
+        branding = {
+            'logo_name': site_config.company_logo.name if site_config and site_config.company_logo else None,
+            'footer_text': f"{footer_info.copyright_line1} | {footer_info.copyright_line2}" if footer_info else DEFAULT_FOOTER_TEXT,
+            'contact_info': f"{footer_info.email} | {footer_info.phone}" if footer_info and footer_info.email and footer_info.phone else None,
+        }
+        cache.set(BRANDING_CACHE_KEY, branding, BRANDING_TIMEOUT)
+    return branding
+
+def clear_branding_cache():
+    cache.delete(BRANDING_CACHE_KEY)
 
 class AuraStayDocTemplate(BaseDocTemplate):
     """Custom document template with AuraStay header and footer"""
     
     def __init__(self, filename, **kwargs):
         BaseDocTemplate.__init__(self, filename, **kwargs)
+        self._branding = None
+        self._logo = None
         
         # Define frame for content (adjusted for centered header/footer)
         frame = Frame(
@@ -28,26 +139,11 @@ class AuraStayDocTemplate(BaseDocTemplate):
     
     def add_page_decorations(self, canvas, doc):
         """Add centered header and footer to each page with AuraStay branding"""
-        from accounts.models import Footer
-        from django.conf import settings
-        import os
-        
-        # Get site configuration with fallback
-        try:
-            from accounts.models import SiteConfiguration
-            site_config = SiteConfiguration.get_instance()
-        except:
-            # Fallback if SiteConfiguration doesn't exist yet
-            class FallbackConfig:
-                company_name = "AuraStay"
-                company_logo = None
-                site_description = "Hotel Management System"
-            site_config = FallbackConfig()
-        
-        try:
-            footer_info = Footer.objects.first()
-        except:
-            footer_info = None
+        # Branding is resolved once per document, not per page
+        if self._branding is None:
+            self._branding = get_branding()
+            if self._branding['logo_name']:
+                self._logo = get_logo_reader(self._branding['logo_name'])
         
         canvas.saveState()
         page_width = doc.pagesize[0]
@@ -56,14 +152,12 @@ class AuraStayDocTemplate(BaseDocTemplate):
         header_y = doc.pagesize[1] - 0.7*inch
         
         # Company logo (centered)
-        if hasattr(site_config, 'company_logo') and site_config.company_logo:
+        if self._logo:
             try:
-                logo_path = os.path.join(settings.MEDIA_ROOT, site_config.company_logo.name)
-                if os.path.exists(logo_path):
-                    logo_width = 0.8*inch
-                    logo_x = (page_width - logo_width) / 2
-                    canvas.drawImage(logo_path, logo_x, header_y + 0.2*inch, width=logo_width, height=0.6*inch, preserveAspectRatio=True)
-            except:
+                logo_width = 0.8*inch
+                logo_x = (page_width - logo_width) / 2
+                canvas.drawImage(self._logo, logo_x, header_y + 0.2*inch, width=logo_width, height=0.6*inch, preserveAspectRatio=True)
+            except Exception:
                 pass
         
         # Empty header - no content
@@ -95,17 +189,13 @@ class AuraStayDocTemplate(BaseDocTemplate):
         canvas.setFont('Helvetica', 9)
         canvas.setFillColor(colors.grey)
         
-        if footer_info:
-            footer_text = f"{footer_info.copyright_line1} | {footer_info.copyright_line2}"
-        else:
-            footer_text = "© 2025 AuraStay. All rights reserved. | Design: MA Qureshi | Development: Momin Ali"
-        
+        footer_text = self._branding['footer_text']
         footer_width = canvas.stringWidth(footer_text, 'Helvetica', 9)
         canvas.drawString((page_width - footer_width) / 2, footer_y - 0.2*inch, footer_text)
         
         # Contact info (centered)
-        if footer_info and footer_info.email and footer_info.phone:
-            contact_info = f"{footer_info.email} | {footer_info.phone}"
+        contact_info = self._branding['contact_info']
+        if contact_info:
             canvas.setFont('Helvetica', 8)
             canvas.setFillColor(colors.HexColor('#475569'))
             contact_width = canvas.stringWidth(contact_info, 'Helvetica', 8)
@@ -120,6 +210,76 @@ class AuraStayDocTemplate(BaseDocTemplate):
         
         canvas.restoreState()
 
+class HotelDocTemplate(BaseDocTemplate):
+    """
+    Hotel-branded single column template used by invoices and receipts.
+
+    The header shows the hotel name, a document title and a colour-coded
+    status; the footer shows the hotel address and contacts.
+    """
+    
+    def __init__(self, filename, hotel, title, status, status_color, **kwargs):
+        self.hotel = hotel
+        self.document_title = title
+        self.document_status = status
+        self.status_color = status_color
+        BaseDocTemplate.__init__(self, filename, **kwargs)
+        
+        # Define frame for content - optimized for single page
+        frame = Frame(
+            20*mm, 20*mm, 170*mm, 247*mm,
+            leftPadding=0, bottomPadding=0, rightPadding=0, topPadding=0
+        )
+        
+        template = PageTemplate(id='hotel', frames=frame, onPage=self.add_page_decorations)
+        self.addPageTemplates([template])
+    
+    def add_page_decorations(self, canvas, doc):
+        """Add header and footer to each page"""
+        hotel_name = self.hotel.name if self.hotel else 'Hotel'
+        
+        canvas.saveState()
+        
+        # Watermark
+        canvas.setFillColor(colors.HexColor('#f0f0f0'))  # Very light gray
+        canvas.setFont('Helvetica-Bold', 60)
+        canvas.rotate(45)
+        canvas.drawString(200, 100, f"{hotel_name} - AuraStay")
+        canvas.rotate(-45)
+        
+        # Header
+        canvas.setFillColor(colors.HexColor('#1e3a8a'))  # Dark blue
+        canvas.rect(0, A4[1] - 80, A4[0], 80, fill=1)
+        
+        # Hotel name in header
+        canvas.setFillColor(colors.white)
+        canvas.setFont('Helvetica-Bold', 24)
+        canvas.drawString(30, A4[1] - 45, hotel_name)
+        
+        # Document title and status
+        canvas.setFont('Helvetica-Bold', 16)
+        canvas.drawRightString(A4[0] - 30, A4[1] - 50, self.document_title)
+        
+        canvas.setFillColor(self.status_color)
+        canvas.setFont('Helvetica-Bold', 12)
+        canvas.drawRightString(A4[0] - 30, A4[1] - 25, f'STATUS: {self.document_status.upper()}')
+        
+        # Footer
+        canvas.setFillColor(colors.HexColor('#f3f4f6'))  # Light gray
+        canvas.rect(0, 0, A4[0], 50, fill=1)
+        
+        # Footer content
+        canvas.setFillColor(colors.HexColor('#374151'))  # Dark gray
+        canvas.setFont('Helvetica', 10)
+        if self.hotel:
+            canvas.drawString(30, 25, f'{self.hotel.name} | {self.hotel.address}')
+            canvas.drawString(30, 15, f'Phone: {self.hotel.phone} | Email: {self.hotel.email}')
+        
+        # Page number
+        canvas.drawRightString(A4[0] - 30, 20, f'Page {doc.page}')
+        
+        canvas.restoreState()
+
 def generate_pdf_report(title, data, headers, filename):
     """Generate PDF report with AuraStay header and footer"""
     buffer = io.BytesIO()
@@ -127,7 +287,7 @@ def generate_pdf_report(title, data, headers, filename):
     elements = []
     
     # Styles
-    styles = getSampleStyleSheet()
+    styles = get_pdf_styles()
     title_style = ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
@@ -241,7 +401,7 @@ def hotel_detailed_report(hotel):
     elements = []
     
     # Styles
-    styles = getSampleStyleSheet()
+    styles = get_pdf_styles()
     title_style = ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
@@ -0,0 +1,167 @@
+import uuid
+from functools import lru_cache
+from django.core.cache import cache
+
+# Django permission grants are shared between requests; with a cache local
+# to each process a grant or revoke reaches other processes only when their
+# entry expires
+PERMISSION_CODENAMES_TIMEOUT = 60 * 5
+
+# Keys granted by accounts.context_processors.user_permissions when the
+# user has no employee profile or is a superuser
+TEMPLATE_PERMISSIONS = [
+    'can_view_hotels', 'can_create_hotels', 'can_edit_hotels', 'can_delete_hotels',
+    'can_view_rooms', 'can_create_rooms', 'can_edit_rooms', 'can_delete_rooms',
+    'can_view_staff', 'can_create_staff', 'can_edit_staff', 'can_delete_staff',
+    'can_view_reservations', 'can_create_reservations', 'can_edit_reservations', 'can_delete_reservations',
+    'can_view_guests', 'can_create_guests', 'can_edit_guests', 'can_delete_guests',
+    'can_view_companies', 'can_create_companies', 'can_edit_companies', 'can_delete_companies',
+    'can_view_front_desk', 'can_view_housekeeping', 'can_view_maintenance', 'can_view_pos',
+    'can_view_inventory', 'can_view_billing', 'can_view_payments', 'can_view_reports',
+    'can_view_configurations',
+]
+
+# Employee profile attribute for each template key
+EMPLOYEE_PERMISSIONS = {
+    **{key: key for key in TEMPLATE_PERMISSIONS},
+    'can_create_configurations': 'can_add_configurations',
+    'can_edit_configurations': 'can_change_configurations',
+    'can_delete_configurations': 'can_delete_configurations',
+}
+
+# User flags exposed to the navigation; the housekeeping-only flags are
+# only shown through the Housekeeping role permissions
+NAVIGATION_EXCLUDED = {
+    'can_view_room_status', 'can_update_room_status', 'can_view_housekeeping_schedule',
+    'can_request_maintenance', 'can_view_room_assignments',
+}
+
+# Legacy navigation keys and the permission each one mirrors
+LEGACY_NAVIGATION_PERMISSIONS = {
+    'can_view_front_desk': 'can_view_checkins',
+    'can_add_reservation': 'can_add_reservations',
+    'can_change_reservation': 'can_change_reservations',
+    'can_add_guest': 'can_add_guests',
+    'can_change_guest': 'can_change_guests',
+    'can_checkin': 'can_add_checkins',
+    'can_checkout': 'can_change_checkins',
+}
+
+ANONYMOUS_PERMISSION_MAP = {'flags': {}, 'codenames': set(), 'template': {}, 'navigation': {}}
+
+@lru_cache(maxsize=None)
+def permission_fields():
+    """Names of the can_* permission flags on the User model"""
+    from .models import User
+    return tuple(field.name for field in User._meta.fields if field.name.startswith('can_'))
+
+@lru_cache(maxsize=None)
+def navigation_permission_keys():
+    """Every key navigation_context can set, whatever the user's role"""
+    from .role_permissions import get_housekeeper_permissions
+    keys = [name for name in permission_fields() if name not in NAVIGATION_EXCLUDED]
+    keys += [key for key in get_housekeeper_permissions() if key not in keys]
+    keys += [key for key in LEGACY_NAVIGATION_PERMISSIONS if key not in keys]
+    return tuple(keys)
+
+def _version_key(user_id):
+    return f'permissions_version:{user_id}'
+
+def get_permissions_version(user_id):
+    """Current permissions version of a user, started on first use"""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+def bump_permissions_version(user_id):
+    """Invalidate every cached permission map of a user"""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+def _template_permissions(user):
+    if user.is_superuser:
+        return {key: True for key in TEMPLATE_PERMISSIONS}
+
+    try:
+        employee = user.employee_profile
+        return {key: getattr(employee, attr) for key, attr in EMPLOYEE_PERMISSIONS.items()}
+    except Exception:
+        # No employee profile or owner: basic permissions
+        return {key: True for key in TEMPLATE_PERMISSIONS}
+
+def _navigation_permissions(user, flags):
+    if user.role == 'Housekeeping':
+        from .role_permissions import get_housekeeper_permissions
+        nav_permissions = get_housekeeper_permissions()
+    else:
+        nav_permissions = {
+            name: user.role == 'Owner' or value
+            for name, value in flags.items() if name not in NAVIGATION_EXCLUDED
+        }
+
+    # Legacy compatibility
+    nav_permissions.update({
+        key: nav_permissions.get(source, False)
+        for key, source in LEGACY_NAVIGATION_PERMISSIONS.items()
+    })
+    return nav_permissions
+
+def get_permission_codenames(user):
+    """
+    Codenames of the Django permissions granted to ``user``, shared between
+    requests under the user's current permissions version
+    """
+    key = f'permission_codenames:{user.pk}:{get_permissions_version(user.pk)}'
+    codenames = cache.get(key)
+    if codenames is None:
+        codenames = set(user.user_permissions.values_list('codename', flat=True))
+        cache.set(key, codenames, PERMISSION_CODENAMES_TIMEOUT)
+    return codenames
+
+def compile_permission_map(user):
+    """
+    Everything permission checks and templates need about ``user``:
+    the raw ``flags``, the Django permission ``codenames`` and the
+    template contexts of ``user_permissions`` and ``navigation_context``.
+    """
+    flags = {name: getattr(user, name) for name in permission_fields()}
+    return {
+        'flags': flags,
+        'codenames': get_permission_codenames(user),
+        'template': _template_permissions(user),
+        'navigation': _navigation_permissions(user, flags),
+    }
+
+def get_permission_map(user):
+    """
+    Compiled permission map of ``user``, built at most once per request.
+
+    It is kept on the user instance, so the flags, role and employee
+    profile it reads are the ones loaded for this request; only the
+    Django permission codenames come from the cache.
+    """
+    permission_map = getattr(user, '_permission_map', None)
+    if permission_map is None:
+        permission_map = compile_permission_map(user)
+        user._permission_map = permission_map
+    return permission_map
+
+def clear_permission_map(user):
+    """Drop the cached permission codenames of ``user`` and its per-request map"""
+    user.__dict__.pop('_permission_map', None)
+    bump_permissions_version(user.pk)
+
+def request_permission_map(request):
+    """Permission map of the request's user, empty for anonymous users"""
+    if not request.user.is_authenticated:
+        return ANONYMOUS_PERMISSION_MAP
+    return get_permission_map(request.user)
+
+def template_permission(permission_map, key):
+    return permission_map['template'].get(key, False)
+
+def navigation_permission(permission_map, key):
+    # navigation_context overrides user_permissions in the template context
+    navigation = permission_map['navigation']
+    return navigation[key] if key in navigation else template_permission(permission_map, key)
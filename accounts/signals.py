@@ -0,0 +1,43 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Footer, PageContent, SiteConfiguration, User
+from .pdf_utils import clear_branding_cache
+from .permission_utils import clear_permission_map
+from .site_content import (
+    FOOTER_CACHE_KEY, PAGE_CONTENTS_CACHE_KEY, SITE_CONFIGURATION_CACHE_KEY, clear_site_content
+)
+
+@receiver([post_save, post_delete], sender=SiteConfiguration)
+@receiver([post_save, post_delete], sender=Footer)
+def invalidate_pdf_branding(sender, **kwargs):
+    """Drop the cached PDF branding when the site configuration or footer changes"""
+    clear_branding_cache()
+
+SITE_CONTENT_KEYS = {
+    Footer: FOOTER_CACHE_KEY,
+    PageContent: PAGE_CONTENTS_CACHE_KEY,
+    SiteConfiguration: SITE_CONFIGURATION_CACHE_KEY,
+}
+
+@receiver([post_save, post_delete], sender=Footer)
+@receiver([post_save, post_delete], sender=PageContent)
+@receiver([post_save, post_delete], sender=SiteConfiguration)
+def invalidate_site_content(sender, **kwargs):
+    """Drop the cached singleton content of the model that changed"""
+    clear_site_content(SITE_CONTENT_KEYS[sender])
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_permission_map(sender, instance, **kwargs):
+    """Drop a user's per-request permission map when the permission flags or role change"""
+    clear_permission_map(instance)
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_permission_map_on_grant(sender, instance, action, pk_set, **kwargs):
+    """Recompile permission maps when Django permissions are granted or revoked"""
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, User):
+        clear_permission_map(instance)
+    else:
+        for user_id in pk_set or ():
+            clear_permission_map(User(pk=user_id))
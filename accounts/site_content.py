@@ -0,0 +1,38 @@
+from django.core.cache import cache
+
+FOOTER_CACHE_KEY = 'site_content:footer'
+PAGE_CONTENTS_CACHE_KEY = 'site_content:page_contents'
+SITE_CONFIGURATION_CACHE_KEY = 'site_content:site_configuration'
+
+# With a cache local to each process, saves only clear their own process;
+# the others pick up changes when their entry expires
+SITE_CONTENT_TIMEOUT = 60 * 5
+
+# Stored instead of None so a missing row is cached too
+_MISSING = 'missing'
+
+def _cached(key, load):
+    value = cache.get(key)
+    if value is None:
+        value = load()
+        cache.set(key, _MISSING if value is None else value, SITE_CONTENT_TIMEOUT)
+    return None if value == _MISSING else value
+
+def get_footer():
+    """The site Footer, or None if it has not been created"""
+    from .models import Footer
+    return _cached(FOOTER_CACHE_KEY, Footer.objects.first)
+
+def get_page_contents():
+    """PageContent rows keyed by page_name"""
+    from .models import PageContent
+    return _cached(PAGE_CONTENTS_CACHE_KEY, lambda: {content.page_name: content for content in PageContent.objects.all()})
+
+def get_site_configuration():
+    """The single SiteConfiguration, created on first use"""
+    from .models import SiteConfiguration
+    return _cached(SITE_CONFIGURATION_CACHE_KEY, SiteConfiguration.get_instance)
+
+def clear_site_content(*keys):
+    """Drop cached singleton content, everything if no keys are given"""
+    cache.delete_many(keys or [FOOTER_CACHE_KEY, PAGE_CONTENTS_CACHE_KEY, SITE_CONFIGURATION_CACHE_KEY])
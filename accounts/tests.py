@@ -1,3 +1,15 @@
 from django.test import TestCase
+from .models import User
+from .permissions import check_user_permission
 
-# Create your tests here.
+class PermissionMapTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='clerk@example.com', username='clerk', password='x', role='Receptionist')
+
+    def test_flags_are_read_from_the_request_user(self):
+        self.assertFalse(check_user_permission(User.objects.get(pk=self.user.pk), 'view_configurations'))
+
+        # As if changed by another process, whose cache invalidation this one never sees
+        User.objects.filter(pk=self.user.pk).update(can_view_configurations=True)
+
+        self.assertTrue(check_user_permission(User.objects.get(pk=self.user.pk), 'view_configurations'))
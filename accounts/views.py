@@ -5,9 +5,14 @@ from django.contrib import messages
 from django.db.models import Count, Sum
 from django.views.decorators.csrf import csrf_protect
 from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject
 from datetime import date, timedelta
+from functools import partial
 from .roles import RoleManager
 from .decorators import super_admin_required
+from .lazy_context import lazy_value, timed_processor
+from .permission_utils import navigation_permission, navigation_permission_keys, request_permission_map
+from .site_content import get_footer, get_page_contents
 from .email_utils import send_subscription_welcome_email, send_subscription_update_email, send_employee_welcome_email
 from tenants.models import SubscriptionPlan
 from hotels.models import Hotel, HotelSubscription, Payment, SubscriptionHistory
@@ -175,123 +180,37 @@ def verify_otp(request):
     return render(request, 'accounts/verify_otp.html')
 
 
+@timed_processor
 def footer_context(request):
     """Context processor to add footer data to all templates"""
-    from .models import Footer
-    footer = Footer.objects.first()
-    return {'footer': footer}
+    return {'footer': lazy_value(request, 'footer_context.footer', get_footer)}
 
 
+@timed_processor
 def page_content_context(request):
     """Context processor to add page content data to all templates"""
-    from .models import PageContent
-    page_contents = {}
-    for content in PageContent.objects.all():
-        page_contents[content.page_name] = content
-    return {'page_contents': page_contents}
+    return {'page_contents': lazy_value(request, 'page_content_context.page_contents', get_page_contents)}
 
-def navigation_context(request):
-    """Context processor to add navigation permissions and notification count"""
+def unread_notifications_count(request):
+    """Number of the user's pending or sent notifications"""
     if not request.user.is_authenticated:
-        return {}
-    
-    # Get unread notification count
-    unread_notifications_count = 0
+        return 0
     try:
-        unread_notifications_count = request.user.notifications.filter(status__in=['pending', 'sent']).count()
+        return request.user.notifications.filter(status__in=['pending', 'sent']).count()
     except:
-        pass
-    
-    # Get role-based permissions
-    nav_permissions = {}
-    
-    # Use role-based permissions if user has a defined role
-    if hasattr(request.user, 'role') and request.user.role == 'Housekeeping':
-        from .role_permissions import get_housekeeper_permissions
-        nav_permissions.update(get_housekeeper_permissions())
-    else:
-        # Fallback to existing permission system
-        nav_permissions = {
-            # Hotel Management
-            'can_view_hotels': request.user.role == 'Owner' or getattr(request.user, 'can_view_hotels', False),
-            'can_change_hotels': request.user.role == 'Owner' or getattr(request.user, 'can_change_hotels', False),
-            'can_view_rooms': request.user.role == 'Owner' or getattr(request.user, 'can_view_rooms', False),
-            'can_add_rooms': request.user.role == 'Owner' or getattr(request.user, 'can_add_rooms', False),
-            'can_change_rooms': request.user.role == 'Owner' or getattr(request.user, 'can_change_rooms', False),
-            'can_delete_rooms': request.user.role == 'Owner' or getattr(request.user, 'can_delete_rooms', False),
-            
-            # Reservations
-            'can_view_reservations': request.user.role == 'Owner' or getattr(request.user, 'can_view_reservations', False),
-            'can_add_reservations': request.user.role == 'Owner' or getattr(request.user, 'can_add_reservations', False),
-            'can_change_reservations': request.user.role == 'Owner' or getattr(request.user, 'can_change_reservations', False),
-            'can_delete_reservations': request.user.role == 'Owner' or getattr(request.user, 'can_delete_reservations', False),
-            'can_view_checkins': request.user.role == 'Owner' or getattr(request.user, 'can_view_checkins', False),
-            'can_add_checkins': request.user.role == 'Owner' or getattr(request.user, 'can_add_checkins', False),
-            'can_change_checkins': request.user.role == 'Owner' or getattr(request.user, 'can_change_checkins', False),
-            
-            # Guest Management
-            'can_view_guests': request.user.role == 'Owner' or getattr(request.user, 'can_view_guests', False),
-            'can_add_guests': request.user.role == 'Owner' or getattr(request.user, 'can_add_guests', False),
-            'can_change_guests': request.user.role == 'Owner' or getattr(request.user, 'can_change_guests', False),
-            'can_delete_guests': request.user.role == 'Owner' or getattr(request.user, 'can_delete_guests', False),
-            
-            # Staff Management
-            'can_view_staff': request.user.role == 'Owner' or getattr(request.user, 'can_view_staff', False),
-            'can_add_staff': request.user.role == 'Owner' or getattr(request.user, 'can_add_staff', False),
-            'can_change_staff': request.user.role == 'Owner' or getattr(request.user, 'can_change_staff', False),
-            'can_delete_staff': request.user.role == 'Owner' or getattr(request.user, 'can_delete_staff', False),
-            
-            # Other permissions...
-            'can_view_housekeeping': request.user.role == 'Owner' or getattr(request.user, 'can_view_housekeeping', False),
-            'can_add_housekeeping': request.user.role == 'Owner' or getattr(request.user, 'can_add_housekeeping', False),
-            'can_change_housekeeping': request.user.role == 'Owner' or getattr(request.user, 'can_change_housekeeping', False),
-            'can_delete_housekeeping': request.user.role == 'Owner' or getattr(request.user, 'can_delete_housekeeping', False),
-            
-            'can_view_maintenance': request.user.role == 'Owner' or getattr(request.user, 'can_view_maintenance', False),
-            'can_add_maintenance': request.user.role == 'Owner' or getattr(request.user, 'can_add_maintenance', False),
-            'can_change_maintenance': request.user.role == 'Owner' or getattr(request.user, 'can_change_maintenance', False),
-            'can_delete_maintenance': request.user.role == 'Owner' or getattr(request.user, 'can_delete_maintenance', False),
-            
-            'can_view_pos': request.user.role == 'Owner' or getattr(request.user, 'can_view_pos', False),
-            'can_add_pos': request.user.role == 'Owner' or getattr(request.user, 'can_add_pos', False),
-            'can_change_pos': request.user.role == 'Owner' or getattr(request.user, 'can_change_pos', False),
-            'can_delete_pos': request.user.role == 'Owner' or getattr(request.user, 'can_delete_pos', False),
-            
-            'can_view_inventory': request.user.role == 'Owner' or getattr(request.user, 'can_view_inventory', False),
-            'can_add_inventory': request.user.role == 'Owner' or getattr(request.user, 'can_add_inventory', False),
-            'can_change_inventory': request.user.role == 'Owner' or getattr(request.user, 'can_change_inventory', False),
-            'can_delete_inventory': request.user.role == 'Owner' or getattr(request.user, 'can_delete_inventory', False),
-            
-            'can_view_billing': request.user.role == 'Owner' or getattr(request.user, 'can_view_billing', False),
-            'can_add_billing': request.user.role == 'Owner' or getattr(request.user, 'can_add_billing', False),
-            'can_change_billing': request.user.role == 'Owner' or getattr(request.user, 'can_change_billing', False),
-            'can_view_payments': request.user.role == 'Owner' or getattr(request.user, 'can_view_payments', False),
-            'can_add_payments': request.user.role == 'Owner' or getattr(request.user, 'can_add_payments', False),
-            'can_view_reports': request.user.role == 'Owner' or getattr(request.user, 'can_view_reports', False),
-            
-            'can_view_companies': request.user.role == 'Owner' or getattr(request.user, 'can_view_companies', False),
-            'can_add_companies': request.user.role == 'Owner' or getattr(request.user, 'can_add_companies', False),
-            'can_change_companies': request.user.role == 'Owner' or getattr(request.user, 'can_change_companies', False),
-            'can_delete_companies': request.user.role == 'Owner' or getattr(request.user, 'can_delete_companies', False),
-            
-            'can_view_configurations': request.user.role == 'Owner' or getattr(request.user, 'can_view_configurations', False),
-            'can_add_configurations': request.user.role == 'Owner' or getattr(request.user, 'can_add_configurations', False),
-            'can_change_configurations': request.user.role == 'Owner' or getattr(request.user, 'can_change_configurations', False),
-            'can_delete_configurations': request.user.role == 'Owner' or getattr(request.user, 'can_delete_configurations', False),
-        }
-    
-    # Legacy compatibility
-    nav_permissions.update({
-        'can_view_front_desk': nav_permissions.get('can_view_checkins', False),
-        'can_add_reservation': nav_permissions.get('can_add_reservations', False),
-        'can_change_reservation': nav_permissions.get('can_change_reservations', False),
-        'can_add_guest': nav_permissions.get('can_add_guests', False),
-        'can_change_guest': nav_permissions.get('can_change_guests', False),
-        'can_checkin': nav_permissions.get('can_add_checkins', False),
-        'can_checkout': nav_permissions.get('can_change_checkins', False),
-        'unread_notifications_count': unread_notifications_count,
-    })
-    
+        return 0
+
+@timed_processor
+def navigation_context(request):
+    """Context processor to add navigation permissions and notification count"""
+    permission_map = lazy_value(request, 'navigation_context.permission_map', partial(request_permission_map, request))
+    nav_permissions = {
+        key: SimpleLazyObject(partial(navigation_permission, permission_map, key))
+        for key in navigation_permission_keys()
+    }
+    nav_permissions['unread_notifications_count'] = lazy_value(
+        request, 'navigation_context.unread_notifications_count', partial(unread_notifications_count, request)
+    )
     return nav_permissions
 
 @csrf_protect
@@ -386,7 +305,7 @@ AuraStay Contact System
 def custom_login(request):
     """Custom login view with automatic role detection and permission assignment"""
    
-    footer = Footer.objects.first()
+    footer = get_footer()
     
     if request.user.is_authenticated:
         return redirect('accounts:dashboard')
@@ -1251,30 +1170,16 @@ def hotel_subscription_delete(request, subscription_id):
 def analytics_dashboard(request):
     """Advanced Analytics Dashboard"""
     from django.db.models import Count, Sum, Avg
-    from datetime import datetime, timedelta
+    from reporting.revenue import monthly_series
     import json
     
     # Revenue Analytics
-    last_12_months = []
-    revenue_data = []
-    for i in range(12):
-        month_date = date.today().replace(day=1) - timedelta(days=30*i)
-        month_revenue = Payment.objects.filter(
-            payment_date__year=month_date.year,
-            payment_date__month=month_date.month
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        last_12_months.insert(0, month_date.strftime('%b %Y'))
-        revenue_data.insert(0, float(month_revenue))
+    revenue_series = monthly_series(Payment.objects.all(), 'payment_date', Sum('amount'), 12)
+    last_12_months = [month.strftime('%b %Y') for month, total in revenue_series]
+    revenue_data = [float(total or 0) for month, total in revenue_series]
     
     # Hotel Growth
-    hotel_growth = []
-    for i in range(6):
-        month_date = date.today().replace(day=1) - timedelta(days=30*i)
-        hotel_count = Hotel.objects.filter(
-            created_at__year=month_date.year,
-            created_at__month=month_date.month
-        ).count()
-        hotel_growth.insert(0, hotel_count)
+    hotel_growth = [count or 0 for month, count in monthly_series(Hotel.objects.all(), 'created_at', Count('pk'), 6)]
     
     # Subscription Distribution
     subscription_stats = SubscriptionPlan.objects.annotate(
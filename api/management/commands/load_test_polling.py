@@ -0,0 +1,112 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from hotels.models import Hotel, Room
+
+ENDPOINTS = {
+    'availability': '/reservations/check-availability/?hotel_id={hotel}&check_in={check_in}&check_out={check_out}',
+    'room_details': '/front-desk/room-details/{room}/',
+    'dashboard_stats': '/api/dashboard/stats/',
+}
+
+class Command(BaseCommand):
+    help = (
+        'Load test the polled JSON endpoints on running servers, e.g. '
+        '--target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', default=[],
+                            help='NAME=BASE_URL of a running server (repeatable), defaults to local=http://127.0.0.1:8000')
+        parser.add_argument('--user', required=True, help='Username the requests are made as')
+        parser.add_argument('--hotel', type=int, help='Hotel to query (hotel_id), defaults to the user\'s hotel')
+        parser.add_argument('--room', type=int, help='Room for room_details (room_id), defaults to the first room of the hotel')
+        parser.add_argument('--endpoint', action='append', choices=sorted(ENDPOINTS), help='Endpoints to test (repeatable), defaults to all')
+        parser.add_argument('--concurrency', type=int, default=20, help='Simultaneous clients')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and target')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target'] or ['local=http://127.0.0.1:8000']:
+            name, _, url = target.partition('=')
+            if not url:
+                raise CommandError(f'--target must look like NAME=BASE_URL, got {target!r}')
+            targets.append((name, url.rstrip('/')))
+
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        hotel = self.get_hotel(user, options['hotel'])
+        room_id = options['room'] or Room.objects.filter(hotel=hotel).values_list('room_id', flat=True).first()
+        check_in = timezone.now().date() + timedelta(days=1)
+        paths = {
+            name: path.format(hotel=hotel.hotel_id, room=room_id, check_in=check_in, check_out=check_in + timedelta(days=2))
+            for name, path in ENDPOINTS.items() if name in (options['endpoint'] or ENDPOINTS)
+        }
+
+        cookie = f'{settings.SESSION_COOKIE_NAME}={self.create_session(user)}'
+        concurrency = max(1, options['concurrency'])
+        count = max(1, options['requests'])
+
+        self.stdout.write(f'{count} requests per endpoint, {concurrency} concurrent clients, as {user.username} on {hotel.name}')
+        self.stdout.write(f'{"target":<12} {"endpoint":<16} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"errors":>7}')
+        for target_name, base_url in targets:
+            for endpoint, path in paths.items():
+                rate, p50, p95, errors = self.run(base_url + path, cookie, concurrency, count)
+                self.stdout.write(f'{target_name:<12} {endpoint:<16} {rate:>8.1f} {p50:>8.1f} {p95:>8.1f} {errors:>7}')
+
+    def get_hotel(self, user, hotel_id):
+        hotels = Hotel.objects.all()
+        if hotel_id:
+            hotels = hotels.filter(hotel_id=hotel_id)
+        elif user.assigned_hotel_id:
+            hotels = hotels.filter(hotel_id=user.assigned_hotel_id)
+        elif not user.is_superuser:
+            hotels = hotels.filter(owner=user)
+        hotel = hotels.order_by('hotel_id').first()
+        if hotel is None:
+            raise CommandError('No hotel to test with, pass --hotel')
+        return hotel
+
+    def create_session(self, user):
+        """Session key of a logged-in session for ``user``, as the test client's force_login does"""
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return session.session_key
+
+    def run(self, url, cookie, concurrency, count):
+        """(requests/s, p50 ms, p95 ms, errors) for ``count`` GETs of ``url``"""
+        def fetch(_):
+            request = urllib.request.Request(url, headers={'Cookie': cookie, 'Accept': 'application/json'})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(fetch, range(count)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(seconds * 1000 for seconds, _ in results)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        errors = sum(1 for _, ok in results if not ok)
+        return count / elapsed, statistics.median(latencies), p95, errors
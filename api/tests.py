@@ -1,3 +1,47 @@
+from base64 import b64encode
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User
+from hotels.models import Hotel
 
-# Create your tests here.
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email='owner@example.com', username='owner', password='secret', role='Owner')
+        self.url = reverse('api:dashboard_stats')
+
+    def basic_auth(self, password):
+        return {'HTTP_AUTHORIZATION': 'Basic ' + b64encode(f'owner:{password}'.encode()).decode()}
+
+    def test_basic_auth_is_accepted_like_the_drf_views(self):
+        response = self.client.get(self.url, SERVER_NAME='localhost', **self.basic_auth('secret'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_rooms'], 0)
+
+    def test_missing_or_invalid_credentials_are_rejected(self):
+        self.assertEqual(self.client.get(self.url, SERVER_NAME='localhost').status_code, 403)
+        self.assertEqual(self.client.get(self.url, SERVER_NAME='localhost', **self.basic_auth('wrong')).status_code, 403)
+
+class HotelViewSetTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='x', role='Owner')
+        self.hotel = Hotel.objects.create(owner=self.owner, name='Own Hotel')
+        Hotel.objects.create(owner=self.owner, name='Closed Hotel', deleted_at=timezone.now())
+        other_owner = User.objects.create_user(email='other@example.com', username='other', password='x', role='Owner')
+        self.other_hotel = Hotel.objects.create(owner=other_owner, name='Other Hotel')
+        self.url = reverse('api:hotel-list')
+
+    def hotel_names(self, user):
+        self.client.force_login(user)
+        response = self.client.get(self.url, SERVER_NAME='localhost')
+        self.assertEqual(response.status_code, 200)
+        return sorted(hotel['name'] for hotel in response.json())
+
+    def test_owners_see_only_their_live_hotels(self):
+        self.assertEqual(self.hotel_names(self.owner), ['Own Hotel'])
+
+    def test_super_admins_see_every_live_hotel(self):
+        admin = User.objects.create_user(email='admin@example.com', username='admin', password='x', role='super_admin')
+
+        self.assertEqual(self.hotel_names(admin), ['Other Hotel', 'Own Hotel'])
@@ -1,25 +1,48 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.db import transaction
 from rest_framework import viewsets, status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
-from django.db.models import Count, Sum, Q
+from rest_framework.settings import api_settings
+from django.db.models import Sum
 from django.utils import timezone
 from datetime import timedelta, datetime
 from .serializers import *
 from hotels.models import Hotel, Room
+from hotels.querysets import user_hotels
 from reservations.models import Reservation
+from reservations.availability import get_available_rooms
+from reservations.inventory import RoomUnavailable
+from reporting.occupancy import GRANULARITIES, get_occupancy_series
+from reporting.revenue import get_monthly_revenue
 from front_desk.models import CheckInOut
 from housekeeping.models import HousekeepingTask
 from maintenance.models import MaintenanceIssue
 from pos.models import POSOrder
 from billing.models import Invoice
 
+class HotelScopedViewSetMixin:
+    """Limits a viewset to the live rows of the hotels the user works in"""
+    
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user).alive()
+
 class HotelViewSet(viewsets.ModelViewSet):
     queryset = Hotel.objects.all()
     serializer_class = HotelSerializer
     permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        hotels = user_hotels(self.request.user)
+        if hotels is None:
+            hotels = super().get_queryset()
+        return hotels.filter(deleted_at__isnull=True)
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(HotelScopedViewSetMixin, viewsets.ModelViewSet):
     queryset = Room.objects.all()
     serializer_class = RoomSerializer
     permission_classes = [IsAuthenticated]
@@ -29,18 +52,20 @@ class RoomViewSet(viewsets.ModelViewSet):
         """Get available rooms"""
         check_in = request.query_params.get('check_in')
         check_out = request.query_params.get('check_out')
+        hotel_id = request.query_params.get('hotel')
+        hotel = None
+        if hotel_id:
+            hotel = Hotel.objects.filter(hotel_id=hotel_id).first()
+            if not hotel:
+                return Response({'error': 'Hotel not found'}, status=status.HTTP_404_NOT_FOUND)
         
         if check_in and check_out:
-            # Filter rooms that are not reserved for the given dates
-            occupied_rooms = Reservation.objects.filter(
-                check_in__lt=check_out,
-                check_out__gt=check_in,
-                status__in=['confirmed', 'checked_in']
-            ).values_list('room_type__rooms__id', flat=True)
-            
-            available_rooms = Room.objects.exclude(id__in=occupied_rooms).filter(status='clean')
+            # Rooms with no overlapping reservation for the given dates
+            available_rooms = get_available_rooms(hotel, check_in, check_out).for_user(request.user).select_related('hotel')
         else:
-            available_rooms = Room.objects.filter(status='clean')
+            available_rooms = self.get_queryset().filter(status='Available').select_related('hotel')
+            if hotel:
+                available_rooms = available_rooms.filter(hotel=hotel)
         
         serializer = self.get_serializer(available_rooms, many=True)
         return Response(serializer.data)
@@ -50,16 +75,30 @@ class GuestProfileViewSet(viewsets.ModelViewSet):
     serializer_class = GuestProfileSerializer
     permission_classes = [IsAuthenticated]
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(HotelScopedViewSetMixin, viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = [IsAuthenticated]
     
+    def perform_create(self, serializer):
+        self._save_holding_room(serializer)
+    
+    def perform_update(self, serializer):
+        self._save_holding_room(serializer)
+    
+    def _save_holding_room(self, serializer):
+        """Save, rolling back when the room is already booked for those nights"""
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except RoomUnavailable:
+            raise ValidationError({'room': ['This room is already booked for the selected dates.']})
+    
     @action(detail=False, methods=['get'])
     def arrivals_today(self, request):
         """Get today's arrivals"""
         today = timezone.now().date()
-        arrivals = Reservation.objects.filter(
+        arrivals = self.get_queryset().filter(
             check_in=today,
             status__in=['confirmed', 'checked_in']
         )
@@ -70,19 +109,19 @@ class ReservationViewSet(viewsets.ModelViewSet):
     def departures_today(self, request):
         """Get today's departures"""
         today = timezone.now().date()
-        departures = Reservation.objects.filter(
+        departures = self.get_queryset().filter(
             check_out=today,
             status='checked_in'
         )
         serializer = self.get_serializer(departures, many=True)
         return Response(serializer.data)
 
-class CheckInOutViewSet(viewsets.ModelViewSet):
+class CheckInOutViewSet(HotelScopedViewSetMixin, viewsets.ModelViewSet):
     queryset = CheckInOut.objects.all()
     serializer_class = CheckInOutSerializer
     permission_classes = [IsAuthenticated]
 
-class HousekeepingTaskViewSet(viewsets.ModelViewSet):
+class HousekeepingTaskViewSet(HotelScopedViewSetMixin, viewsets.ModelViewSet):
     queryset = HousekeepingTask.objects.all()
     serializer_class = HousekeepingTaskSerializer
     permission_classes = [IsAuthenticated]
@@ -103,7 +142,7 @@ class HousekeepingTaskViewSet(viewsets.ModelViewSet):
         
         return Response({'status': 'Task completed successfully'})
 
-class MaintenanceIssueViewSet(viewsets.ModelViewSet):
+class MaintenanceIssueViewSet(HotelScopedViewSetMixin, viewsets.ModelViewSet):
     queryset = MaintenanceIssue.objects.all()
     serializer_class = MaintenanceIssueSerializer
     permission_classes = [IsAuthenticated]
@@ -120,7 +159,7 @@ class MaintenanceIssueViewSet(viewsets.ModelViewSet):
         
         return Response({'status': 'Issue resolved successfully'})
 
-class POSOrderViewSet(viewsets.ModelViewSet):
+class POSOrderViewSet(HotelScopedViewSetMixin, viewsets.ModelViewSet):
     queryset = POSOrder.objects.all()
     serializer_class = POSOrderSerializer
     permission_classes = [IsAuthenticated]
@@ -142,34 +181,69 @@ class POSOrderViewSet(viewsets.ModelViewSet):
         
         return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def dashboard_stats(request):
-    """Get dashboard statistics"""
+def authenticate_api_user(request):
+    """
+    User of a plain Django request, authenticated by the same classes as
+    the DRF views (session, HTTP Basic, ...). None without credentials;
+    raises AuthenticationFailed for invalid ones.
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    user = drf_request.user
+    return user if user.is_authenticated else None
+
+def not_authenticated_response(request, detail):
+    """
+    401 with a challenge when the first authentication class issues one,
+    403 otherwise, as DRF answers unauthenticated requests
+    """
+    challenge = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]().authenticate_header(request)
+    if not challenge:
+        return JsonResponse({'detail': detail}, status=403)
+    response = JsonResponse({'detail': detail}, status=401)
+    response['WWW-Authenticate'] = challenge
+    return response
+
+async def dashboard_stats(request):
+    """Get dashboard statistics
+    
+    A plain async view rather than a DRF one, so that the dashboards
+    polling it are served without tying up a worker thread under ASGI.
+    It answers like the DRF views: GET only, same authentication.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+    
+    try:
+        user = await sync_to_async(authenticate_api_user)(request)
+    except AuthenticationFailed as exc:
+        return not_authenticated_response(request, str(exc.detail))
+    if user is None:
+        return not_authenticated_response(request, 'Authentication credentials were not provided.')
+    
     today = timezone.now().date()
     
     # Room statistics
-    total_rooms = Room.objects.count()
-    occupied_rooms = CheckInOut.objects.filter(
+    total_rooms = await Room.objects.for_user(user).acount()
+    occupied_rooms = await CheckInOut.objects.for_user(user).alive().filter(
         status='checked_in',
         checked_out_at__isnull=True
-    ).count()
+    ).acount()
     available_rooms = total_rooms - occupied_rooms
     occupancy_rate = (occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
     
     # Revenue statistics
-    total_revenue = Invoice.objects.filter(
+    total_revenue = (await Invoice.objects.for_user(user).alive().filter(
         date__date=today
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
+    ).aaggregate(total=Sum('total_amount')))['total'] or 0
     
     # Maintenance and housekeeping
-    pending_maintenance = MaintenanceIssue.objects.filter(
+    pending_maintenance = await MaintenanceIssue.objects.for_user(user).alive().filter(
         status__in=['open', 'in_progress']
-    ).count()
+    ).acount()
     
-    housekeeping_tasks = HousekeepingTask.objects.filter(
+    housekeeping_tasks = await HousekeepingTask.objects.for_user(user).alive().filter(
         status='pending'
-    ).count()
+    ).acount()
     
     stats = {
         'total_rooms': total_rooms,
@@ -182,42 +256,39 @@ def dashboard_stats(request):
     }
     
     serializer = DashboardStatsSerializer(stats)
-    return Response(serializer.data)
+    return JsonResponse(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def occupancy_chart_data(request):
-    """Get occupancy data for charts"""
-    days = int(request.query_params.get('days', 30))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
+    """Get occupancy data for charts
     
-    data = []
-    current_date = start_date
+    Query params: ``days`` (default 30) or ``start``/``end`` (YYYY-MM-DD),
+    ``hotel`` (hotel_id) and ``granularity`` (day, week or month).
+    """
+    granularity = request.query_params.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return Response({'error': 'granularity must be day, week or month'}, status=status.HTTP_400_BAD_REQUEST)
     
-    while current_date <= end_date:
-        # Calculate occupancy for each day
-        total_rooms = Room.objects.count()
-        occupied = CheckInOut.objects.filter(
-            checked_in_at__date__lte=current_date
-        ).filter(
-            Q(checked_out_at__date__gt=current_date) | Q(checked_out_at__isnull=True)
-        ).count()
-        
-        occupancy_rate = (occupied / total_rooms * 100) if total_rooms > 0 else 0
-        
-        # Calculate revenue for the day
-        revenue = Invoice.objects.filter(
-            date__date=current_date
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        
-        data.append({
-            'date': current_date,
-            'occupancy_rate': round(occupancy_rate, 2),
-            'revenue': revenue
-        })
-        
-        current_date += timedelta(days=1)
+    try:
+        if request.query_params.get('start') and request.query_params.get('end'):
+            start_date = datetime.strptime(request.query_params['start'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.query_params['end'], '%Y-%m-%d').date()
+        else:
+            days = int(request.query_params.get('days', 30))
+            end_date = timezone.now().date()
+            start_date = end_date - timedelta(days=days)
+    except ValueError:
+        return Response({'error': 'Invalid date range'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    hotel = None
+    hotel_id = request.query_params.get('hotel')
+    if hotel_id:
+        hotel = Hotel.objects.filter(hotel_id=hotel_id).first()
+        if not hotel:
+            return Response({'error': 'Hotel not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    data = get_occupancy_series(hotel, start_date, end_date, granularity)
     
     serializer = OccupancyDataSerializer(data, many=True)
     return Response(serializer.data)
@@ -226,41 +297,20 @@ def occupancy_chart_data(request):
 @permission_classes([IsAuthenticated])
 def revenue_chart_data(request):
     """Get revenue data for charts"""
-    months = int(request.query_params.get('months', 12))
+    try:
+        months = int(request.query_params.get('months', 12))
+    except ValueError:
+        return Response({'error': 'months must be a number'}, status=status.HTTP_400_BAD_REQUEST)
     
-    data = []
-    current_date = timezone.now().date().replace(day=1)
+    hotel = None
+    hotel_id = request.query_params.get('hotel')
+    if hotel_id:
+        hotel = Hotel.objects.filter(hotel_id=hotel_id).first()
+        if not hotel:
+            return Response({'error': 'Hotel not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    for i in range(months):
-        month_start = current_date.replace(day=1)
-        if current_date.month == 12:
-            month_end = current_date.replace(year=current_date.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            month_end = current_date.replace(month=current_date.month + 1, day=1) - timedelta(days=1)
-        
-        # Room revenue
-        room_revenue = Invoice.objects.filter(
-            date__date__range=[month_start, month_end]
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        
-        # POS revenue
-        pos_revenue = POSOrder.objects.filter(
-            order_time__date__range=[month_start, month_end],
-            payment_status='paid'
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        
-        data.append({
-            'month': current_date.strftime('%Y-%m'),
-            'room_revenue': room_revenue,
-            'pos_revenue': pos_revenue,
-            'total_revenue': room_revenue + pos_revenue
-        })
-        
-        # Move to previous month
-        if current_date.month == 1:
-            current_date = current_date.replace(year=current_date.year - 1, month=12)
-        else:
-            current_date = current_date.replace(month=current_date.month - 1)
+    # Most recent month first
+    data = list(reversed(get_monthly_revenue(hotel, months)))
     
     serializer = RevenueDataSerializer(data, many=True)
     return Response(serializer.data)
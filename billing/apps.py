@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class BillingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'billing'
\ No newline at end of file
+    name = 'billing'
+    
+    def ready(self):
+        import billing.signals
@@ -0,0 +1,76 @@
+import multiprocessing
+import zipfile
+from django.db import connections
+from django.db.models import Prefetch
+from .models import Invoice, Payment
+from .pdf import render_invoice_pdf, render_receipt_pdf
+
+def invoices_for_archive(hotel, start_date, end_date):
+    """
+    Invoices of ``hotel`` (None for every hotel) dated within
+    [start_date, end_date] with everything the PDFs need loaded up front:
+    hotel, guest and stay are joined, charge items and payments come in
+    one query each.
+    """
+    invoices = Invoice.objects.alive()
+    if hotel is not None:
+        invoices = invoices.for_hotel(hotel)
+    return invoices.filter(
+        date__date__range=[start_date, end_date],
+    ).select_related(
+        'guest', 'stay__reservation__hotel'
+    ).prefetch_related(
+        'charge_items',
+        Prefetch('payments', queryset=Payment.objects.filter(deleted_at__isnull=True).order_by('timestamp')),
+    ).order_by('date')
+
+def render_invoice_documents(invoice, include_receipts=True):
+    """(archive name, PDF bytes) for an invoice and optionally its receipts"""
+    documents = [(f'invoices/invoice_{invoice.invoice_number}.pdf', render_invoice_pdf(invoice))]
+    if include_receipts:
+        for payment in invoice.payments.all():
+            documents.append((f'receipts/receipt_{str(payment.id)[:8]}.pdf', render_receipt_pdf(payment)))
+    return documents
+
+def _init_worker():
+    import django
+    django.setup()
+    connections.close_all()
+
+def _render_job(job):
+    invoice, include_receipts = job
+    return render_invoice_documents(invoice, include_receipts)
+
+def write_invoice_archive(invoices, output, workers=1, include_receipts=True, progress=None):
+    """
+    Render ``invoices`` into a zip archive at ``output`` (a path or file).
+
+    With ``workers`` > 1 the already-loaded invoices are sent to a process
+    pool for rendering while this process writes the zip, so PDF rendering
+    runs on every core without extra queries. ``progress`` is called with
+    the running invoice count. Returns ``(invoice_count, file_count)``.
+    """
+    invoices = list(invoices)
+    jobs = [(invoice, include_receipts) for invoice in invoices]
+    invoice_count = file_count = 0
+
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        def write(documents):
+            nonlocal invoice_count, file_count
+            for name, pdf in documents:
+                archive.writestr(name, pdf)
+            invoice_count += 1
+            file_count += len(documents)
+            if progress:
+                progress(invoice_count)
+
+        if workers > 1 and len(jobs) > 1:
+            connections.close_all()
+            with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+                for documents in pool.imap_unordered(_render_job, jobs, chunksize=8):
+                    write(documents)
+        else:
+            for job in jobs:
+                write(_render_job(job))
+
+    return invoice_count, file_count
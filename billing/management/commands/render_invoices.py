@@ -0,0 +1,54 @@
+import os
+import time
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from hotels.models import Hotel
+from billing.archive import invoices_for_archive, write_invoice_archive
+
+class Command(BaseCommand):
+    help = 'Render invoice and receipt PDFs for a hotel and date range into a zip archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotel', type=int, required=True, help='Hotel to render invoices for (hotel_id)')
+        parser.add_argument('--start', help='First invoice date (YYYY-MM-DD), defaults to the first day of last month')
+        parser.add_argument('--end', help='Last invoice date (YYYY-MM-DD), defaults to the last day of last month')
+        parser.add_argument('--output', help='Zip file to write, defaults to invoices_<hotel>_<start>_<end>.zip')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Rendering processes')
+        parser.add_argument('--no-receipts', action='store_true', help='Only render invoices, not payment receipts')
+
+    def handle(self, *args, **options):
+        try:
+            hotel = Hotel.objects.get(hotel_id=options['hotel'])
+        except Hotel.DoesNotExist:
+            raise CommandError(f"Hotel {options['hotel']} does not exist")
+
+        last_month_end = timezone.now().date().replace(day=1) - timedelta(days=1)
+        try:
+            start_date = datetime.strptime(options['start'], '%Y-%m-%d').date() if options['start'] else last_month_end.replace(day=1)
+            end_date = datetime.strptime(options['end'], '%Y-%m-%d').date() if options['end'] else last_month_end
+        except ValueError:
+            raise CommandError('Dates must be in YYYY-MM-DD format')
+
+        if start_date > end_date:
+            raise CommandError('--start must not be after --end')
+
+        output = options['output'] or f'invoices_{hotel.hotel_id}_{start_date:%Y%m%d}_{end_date:%Y%m%d}.zip'
+        workers = max(1, options['workers'])
+
+        started = time.monotonic()
+        invoices = list(invoices_for_archive(hotel, start_date, end_date))
+        self.stdout.write(
+            f'{hotel.name}: {len(invoices)} invoices from {start_date} to {end_date} '
+            f'loaded in {time.monotonic() - started:.1f}s, rendering with {workers} workers'
+        )
+
+        invoice_count, file_count = write_invoice_archive(
+            invoices, output, workers=workers, include_receipts=not options['no_receipts']
+        )
+
+        elapsed = time.monotonic() - started
+        rate = invoice_count / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {file_count} PDFs for {invoice_count} invoices to {output} in {elapsed:.1f}s ({rate:.1f} invoices/s)'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:59
+
+from django.db import migrations, models
+import django.db.models.functions.datetime
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0003_taxconfiguration_invoice_paid_date_invoice_tax_rate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(models.F('status'), django.db.models.functions.datetime.TruncDate('created_at'), name='invoice_status_created_idx'),
+        ),
+    ]
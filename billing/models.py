@@ -1,5 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from hotels.numbering import next_number, numbering_transaction
+from hotels.querysets import HotelScopedQuerySet
 from reservations.models import Stay
+from .summary import clear_billing_summary
 from crm.models import GuestProfile
 import uuid
 from decimal import Decimal
@@ -29,6 +35,8 @@ class Invoice(models.Model):
         ('refunded', 'Refunded'),
     ]
     
+    HOTEL_LOOKUP = 'stay__reservation__hotel'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     stay = models.OneToOneField(Stay, on_delete=models.CASCADE, related_name='invoice')
     guest = models.ForeignKey(GuestProfile, on_delete=models.CASCADE, related_name='invoices')
@@ -50,24 +58,71 @@ class Invoice(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Revenue by status since a date (created_at__date lookups)
+            models.Index(F('status'), TruncDate('created_at'), name='invoice_status_created_idx'),
+        ]
+    
     def __str__(self):
         return f"Invoice {self.invoice_number}"
     
+    def save(self, *args, **kwargs):
+        # Numbered with the insert, so a failed insert gives the number back
+        if self.invoice_number:
+            return super().save(*args, **kwargs)
+        with numbering_transaction('invoice'):
+            self.invoice_number = next_number('invoice', self.stay.reservation.hotel_id)
+            super().save(*args, **kwargs)
+    
     @property
     def balance_due(self):
         return self.total_amount - self.paid_amount
     
     def calculate_totals(self):
         """Calculate invoice totals from charge items"""
-        charge_items = self.charge_items.all()
-        self.subtotal = sum(item.amount for item in charge_items) or Decimal('0')
+        self.subtotal = self.charge_items.aggregate(total=Sum('amount'))['total'] or Decimal('0')
         
-        # Calculate tax amount based on tax rate
-        self.tax_amount = self.subtotal * (self.tax_rate / 100)
+        # Calculate tax amount based on tax rate (an int or float until the invoice is reloaded)
+        self.tax_amount = self.subtotal * (Decimal(str(self.tax_rate)) / 100)
         
         # Calculate total
         self.total_amount = self.subtotal + self.service_charge + self.tax_amount - self.discount_amount
         self.save()
+    
+    def add_to_totals(self, amount):
+        """
+        Add ``amount`` (negative to remove it) to the subtotal and update the
+        tax and total in the database, without reading the charge items.
+        """
+        subtotal = F('subtotal') + amount
+        tax_amount = subtotal * F('tax_rate') / 100
+        # subtotal is set last: MySQL evaluates SET clauses in order
+        Invoice.objects.filter(pk=self.pk).update(
+            tax_amount=tax_amount,
+            total_amount=subtotal + F('service_charge') + tax_amount - F('discount_amount'),
+            subtotal=subtotal,
+            updated_at=timezone.now(),
+        )
+        self.refresh_from_db(fields=['subtotal', 'tax_amount', 'total_amount', 'updated_at'])
+        # update() sends no post_save
+        transaction.on_commit(clear_billing_summary)
+    
+    def post_charges(self, charge_items):
+        """
+        Add unsaved ChargeItems to the invoice with one INSERT and
+        recalculate the totals once.
+        """
+        for item in charge_items:
+            item.invoice = self
+            item.amount = item.quantity * item.unit_price
+        
+        with transaction.atomic():
+            ChargeItem.objects.bulk_create(charge_items)
+            self.calculate_totals()
+        return charge_items
 
 class ChargeItem(models.Model):
     """Individual charge items on an invoice"""
@@ -98,15 +153,22 @@ class ChargeItem(models.Model):
     
     def save(self, *args, **kwargs):
         self.amount = self.quantity * self.unit_price
-        super().save(*args, **kwargs)
-        # Auto-calculate invoice totals
-        self.invoice.calculate_totals()
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Update invoice totals; a new item only adds its amount
+            if adding:
+                self.invoice.add_to_totals(self.amount)
+            else:
+                self.invoice.calculate_totals()
     
     def delete(self, *args, **kwargs):
         invoice = self.invoice
-        super().delete(*args, **kwargs)
-        # Auto-calculate invoice totals after deletion
-        invoice.calculate_totals()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # Update invoice totals after deletion
+            invoice.add_to_totals(-self.amount)
+        return result
     
     def __str__(self):
         return f"{self.description} - {self.amount}"
@@ -132,6 +194,8 @@ class Payment(models.Model):
         ('refunded', 'Refunded'),
     ]
     
+    HOTEL_LOOKUP = 'invoice__stay__reservation__hotel'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name='payments')
     method = models.CharField(max_length=20, choices=METHOD_CHOICES)
@@ -144,6 +208,8 @@ class Payment(models.Model):
     notes = models.TextField(blank=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     def __str__(self):
         return f"Payment {self.id} - {self.amount}"
 
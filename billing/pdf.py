@@ -0,0 +1,395 @@
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+from accounts.pdf_utils import HotelDocTemplate, get_pdf_styles
+import io
+
+class InvoiceDocTemplate(HotelDocTemplate):
+    """Invoice header and footer"""
+    
+    def __init__(self, filename, invoice, **kwargs):
+        self.invoice = invoice
+        status_color = colors.green if invoice.status == 'paid' else colors.red if invoice.status == 'overdue' else colors.orange
+        HotelDocTemplate.__init__(
+            self, filename, invoice.stay.reservation.hotel,
+            f'INVOICE #{invoice.invoice_number}', invoice.status, status_color, **kwargs
+        )
+
+def render_invoice_pdf(invoice):
+    """Invoice PDF as bytes"""
+    # Create PDF buffer
+    buffer = io.BytesIO()
+    
+    # Create custom document - reduced margins for single page
+    doc = InvoiceDocTemplate(buffer, invoice, pagesize=A4, topMargin=80, bottomMargin=50)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    
+    # Shared styles
+    styles = get_pdf_styles()
+    heading_style = styles['AuraHeading']
+    normal_style = styles['AuraNormal']
+    
+    # Add minimal space after header
+    elements.append(Spacer(1, 10))
+    
+    # Bill To and Ship To section
+    elements.append(Paragraph('BILLING INFORMATION', heading_style))
+    
+    # Create info table with better styling
+    hotel_info = f"""
+    <b style="color: #1e3a8a;">FROM:</b><br/>
+    <b>{invoice.stay.reservation.hotel.name}</b><br/>
+    {invoice.stay.reservation.hotel.address}<br/>
+    {invoice.stay.reservation.hotel.city}, {invoice.stay.reservation.hotel.country}<br/>
+    <b>Phone:</b> {invoice.stay.reservation.hotel.phone}<br/>
+    <b>Email:</b> {invoice.stay.reservation.hotel.email}
+    """
+    
+    guest_info = f"""
+    <b style="color: #1e3a8a;">BILL TO:</b><br/>
+    <b>{invoice.guest.full_name}</b><br/>
+    <b>Email:</b> {invoice.guest.email}<br/>
+    <b>Phone:</b> {invoice.guest.phone}<br/>
+    <b>Check-in:</b> {invoice.stay.actual_check_in.strftime('%B %d, %Y')}<br/>
+    <b>Check-out:</b> {invoice.stay.actual_check_out.strftime('%B %d, %Y') if invoice.stay.actual_check_out else 'Still checked in'}
+    """
+    
+    info_data = [
+        [Paragraph(hotel_info, normal_style), Paragraph(guest_info, normal_style)]
+    ]
+    
+    info_table = Table(info_data, colWidths=[3.5*inch, 3.5*inch])
+    info_table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f9fafb')),
+        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ('INNERGRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+    
+    elements.append(info_table)
+    elements.append(Spacer(1, 15))
+    
+    # Invoice details in a nice box
+    invoice_details_data = [
+        ['Invoice Date:', invoice.created_at.strftime('%B %d, %Y'), 'Due Date:', invoice.due_date.strftime('%B %d, %Y')],
+        ['Status:', f'{invoice.status.upper()}', 'Currency:', invoice.currency]
+    ]
+    
+    details_table = Table(invoice_details_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
+    details_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#eff6ff')),
+        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#3b82f6')),
+        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#93c5fd')),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+    
+    elements.append(details_table)
+    elements.append(Spacer(1, 15))
+    
+    # Items section
+    elements.append(Paragraph('INVOICE DETAILS', heading_style))
+    
+    # Charge items table with better styling
+    charge_data = [['Description', 'Qty', 'Unit Price', 'Amount']]
+    
+    for item in invoice.charge_items.all():
+        charge_data.append([
+            item.description,
+            str(item.quantity),
+            f"{invoice.currency} {item.unit_price:.2f}",
+            f"{invoice.currency} {item.amount:.2f}"
+        ])
+    
+    # Add empty row for spacing
+    charge_data.append(['', '', '', ''])
+    
+    # Calculate service charge percentage safely
+    service_charge_pct = 0
+    if invoice.subtotal > 0 and invoice.service_charge > 0:
+        service_charge_pct = (invoice.service_charge / invoice.subtotal) * 100
+    
+    # Add totals with better formatting
+    charge_data.extend([
+        ['', '', 'Subtotal:', f"{invoice.currency} {invoice.subtotal:.2f}"],
+        ['', '', f'Service ({service_charge_pct:.1f}%):', f"{invoice.currency} {invoice.service_charge:.2f}"] if invoice.service_charge > 0 else ['', '', 'Service Charge:', f"{invoice.currency} 0.00"],
+        ['', '', f'Tax ({invoice.tax_rate:.1f}%):', f"{invoice.currency} {invoice.tax_amount:.2f}"] if invoice.tax_rate > 0 else ['', '', 'Tax:', f"{invoice.currency} 0.00"],
+        ['', '', 'TOTAL:', f"{invoice.currency} {invoice.total_amount:.2f}"]
+    ])
+    
+    charge_table = Table(charge_data, colWidths=[3*inch, 0.7*inch, 1.8*inch, 1.5*inch])
+    charge_table.setStyle(TableStyle([
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (0, 1), (0, -1), 'LEFT'),  # Description left aligned
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        
+        # Data rows
+        ('BACKGROUND', (0, 1), (-1, -5), colors.white),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+        
+        # Totals section
+        ('FONTNAME', (2, -4), (-1, -1), 'Helvetica-Bold'),
+        ('BACKGROUND', (2, -4), (-1, -2), colors.HexColor('#f3f4f6')),
+        ('BACKGROUND', (2, -1), (-1, -1), colors.HexColor('#1e3a8a')),
+        ('TEXTCOLOR', (2, -1), (-1, -1), colors.white),
+        ('FONTSIZE', (2, -1), (-1, -1), 12),
+        
+        # Grid
+        ('GRID', (0, 0), (-1, -5), 1, colors.HexColor('#e5e7eb')),
+        ('GRID', (2, -4), (-1, -1), 1, colors.HexColor('#9ca3af')),
+        
+        # Alignment for totals
+        ('ALIGN', (2, -4), (-1, -1), 'RIGHT'),
+        ('ALIGN', (3, -4), (-1, -1), 'RIGHT'),
+    ]))
+    
+    elements.append(charge_table)
+    elements.append(Spacer(1, 15))
+    
+    # Payment status with enhanced styling
+    if invoice.status == 'paid':
+        status_text = f"<b style='color: #059669; font-size: 14px;'>✓ PAYMENT STATUS: PAID</b><br/>Payment received on {invoice.paid_date.strftime('%B %d, %Y') if invoice.paid_date else 'N/A'}"
+    elif invoice.status == 'overdue':
+        status_text = f"<b style='color: #dc2626; font-size: 14px;'>⚠ PAYMENT STATUS: OVERDUE</b><br/>Payment was due on {invoice.due_date.strftime('%B %d, %Y')}"
+    else:
+        status_text = f"<b style='color: #f59e0b; font-size: 14px;'>⏳ PAYMENT STATUS: {invoice.status.upper()}</b><br/>Payment due by {invoice.due_date.strftime('%B %d, %Y')}"
+    
+    elements.append(Paragraph(status_text, normal_style))
+    elements.append(Spacer(1, 10))
+    
+    # Thank you note
+    thank_you = Paragraph(
+        "<b>Thank you for choosing our hotel!</b><br/>We appreciate your business and look forward to serving you again.",
+        styles['AuraThankYou']
+    )
+    elements.append(thank_you)
+    
+    # Add invoice date at bottom right
+    elements.append(Spacer(1, 15))
+    invoice_date = Paragraph(
+        f"Date: {invoice.created_at.strftime('%B %d, %Y')}",
+        styles['AuraDate']
+    )
+    elements.append(invoice_date)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+class ReceiptDocTemplate(HotelDocTemplate):
+    """Payment receipt header and footer"""
+    
+    def __init__(self, filename, payment, **kwargs):
+        self.payment = payment
+        hotel = payment.invoice.stay.reservation.hotel if payment.invoice else None
+        status_color = colors.green if payment.status == 'completed' else colors.red if payment.status == 'failed' else colors.orange
+        HotelDocTemplate.__init__(
+            self, filename, hotel,
+            f'PAYMENT RECEIPT #{str(payment.id)[:8].upper()}', payment.status, status_color, **kwargs
+        )
+
+def render_receipt_pdf(payment):
+    """Payment receipt PDF as bytes"""
+    # Create PDF buffer
+    buffer = io.BytesIO()
+    
+    # Create custom document
+    doc = ReceiptDocTemplate(buffer, payment, pagesize=A4, topMargin=80, bottomMargin=50)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    
+    # Shared styles
+    styles = get_pdf_styles()
+    heading_style = styles['AuraHeading']
+    normal_style = styles['AuraNormal']
+    
+    # Add minimal space after header
+    elements.append(Spacer(1, 10))
+    
+    # Payment Information
+    elements.append(Paragraph('PAYMENT INFORMATION', heading_style))
+    
+    # Get hotel and guest info
+    hotel = payment.invoice.stay.reservation.hotel if payment.invoice else None
+    guest = payment.invoice.guest if payment.invoice else None
+    
+    # Create info table
+    hotel_info = f"""
+    <b style="color: #1e3a8a;">FROM:</b><br/>
+    <b>{hotel.name if hotel else 'Hotel'}</b><br/>
+    {hotel.address if hotel else ''}<br/>
+    {hotel.city if hotel else ''}, {hotel.country if hotel else ''}<br/>
+    <b>Phone:</b> {hotel.phone if hotel else ''}<br/>
+    <b>Email:</b> {hotel.email if hotel else ''}
+    """
+    
+    payment_info = f"""
+    <b style="color: #1e3a8a;">PAYMENT TO:</b><br/>
+    <b>{guest.full_name if guest else 'Guest'}</b><br/>
+    <b>Email:</b> {guest.email if guest else ''}<br/>
+    <b>Phone:</b> {guest.phone if guest else ''}<br/>
+    <b>Payment Date:</b> {payment.timestamp.strftime('%B %d, %Y')}<br/>
+    <b>Payment Method:</b> {payment.method or 'Credit Card'}
+    """
+    
+    info_data = [
+        [Paragraph(hotel_info, normal_style), Paragraph(payment_info, normal_style)]
+    ]
+    
+    info_table = Table(info_data, colWidths=[3.5*inch, 3.5*inch])
+    info_table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f9fafb')),
+        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ('INNERGRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+    
+    elements.append(info_table)
+    elements.append(Spacer(1, 15))
+    
+    # Payment details
+    payment_details_data = [
+        ['Payment ID:', str(payment.id)[:8].upper(), 'Amount:', f"${payment.amount:.2f}"],
+        ['Status:', payment.status.upper(), 'Method:', payment.method or 'Credit Card']
+    ]
+    
+    if payment.invoice:
+        payment_details_data.append(['Invoice:', payment.invoice.invoice_number, 'Date:', payment.timestamp.strftime('%B %d, %Y')])
+    
+    details_table = Table(payment_details_data, colWidths=[1.5*inch, 2*inch, 1.5*inch, 2*inch])
+    details_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#eff6ff')),
+        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#3b82f6')),
+        ('INNERGRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#93c5fd')),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+    
+    elements.append(details_table)
+    elements.append(Spacer(1, 20))
+    
+    # Payment amount table
+    elements.append(Paragraph('PAYMENT DETAILS', heading_style))
+    
+    amount_data = [
+        ['Description', 'Amount']
+    ]
+    
+    if payment.invoice:
+        amount_data.append([f'Payment for Invoice #{payment.invoice.invoice_number}', f"${payment.amount:.2f}"])
+    else:
+        amount_data.append(['Payment Received', f"${payment.amount:.2f}"])
+    
+    # Add total
+    amount_data.extend([
+        ['', ''],
+        ['TOTAL PAID:', f"${payment.amount:.2f}"]
+    ])
+    
+    amount_table = Table(amount_data, colWidths=[5*inch, 2*inch])
+    amount_table.setStyle(TableStyle([
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        
+        # Data rows
+        ('BACKGROUND', (0, 1), (-1, -2), colors.white),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+        
+        # Total section
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#1e3a8a')),
+        ('TEXTCOLOR', (0, -1), (-1, -1), colors.white),
+        ('FONTSIZE', (0, -1), (-1, -1), 12),
+        
+        # Grid
+        ('GRID', (0, 0), (-1, -2), 1, colors.HexColor('#e5e7eb')),
+        ('GRID', (0, -1), (-1, -1), 1, colors.HexColor('#9ca3af')),
+        
+        # Alignment
+        ('ALIGN', (0, -1), (-1, -1), 'RIGHT'),
+        ('ALIGN', (1, -1), (-1, -1), 'RIGHT'),
+    ]))
+    
+    elements.append(amount_table)
+    elements.append(Spacer(1, 15))
+    
+    # Payment status
+    if payment.status == 'completed':
+        status_text = f"<b style='color: #059669; font-size: 14px;'>✓ PAYMENT STATUS: COMPLETED</b><br/>Payment processed on {payment.timestamp.strftime('%B %d, %Y')}"
+    elif payment.status == 'refunded':
+        status_text = "<b style='color: #dc2626; font-size: 14px;'>↩ PAYMENT STATUS: REFUNDED</b><br/>Payment was refunded"
+    else:
+        status_text = f"<b style='color: #f59e0b; font-size: 14px;'>⏳ PAYMENT STATUS: {payment.status.upper()}</b><br/>Payment processed on {payment.timestamp.strftime('%B %d, %Y')}"
+    
+    elements.append(Paragraph(status_text, normal_style))
+    elements.append(Spacer(1, 10))
+    
+    # Thank you note
+    thank_you = Paragraph(
+        "<b>Thank you for your payment!</b><br/>This receipt confirms your payment has been processed.",
+        styles['AuraThankYou']
+    )
+    elements.append(thank_you)
+    
+    # Add receipt date at bottom right
+    elements.append(Spacer(1, 15))
+    receipt_date = Paragraph(
+        f"Receipt Date: {payment.timestamp.strftime('%B %d, %Y')}",
+        styles['AuraDate']
+    )
+    elements.append(receipt_date)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
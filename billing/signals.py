@@ -0,0 +1,11 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Invoice, Payment
+from .summary import clear_billing_summary
+
+@receiver([post_save, post_delete], sender=Payment)
+@receiver([post_save, post_delete], sender=Invoice)
+def invalidate_billing_summary(sender, **kwargs):
+    """Drop the cached billing summaries once the change is committed"""
+    transaction.on_commit(clear_billing_summary)
@@ -0,0 +1,91 @@
+import uuid
+from datetime import timedelta
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+BILLING_SUMMARY_TIMEOUT = 60
+BILLING_SUMMARY_VERSION_KEY = 'billing_summary:version'
+
+# checkout_guest creates invoices as 'pending', which is not a listed choice
+EXTRA_INVOICE_STATUSES = ['pending']
+
+def _windows(today):
+    """Start date of each time window ending today"""
+    return {
+        'day': today,
+        'week': today - timedelta(days=today.weekday()),
+        'month': today.replace(day=1),
+    }
+
+def _buckets(queryset, amount_field, statuses, windows, window_field, window_status):
+    """
+    One aggregate over ``queryset``: amount and count per status, the
+    amount of ``window_status`` rows per time window and the total count
+    """
+    aggregates = {'count': Count('pk')}
+    for status in statuses:
+        aggregates[f'{status}_amount'] = Sum(amount_field, filter=Q(status=status))
+        aggregates[f'{status}_count'] = Count('pk', filter=Q(status=status))
+    for window, start in windows.items():
+        aggregates[f'{window}_window'] = Sum(amount_field, filter=Q(status=window_status, **{f'{window_field}__date__gte': start}))
+
+    values = queryset.aggregate(**aggregates)
+    return {
+        'count': values['count'],
+        'statuses': {
+            status: {'amount': values[f'{status}_amount'] or 0, 'count': values[f'{status}_count']}
+            for status in statuses
+        },
+        'windows': {window: values[f'{window}_window'] or 0 for window in windows},
+    }
+
+def compute_billing_summary(hotel_ids=None):
+    """
+    Payment and invoice totals of the hotels ``hotel_ids`` (all hotels if
+    None), excluding soft-deleted rows, one query per table:
+
+    - ``payments``: amount and count per status, completed payments per
+      day/week/month window (by timestamp)
+    - ``invoices``: total amount and count per status, paid invoices per
+      window (by creation date)
+    """
+    from .models import Invoice, Payment
+    windows = _windows(timezone.localdate())
+
+    payments = Payment.objects.alive()
+    invoices = Invoice.objects.alive()
+    if hotel_ids is not None:
+        payments = payments.for_hotel(hotel_ids)
+        invoices = invoices.for_hotel(hotel_ids)
+
+    payment_statuses = [status for status, _ in Payment.STATUS_CHOICES]
+    invoice_statuses = [status for status, _ in Invoice.STATUS_CHOICES] + EXTRA_INVOICE_STATUSES
+    return {
+        'payments': _buckets(payments, 'amount', payment_statuses, windows, 'timestamp', 'completed'),
+        'invoices': _buckets(invoices, 'total_amount', invoice_statuses, windows, 'created_at', 'paid'),
+    }
+
+def _version():
+    version = cache.get(BILLING_SUMMARY_VERSION_KEY)
+    if version is None:
+        cache.add(BILLING_SUMMARY_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(BILLING_SUMMARY_VERSION_KEY)
+    return version
+
+def get_billing_summary(hotel_ids=None):
+    """
+    compute_billing_summary(), cached for BILLING_SUMMARY_TIMEOUT seconds.
+    Pass user_hotel_ids(user) to summarise what a user may see.
+    """
+    scope = 'all' if hotel_ids is None else '-'.join(map(str, sorted(hotel_ids))) or 'none'
+    key = f'billing_summary:{scope}:{_version()}'
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_billing_summary(hotel_ids)
+        cache.set(key, summary, BILLING_SUMMARY_TIMEOUT)
+    return summary
+
+def clear_billing_summary():
+    """Invalidate the cached summaries of every hotel"""
+    cache.set(BILLING_SUMMARY_VERSION_KEY, uuid.uuid4().hex, None)
@@ -4,10 +4,26 @@ from django.contrib import messages
 from django.db import models
 from .models import GuestProfile
 from accounts.decorators import owner_or_permission_required
+from accounts.export_utils import EXPORT_FORMATS, export_response
 from hotels.models import Hotel, Company
 from hotels.forms import GuestForm
 from reservations.models import Reservation
 
+GUEST_EXPORT_COLUMNS = [
+    ('Guest ID', 'id'),
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Guest Type', 'guest_type'),
+    ('Company', 'company__name'),
+    ('Nationality', 'nationality'),
+    ('National ID Card', 'national_id_card'),
+    ('Loyalty Status', 'loyalty_status'),
+    ('Loyalty Points', 'loyalty_points'),
+    ('Created', 'created_at'),
+]
+
 @login_required
 def guest_list(request):
     # Check if user has permission to view guests
@@ -65,6 +81,9 @@ def guest_list(request):
     
     guests = guests.order_by('-created_at')
     
+    if request.GET.get('export') in EXPORT_FORMATS:
+        return export_response(request, guests, GUEST_EXPORT_COLUMNS, 'guests')
+    
     # Get filter options
     from django_countries import countries
     companies = Company.objects.filter(is_active=True)
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 from hotels.models import Hotel, Room
+from hotels.numbering import next_number, numbering_transaction
+from hotels.querysets import HotelScopedQuerySet
 from reservations.models import Reservation
 from crm.models import GuestProfile
 import uuid
@@ -14,6 +16,8 @@ class CheckInOut(models.Model):
         ('early_departure', 'Early Departure'),
     ]
     
+    HOTEL_LOOKUP = 'reservation__hotel'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, related_name='checkin_record')
     guest = models.ForeignKey(GuestProfile, on_delete=models.CASCADE)
@@ -42,6 +46,8 @@ class CheckInOut(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     def __str__(self):
         return f"Check-in {self.guest.full_name} - Room {self.room.room_number}"
 
@@ -90,6 +96,14 @@ class GuestFolio(models.Model):
     
     def __str__(self):
         return f"Folio {self.folio_number} - {self.guest.full_name}"
+    
+    def save(self, *args, **kwargs):
+        # Numbered with the insert, so a failed insert gives the number back
+        if self.folio_number:
+            return super().save(*args, **kwargs)
+        with numbering_transaction('folio'):
+            self.folio_number = next_number('folio', self.checkin_record.reservation.hotel_id)
+            super().save(*args, **kwargs)
 
 class FolioCharge(models.Model):
     """Individual charges on guest folio"""
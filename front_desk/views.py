@@ -1,13 +1,19 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Q, Sum
+from django.db.models import Count, Q, Sum
 from .models import CheckInOut, WalkInReservation, GuestFolio, FolioCharge, NightAudit
 from reservations.models import Reservation
+from reservations.availability import get_available_rooms, is_room_available
+from reservations.inventory import RoomUnavailable
 from hotels.models import Room, Hotel
+from hotels.room_board import current_sequence, room_board_live
 from crm.models import GuestProfile
+from reporting.metrics import record_daily_metrics
+from accounts.decorators import async_login_required
 import json
 from django.views.decorators.http import require_http_methods
 
@@ -57,60 +63,65 @@ def check_in_guest(request, reservation_id):
     """Check-in a guest"""
     reservation = get_object_or_404(Reservation, id=reservation_id)
     
+    # Rooms free for the whole stay, ignoring this reservation's own hold
+    available_rooms = get_available_rooms(
+        reservation.hotel,
+        reservation.check_in,
+        reservation.check_out,
+        exclude_reservation=reservation
+    )
+    
     if request.method == 'POST':
         # Assign room if not already assigned
         room_id = request.POST.get('room_id')
         if room_id:
-            room = get_object_or_404(Room, id=room_id)
+            room = get_object_or_404(available_rooms, room_id=room_id)
+        elif is_room_available(reservation.room, reservation.check_in, reservation.check_out, exclude_reservation=reservation):
+            room = reservation.room
         else:
-            # Auto-assign available room of the reserved type
-            room = Room.objects.filter(
-                room_type=reservation.room_type,
-                status='clean'
-            ).first()
+            # Auto-assign a free room of the reserved type
+            room = available_rooms.filter(room_type=reservation.room.room_type).first()
         
         if not room:
             messages.error(request, 'No available rooms of the reserved type.')
             return redirect('front_desk:dashboard')
         
-        # Create check-in record
-        checkin = CheckInOut.objects.create(
-            reservation=reservation,
-            guest=reservation.guest,
-            room=room,
-            checked_in_at=timezone.now(),
-            checked_in_by=request.user,
-            number_of_guests=request.POST.get('number_of_guests', reservation.adults),
-            special_requests=request.POST.get('special_requests', ''),
-            incidental_deposit=request.POST.get('incidental_deposit', 0)
-        )
-        
-        # Update reservation status
-        reservation.status = 'checked_in'
-        reservation.save()
+        try:
+            with transaction.atomic():
+                # Create check-in record
+                checkin = CheckInOut.objects.create(
+                    reservation=reservation,
+                    guest=reservation.guest,
+                    room=room,
+                    checked_in_at=timezone.now(),
+                    checked_in_by=request.user,
+                    number_of_guests=request.POST.get('number_of_guests', reservation.adults),
+                    special_requests=request.POST.get('special_requests', ''),
+                    incidental_deposit=request.POST.get('incidental_deposit', 0)
+                )
+                
+                # Update reservation status and the room actually assigned
+                reservation.room = room
+                reservation.status = 'checked_in'
+                reservation.save()
+        except RoomUnavailable:
+            messages.error(request, f'Room {room.room_number} was booked by someone else in the meantime.')
+            return redirect('front_desk:dashboard')
         
         # Update room status
         room.status = 'occupied'
         room.save()
         
-        # Create guest folio
-        folio_number = f"F{timezone.now().strftime('%Y%m%d')}{checkin.id.hex[:6].upper()}"
+        # Create guest folio, numbered on save
         GuestFolio.objects.create(
             checkin_record=checkin,
             guest=reservation.guest,
-            folio_number=folio_number,
             room_charges=reservation.rate * reservation.total_nights
         )
         
         messages.success(request, f'Guest {reservation.guest.full_name} checked in successfully to room {room.room_number}')
         return redirect('front_desk:dashboard')
     
-    # Get available rooms for the reservation
-    available_rooms = Room.objects.filter(
-        room_type=reservation.room_type,
-        status='clean'
-    )
-    
     context = {
         'reservation': reservation,
         'available_rooms': available_rooms,
@@ -252,8 +263,19 @@ def night_audit(request):
     """Perform night audit"""
     today = timezone.now().date()
     
+    # Get user's hotel
+    if hasattr(request.user, 'assigned_hotel') and request.user.assigned_hotel:
+        hotel = request.user.assigned_hotel
+    else:
+        hotel = Hotel.objects.filter(owner=request.user, deleted_at__isnull=True).first()
+    
+    if not hotel:
+        messages.error(request, 'No hotel assigned to your account.')
+        return redirect('front_desk:dashboard')
+    
     # Check if audit already performed today
     audit, created = NightAudit.objects.get_or_create(
+        property=hotel,
         audit_date=today,
         defaults={
             'performed_by': request.user,
@@ -262,35 +284,15 @@ def night_audit(request):
     )
     
     if request.method == 'POST' and not audit.is_completed:
-        # Calculate statistics
-        occupied_rooms = CheckInOut.objects.filter(
-            status='checked_in',
-            checked_out_at__isnull=True
-        ).count()
-        
-        total_revenue = GuestFolio.objects.filter(
-            created_at__date=today
-        ).aggregate(total=Sum('total_charges'))['total'] or 0
-        
-        arrivals_count = CheckInOut.objects.filter(
-            checked_in_at__date=today
-        ).count()
-        
-        departures_count = CheckInOut.objects.filter(
-            checked_out_at__date=today
-        ).count()
-        
-        no_shows_count = Reservation.objects.filter(
-            check_in=today,
-            status='no_show'
-        ).count()
+        # Calculate statistics and store them as daily KPI rollups
+        kpis = record_daily_metrics(hotel, today)
         
         # Update audit record
-        audit.total_occupied_rooms = occupied_rooms
-        audit.total_revenue = total_revenue
-        audit.arrivals_count = arrivals_count
-        audit.departures_count = departures_count
-        audit.no_shows_count = no_shows_count
+        audit.total_occupied_rooms = kpis['occupied_rooms']
+        audit.total_revenue = kpis['total_revenue']
+        audit.arrivals_count = kpis['arrivals']
+        audit.departures_count = kpis['departures']
+        audit.no_shows_count = kpis['no_shows']
         audit.end_time = timezone.now()
         audit.is_completed = True
         audit.notes = request.POST.get('notes', '')
@@ -368,15 +370,19 @@ def room_availability(request):
             rooms_by_floor[floor_name] = []
         rooms_by_floor[floor_name].append(room)
     
-    # Room statistics
-    total_rooms = rooms.count()
-    available_rooms = rooms.filter(status='Available').count()
-    occupied_rooms = rooms.filter(status='Occupied').count()
-    dirty_rooms = rooms.filter(status='Dirty').count()
-    maintenance_rooms = rooms.filter(status='Maintenance').count()
+    # Room statistics, in one query
+    stats = rooms.aggregate(
+        total=Count('pk'),
+        available=Count('pk', filter=Q(status='Available')),
+        occupied=Count('pk', filter=Q(status='Occupied')),
+        dirty=Count('pk', filter=Q(status='Dirty')),
+        maintenance=Count('pk', filter=Q(status='Maintenance')),
+    )
     
     context = {
         'hotel': hotel,
+        # Live updates start from the events published after this render
+        'room_board_since': current_sequence(hotel.hotel_id) if room_board_live(request) else None,
         'rooms': rooms,
         'rooms_by_floor': rooms_by_floor,
         'floors': floors,
@@ -384,39 +390,43 @@ def room_availability(request):
         'selected_floor': floor_filter,
         'selected_status': status_filter,
         'search_query': search_query,
-        'total_rooms': total_rooms,
-        'available_rooms': available_rooms,
-        'occupied_rooms': occupied_rooms,
-        'dirty_rooms': dirty_rooms,
-        'maintenance_rooms': maintenance_rooms,
+        'total_rooms': stats['total'],
+        'available_rooms': stats['available'],
+        'occupied_rooms': stats['occupied'],
+        'dirty_rooms': stats['dirty'],
+        'maintenance_rooms': stats['maintenance'],
     }
     
     return render(request, 'front_desk/room_availability.html', context)
 
-@login_required
-def room_details_ajax(request, room_id):
+@async_login_required
+async def room_details_ajax(request, room_id):
     """Get room details via AJAX"""
     try:
-        room = get_object_or_404(Room, room_id=room_id)
+        try:
+            room = await Room.objects.select_related(
+                'room_type', 'bed_type', 'floor'
+            ).prefetch_related('amenities').aget(room_id=room_id)
+        except Room.DoesNotExist:
+            raise Http404('No Room matches the given query.')
         
         # Check if user has access to this room's hotel
-        user_hotel = None
-        if hasattr(request.user, 'assigned_hotel') and request.user.assigned_hotel:
-            user_hotel = request.user.assigned_hotel
-        else:
-            user_hotel = Hotel.objects.filter(owner=request.user, deleted_at__isnull=True).first()
+        user_hotel_id = request.user.assigned_hotel_id
+        if not user_hotel_id:
+            user_hotel_id = await Hotel.objects.filter(
+                owner=request.user, deleted_at__isnull=True
+            ).values_list('hotel_id', flat=True).afirst()
         
-        if not user_hotel or room.hotel != user_hotel:
+        if not user_hotel_id or room.hotel_id != user_hotel_id:
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Get current reservation if room is occupied
         current_reservation = None
         if room.status == 'Occupied':
-            from reservations.models import Reservation
-            current_reservation = Reservation.objects.filter(
+            current_reservation = await Reservation.objects.filter(
                 room=room,
                 status='checked_in'
-            ).select_related('guest').first()
+            ).select_related('guest').afirst()
         
         room_data = {
             'room_number': room.room_number,
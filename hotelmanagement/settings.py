@@ -46,11 +46,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'accounts.middleware.ContextTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'hotels.middleware.CurrentUserMiddleware',
+    'hotels.middleware.ActivityLogMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,6 +82,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'hotelmanagement.wsgi.application'
 
+# ASGI entry point for serving the async polling endpoints, e.g.
+# gunicorn hotelmanagement.asgi:application -k uvicorn.workers.UvicornWorker
+ASGI_APPLICATION = 'hotelmanagement.asgi.application'
+
 # Database
 if os.getenv('DATABASE_URL'):
     # Production database (from DATABASE_URL)
@@ -135,6 +141,40 @@ STATICFILES_DIRS = [
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Celery (background report generation, notifications)
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False').lower() == 'true'
+
+# Cache shared by every server process, e.g. redis://localhost:6379/1.
+# Without it each process keeps its own local-memory cache
+if os.getenv('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_URL'),
+        }
+    }
+
+# Write room activity logs from a Celery worker instead of the request
+ROOM_ACTIVITY_LOG_BACKGROUND = os.getenv('ROOM_ACTIVITY_LOG_BACKGROUND', 'False').lower() == 'true'
+
+# Days of room activity kept in the live table by archive_room_activity
+ROOM_ACTIVITY_RETENTION_DAYS = int(os.getenv('ROOM_ACTIVITY_RETENTION_DAYS', '365'))
+
+# Seconds a live room board stream stays open before the browser reconnects.
+# Room boards are only live under ASGI and with a shared cache (CACHE_URL);
+# otherwise pages refresh
+ROOM_BOARD_STREAM_SECONDS = int(os.getenv('ROOM_BOARD_STREAM_SECONDS', '300'))
+
+# Document numbers each worker reserves at a time, per kind (see
+# hotels.numbering); 1 numbers gaplessly, invoices are gapless by default
+DOCUMENT_NUMBER_BLOCK_SIZES = {
+    'invoice': int(os.getenv('INVOICE_NUMBER_BLOCK_SIZE', '1')),
+    'folio': int(os.getenv('FOLIO_NUMBER_BLOCK_SIZE', '50')),
+    'pos_order': int(os.getenv('POS_ORDER_NUMBER_BLOCK_SIZE', '50')),
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,174 @@
+import base64
+import contextvars
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Open activity log buffers, innermost last. A tuple so that nested
+# contexts (threads, asyncio tasks) never share a mutable stack
+_buffers = contextvars.ContextVar('activity_log_buffers', default=())
+
+def serialize_activity(entry):
+    """Plain dict of an unsaved RoomActivityLog, for the background writer"""
+    return {
+        'room_id': entry.room_id,
+        'user_id': entry.user_id,
+        'action': entry.action,
+        'description': entry.description,
+        'old_value': entry.old_value,
+        'new_value': entry.new_value,
+        'metadata': entry.metadata,
+        'created_at': entry.created_at.isoformat(),
+    }
+
+def write_activities(entries):
+    """
+    Insert ``entries`` with one bulk_create, or hand them to the background
+    writer when ROOM_ACTIVITY_LOG_BACKGROUND is set. If the task cannot be
+    queued they are written here, so entries are never lost.
+    """
+    if not entries:
+        return
+
+    if getattr(settings, 'ROOM_ACTIVITY_LOG_BACKGROUND', False):
+        try:
+            from .tasks import write_room_activities
+            write_room_activities.delay([serialize_activity(entry) for entry in entries])
+            return
+        except Exception as e:
+            logger.warning(f"Could not queue {len(entries)} room activities, writing them now: {str(e)}")
+
+    from .activity_models import RoomActivityLog
+    RoomActivityLog.objects.bulk_create(entries)
+
+def enqueue_activity(entry):
+    """
+    Record an unsaved RoomActivityLog.
+
+    Inside a transaction the entry only counts once it commits, so a rolled
+    back change is never logged. It then joins the innermost open buffer
+    (see buffered_activity_log) or, without one, is written straight away.
+    """
+    buffers = _buffers.get()
+    collect = buffers[-1].append if buffers else (lambda entry: write_activities([entry]))
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(collect, entry))
+    else:
+        collect(entry)
+
+def push_activity_buffer():
+    """Open a buffer; returns ``(token, entries)`` for pop_activity_buffer"""
+    entries = []
+    return _buffers.set(_buffers.get() + (entries,)), entries
+
+def pop_activity_buffer(token):
+    """Close the buffer opened with ``token``; flush its entries separately"""
+    _buffers.reset(token)
+
+def flush_activity_buffer(entries):
+    """Write buffered entries, after the enclosing transaction commits if there is one"""
+    flush = partial(write_activities, entries)
+    if connection.in_atomic_block:
+        transaction.on_commit(flush)
+    else:
+        flush()
+
+@contextmanager
+def buffered_activity_log():
+    """
+    Collect the activities logged inside the block and write them with a
+    single bulk insert when it exits (after the enclosing transaction
+    commits, if there is one).
+    """
+    token, entries = push_activity_buffer()
+    try:
+        yield entries
+    finally:
+        pop_activity_buffer(token)
+        flush_activity_buffer(entries)
+
+def encode_cursor(entry):
+    """Opaque cursor pointing just past ``entry`` in a room timeline"""
+    return base64.urlsafe_b64encode(f'{entry.created_at.isoformat()}|{entry.pk}'.encode()).decode()
+
+def decode_cursor(cursor):
+    """(created_at, id) of a cursor, or None if it is not valid"""
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        return (created_at, int(pk)) if created_at else None
+    except (ValueError, UnicodeError):
+        return None
+
+def activity_page(room, cursor=None, limit=20):
+    """
+    One page of a room's activity timeline, newest first.
+
+    Keyset pagination on (created_at, id): every page is an index range
+    scan on the (room, created_at, id) index however deep it is. Returns
+    ``(entries, next_cursor)``; next_cursor is None on the last page.
+    """
+    from .activity_models import RoomActivityLog
+    
+    activities = RoomActivityLog.objects.filter(room=room).select_related('user')
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, pk = position
+        activities = activities.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    
+    entries = list(activities.order_by('-created_at', '-id')[:limit + 1])
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    return entries[:limit], next_cursor
+
+def archive_activities(before, batch_size=1000):
+    """
+    Move activities created before ``before`` into RoomActivityArchive,
+    one row per room and month, in batches of ``batch_size``. Each batch
+    is its own transaction so the sweep can be interrupted safely.
+    Returns the number of archived entries.
+    """
+    from .activity_models import RoomActivityArchive, RoomActivityLog
+    
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(RoomActivityLog.objects.filter(created_at__lt=before).order_by('created_at', 'id')[:batch_size])
+            if not batch:
+                break
+            
+            groups = defaultdict(list)
+            for entry in batch:
+                month = timezone.localtime(entry.created_at).date().replace(day=1)
+                groups[(entry.room_id, month)].append({'id': entry.pk, **serialize_activity(entry)})
+            
+            existing = {
+                (archive.room_id, archive.month): archive
+                for archive in RoomActivityArchive.objects.select_for_update().filter(
+                    room_id__in={room_id for room_id, _ in groups},
+                    month__in={month for _, month in groups},
+                )
+            }
+            new_archives, updated_archives = [], []
+            for (room_id, month), entries in groups.items():
+                archive = existing.get((room_id, month))
+                if archive is None:
+                    new_archives.append(RoomActivityArchive(room_id=room_id, month=month, entries=entries, entry_count=len(entries)))
+                else:
+                    archive.entries = archive.entries + entries
+                    archive.entry_count = len(archive.entries)
+                    archive.updated_at = timezone.now()
+                    updated_archives.append(archive)
+            
+            RoomActivityArchive.objects.bulk_create(new_archives)
+            RoomActivityArchive.objects.bulk_update(updated_archives, ['entries', 'entry_count', 'updated_at'])
+            RoomActivityLog.objects.filter(id__in=[entry.pk for entry in batch]).delete()
+            archived += len(batch)
+    return archived
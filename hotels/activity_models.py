@@ -41,26 +41,42 @@ class RoomActivityLog(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         verbose_name = 'Room Activity Log'
         verbose_name_plural = 'Room Activity Logs'
+        indexes = [
+            # Room timelines and their keyset pagination
+            models.Index(fields=['room', '-created_at', '-id'], name='hotels_activity_room_time'),
+            # Retention sweeps
+            models.Index(fields=['created_at'], name='hotels_activity_created'),
+        ]
     
     def __str__(self):
         user_name = self.user.get_full_name() if self.user else 'System'
         return f"{user_name} - {self.get_action_display()} - Room {self.room.room_number}"
     
     @classmethod
-    def log_activity(cls, room, user, action, description, old_value=None, new_value=None, **metadata):
-        """Helper method to create activity logs"""
-        return cls.objects.create(
+    def log_activity(cls, room, user, action, description, old_value=None, new_value=None, metadata=None, **extra):
+        """
+        Log a room activity.
+
+        The entry is buffered and inserted in bulk with the other entries of
+        the request or transaction (see hotels.activity_log), so the returned
+        instance is not saved yet.
+        """
+        from .activity_log import enqueue_activity
+        
+        entry = cls(
             room=room,
             user=user,
             action=action,
             description=description,
             old_value=old_value,
             new_value=new_value,
-            metadata=metadata
+            metadata={**(metadata or {}), **extra}
         )
+        enqueue_activity(entry)
+        return entry
     
     def get_time_ago(self):
         """Get human readable time difference"""
@@ -76,4 +92,28 @@ class RoomActivityLog(models.Model):
         role = getattr(self.user, 'role', None)
         if role:
             return f"{name} ({role})"
-        return name
\ No newline at end of file
+        return name
+
+
+class RoomActivityArchive(models.Model):
+    """
+    Room activities moved out of RoomActivityLog by archive_room_activity,
+    stored as one row per room and month to keep the archive compact.
+    """
+    
+    room = models.ForeignKey('Room', on_delete=models.CASCADE, related_name='activity_archives')
+    month = models.DateField(help_text='First day of the month the entries belong to')
+    entries = models.JSONField(default=list, help_text='Archived entries, oldest first')
+    entry_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['room', '-month']
+        verbose_name = 'Room Activity Archive'
+        verbose_name_plural = 'Room Activity Archives'
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'month'], name='unique_room_activity_archive_month'),
+        ]
+    
+    def __str__(self):
+        return f"Room {self.room_id} - {self.month:%Y-%m} ({self.entry_count} entries)"
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_init, pre_save
+
+# Model label -> attnames whose changes are tracked
+_tracked_fields = {}
+
+def track_changes(model_label, fields):
+    """
+    Track changes to ``fields`` of ``model_label`` ('app_label.ModelName')
+    without querying the database.
+
+    The loaded values are snapshotted when an instance is created or read,
+    and compared with the values being written in pre_save; receivers read
+    the result with get_changes(). Repeated calls add to the tracked fields.
+    """
+    _tracked_fields[model_label] = tuple(dict.fromkeys(_tracked_fields.get(model_label, ()) + tuple(fields)))
+    post_init.connect(_snapshot, sender=model_label, weak=False, dispatch_uid=f'track_changes_init:{model_label}')
+    pre_save.connect(_diff, sender=model_label, weak=False, dispatch_uid=f'track_changes_save:{model_label}')
+
+def _loaded_values(instance):
+    # Deferred fields are not in __dict__ and are left out
+    fields = _tracked_fields[instance._meta.label]
+    return {field: instance.__dict__[field] for field in fields if field in instance.__dict__}
+
+def _snapshot(sender, instance, **kwargs):
+    instance._loaded_values = _loaded_values(instance)
+
+def _diff(sender, instance, **kwargs):
+    old_values = getattr(instance, '_loaded_values', {})
+    new_values = _loaded_values(instance)
+    if instance._state.adding:
+        instance._changes = {}
+    else:
+        instance._changes = {
+            field: old_values[field]
+            for field, value in new_values.items()
+            if field in old_values and old_values[field] != value
+        }
+    instance._loaded_values = new_values
+
+def get_changes(instance):
+    """{attname: old value} of the tracked fields changed by the current save"""
+    return getattr(instance, '_changes', {})
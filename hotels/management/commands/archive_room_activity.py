@@ -0,0 +1,33 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from hotels.activity_log import archive_activities
+from hotels.activity_models import RoomActivityLog
+
+class Command(BaseCommand):
+    help = 'Move room activity log entries past the retention period into the compact archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'ROOM_ACTIVITY_RETENTION_DAYS', 365),
+                            help='Keep this many days of activity in the live table')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Entries archived per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many entries would be archived')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        
+        before = timezone.now() - timedelta(days=options['days'])
+        pending = RoomActivityLog.objects.filter(created_at__lt=before).count()
+        self.stdout.write(f'{pending} activities older than {before:%Y-%m-%d}')
+        
+        if options['dry_run'] or not pending:
+            return
+        
+        started = time.monotonic()
+        archived = archive_activities(before, batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived} activities in {time.monotonic() - started:.1f}s'
+        ))
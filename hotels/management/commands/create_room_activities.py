@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from hotels.models import Room
+from hotels.activity_log import buffered_activity_log
 from hotels.activity_models import RoomActivityLog
 from django.contrib.auth import get_user_model
 
@@ -11,9 +12,14 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         system_user = User.objects.filter(is_superuser=True).first()
         
-        for room in Room.objects.all():
-            # Create room creation activity if not exists
-            if not room.activity_logs.filter(action='other', description__contains='created').exists():
+        # Rooms that already have a creation activity
+        logged_rooms = set(RoomActivityLog.objects.filter(
+            action='other', description__contains='created'
+        ).values_list('room_id', flat=True))
+        
+        # Written with one bulk insert when the block exits
+        with buffered_activity_log() as entries:
+            for room in Room.objects.select_related('room_type').exclude(room_id__in=logged_rooms):
                 RoomActivityLog.log_activity(
                     room=room,
                     user=system_user,
@@ -23,4 +29,4 @@ class Command(BaseCommand):
                 )
                 self.stdout.write(f'Created activity for room {room.room_number}')
         
-        self.stdout.write(self.style.SUCCESS('Successfully created room activities'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f'Successfully created {len(entries)} room activities'))
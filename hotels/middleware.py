@@ -1,17 +1,65 @@
-from .signals import set_current_user
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from .activity_log import flush_activity_buffer, pop_activity_buffer, push_activity_buffer
+from .signals import reset_current_user, set_current_user
 
 class CurrentUserMiddleware:
     """Middleware to track current user for activity logging"""
     
+    async_capable = True
+    sync_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        
+        # Set for this request only; the reset keeps a reused worker thread
+        # from attributing later activity to this user
+        token = set_current_user(getattr(request, 'user', None))
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_user(token)
+    
+    async def __acall__(self, request):
+        token = set_current_user(getattr(request, 'user', None))
+        try:
+            return await self.get_response(request)
+        finally:
+            reset_current_user(token)
+
+
+class ActivityLogMiddleware:
+    """Write the room activities logged during a request in one bulk insert"""
+    
+    async_capable = True
+    sync_capable = True
+    
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Set current user in thread-local storage
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            set_current_user(request.user)
-        else:
-            set_current_user(None)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         
-        response = self.get_response(request)
-        return response
\ No newline at end of file
+        token, entries = push_activity_buffer()
+        try:
+            return self.get_response(request)
+        finally:
+            pop_activity_buffer(token)
+            flush_activity_buffer(entries)
+    
+    async def __acall__(self, request):
+        token, entries = push_activity_buffer()
+        try:
+            return await self.get_response(request)
+        finally:
+            pop_activity_buffer(token)
+            if entries:
+                await sync_to_async(flush_activity_buffer)(entries)
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0025_alter_room_has_ac_alter_room_has_tv_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomActivityArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the entries belong to')),
+                ('entries', models.JSONField(default=list, help_text='Archived entries, oldest first')),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Room Activity Archive',
+                'verbose_name_plural': 'Room Activity Archives',
+                'ordering': ['room', '-month'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='roomactivitylog',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Room Activity Log', 'verbose_name_plural': 'Room Activity Logs'},
+        ),
+        migrations.AddIndex(
+            model_name='roomactivitylog',
+            index=models.Index(fields=['room', '-created_at', '-id'], name='hotels_activity_room_time'),
+        ),
+        migrations.AddIndex(
+            model_name='roomactivitylog',
+            index=models.Index(fields=['created_at'], name='hotels_activity_created'),
+        ),
+        migrations.AddField(
+            model_name='roomactivityarchive',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_archives', to='hotels.room'),
+        ),
+        migrations.AddConstraint(
+            model_name='roomactivityarchive',
+            constraint=models.UniqueConstraint(fields=('room', 'month'), name='unique_room_activity_archive_month'),
+        ),
+    ]
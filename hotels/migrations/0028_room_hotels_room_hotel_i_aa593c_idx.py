@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0027_documentsequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['hotel', 'status'], name='hotels_room_hotel_i_aa593c_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from .querysets import HotelScopedQuerySet
 import uuid
 
 class Hotel(models.Model):
@@ -351,6 +352,8 @@ class Room(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     @property
     def amenities_list(self):
         """Get list of all amenities for this room"""
@@ -382,6 +385,9 @@ class Room(models.Model):
     
     class Meta:
         unique_together = ['hotel', 'room_number']
+        indexes = [
+            models.Index(fields=['hotel', 'status']),
+        ]
     
     def __str__(self):
         floor_info = f" on {self.floor.name}" if self.floor else ""
@@ -412,4 +418,22 @@ class Service(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.name} - {self.hotel.name}"
\ No newline at end of file
+        return f"{self.name} - {self.hotel.name}"
+
+
+class DocumentSequence(models.Model):
+    """Last number issued for a kind of document, per hotel and year (see hotels.numbering)"""
+    kind = models.CharField(max_length=20)
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, null=True, blank=True, related_name='document_sequences')
+    year = models.PositiveIntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'hotel', 'year'], name='hotels_docseq_unique'),
+            # NULLs are never equal in a unique constraint
+            models.UniqueConstraint(fields=['kind', 'year'], condition=models.Q(hotel__isnull=True), name='hotels_docseq_unique_global'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.year} ({self.hotel_id or 'all hotels'}): {self.last_value}"
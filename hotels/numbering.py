@@ -0,0 +1,65 @@
+import threading
+from contextlib import nullcontext
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Document kinds: number prefix and default block size. A block size of 1
+# numbers gaplessly. Larger blocks are reserved per worker process, so
+# most numbers cost no query, but a worker that stops or a document that
+# is never saved leaves a gap, and numbers of different workers interleave.
+DOCUMENT_KINDS = {
+    'invoice': ('INV', 1),
+    'folio': ('F', 50),
+    'pos_order': ('POS', 50),
+}
+
+# (kind, hotel_id, year) -> [next number, last number] reserved by this process
+_blocks = {}
+_blocks_lock = threading.Lock()
+
+def block_size(kind):
+    return getattr(settings, 'DOCUMENT_NUMBER_BLOCK_SIZES', {}).get(kind, DOCUMENT_KINDS[kind][1])
+
+def numbering_transaction(kind):
+    """
+    Context to take a number of ``kind`` and insert its document in.
+    Gapless kinds get a transaction, so a failed insert gives the number
+    back. Block kinds get none: next_number() only hands out blocks
+    outside transactions, and they accept gaps anyway.
+    """
+    return transaction.atomic() if block_size(kind) == 1 else nullcontext()
+
+def _reserve(kind, hotel_id, year, count):
+    """Reserve ``count`` numbers in the database, returns the first one"""
+    from .models import DocumentSequence
+    with transaction.atomic():
+        sequence, _ = DocumentSequence.objects.select_for_update().get_or_create(kind=kind, hotel_id=hotel_id, year=year)
+        DocumentSequence.objects.filter(pk=sequence.pk).update(last_value=F('last_value') + count)
+    return sequence.last_value + 1
+
+def next_number(kind, hotel_id=None):
+    """
+    Next document number of ``kind`` for a hotel, e.g. INV-3-2026-000042.
+    Numbers restart every year; ``hotel_id`` None numbers across hotels.
+    """
+    prefix = DOCUMENT_KINDS[kind][0]
+    year = timezone.localdate().year
+    key = (kind, hotel_id, year)
+    
+    with _blocks_lock:
+        block = _blocks.get(key)
+        if block and block[0] <= block[1]:
+            number = block[0]
+            block[0] += 1
+            return f'{prefix}-{hotel_id or 0}-{year}-{number:06d}'
+    
+    # Inside a transaction only this number is reserved: a rollback
+    # returns it, and a block kept in memory could be handed out again
+    size = 1 if connection.in_atomic_block else block_size(kind)
+    number = _reserve(kind, hotel_id, year, size)
+    if size > 1:
+        with _blocks_lock:
+            _blocks[key] = [number + 1, number + size - 1]
+    return f'{prefix}-{hotel_id or 0}-{year}-{number:06d}'
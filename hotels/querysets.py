@@ -0,0 +1,61 @@
+from django.db import models
+from django.db.models import Q
+
+def user_hotels(user):
+    """
+    Hotels ``user`` works in, as a lazy queryset: the hotels they own and
+    the one they are assigned to. None for super admins, who see every hotel.
+    """
+    from accounts.roles import RoleManager
+    from .models import Hotel
+    if RoleManager.get_user_role(user) == 'SUPER_ADMIN':
+        return None
+    hotels = Q(owner_id=user.pk, deleted_at__isnull=True)
+    if user.assigned_hotel_id:
+        hotels |= Q(hotel_id=user.assigned_hotel_id)
+    return Hotel.objects.filter(hotels)
+
+def user_hotel_ids(user):
+    """user_hotels() as a sorted list of ids, e.g. for cache keys"""
+    hotels = user_hotels(user)
+    if hotels is None:
+        return None
+    return sorted(hotels.values_list('hotel_id', flat=True))
+
+class HotelScopedQuerySet(models.QuerySet):
+    """
+    QuerySet of a model whose rows belong to a hotel.
+
+    The hotel is reached through the model's ``HOTEL_LOOKUP`` (``'hotel'``
+    unless the model says otherwise, e.g. ``'stay__reservation__hotel'``),
+    or any of them when it is a tuple of lookups.
+    """
+
+    @property
+    def hotel_lookups(self):
+        lookups = getattr(self.model, 'HOTEL_LOOKUP', 'hotel')
+        return (lookups,) if isinstance(lookups, str) else tuple(lookups)
+
+    def for_hotel(self, hotel):
+        """Rows of ``hotel``: a Hotel, a hotel_id, or a queryset or list of either"""
+        suffix = '__in' if isinstance(hotel, (models.QuerySet, list, tuple, set)) else ''
+        condition = Q()
+        for lookup in self.hotel_lookups:
+            condition |= Q(**{f'{lookup}{suffix}': hotel})
+        if len(self.hotel_lookups) == 1:
+            return self.filter(condition)
+        # A row reached through several lookups would be returned once per match
+        return self.filter(pk__in=self.model._base_manager.filter(condition).values('pk'))
+
+    def for_user(self, user):
+        """Rows of the hotels ``user`` works in, see user_hotels()"""
+        hotels = user_hotels(user)
+        if hotels is None:
+            return self.all()
+        return self.for_hotel(hotels)
+
+    def alive(self):
+        """Rows that are not soft-deleted (every row of models without ``deleted_at``)"""
+        if not any(field.name == 'deleted_at' for field in self.model._meta.concrete_fields):
+            return self.all()
+        return self.filter(deleted_at__isnull=True)
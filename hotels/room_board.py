@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+
+# Events kept per hotel for clients catching up after a reconnect
+ROOM_BOARD_HISTORY = 100
+ROOM_BOARD_EVENT_TIMEOUT = 60 * 10
+ROOM_BOARD_POLL_INTERVAL = 0.5
+ROOM_BOARD_HEARTBEAT = 15
+
+def _sequence_key(hotel_id):
+    return f'room_board:{hotel_id}:sequence'
+
+def _event_key(hotel_id, sequence):
+    return f'room_board:{hotel_id}:{sequence}'
+
+def shares_events():
+    """Whether room board events reach every server process: the cache must be shared"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+def room_board_live(request):
+    """
+    Whether pages rendered for ``request`` follow the room board live. The
+    stream is only served under ASGI, where an open stream holds no worker
+    thread; under WSGI pages keep refreshing themselves.
+    """
+    return isinstance(request, ASGIRequest) and shares_events()
+
+def current_sequence(hotel_id):
+    """Sequence of the last room board event of a hotel, for ?since="""
+    return cache.get(_sequence_key(hotel_id), 0)
+
+def publish_room_status(room, old_status=None):
+    """Push ``room``'s status to the live room boards once the save commits"""
+    if not shares_events():
+        # Other processes would never see it, and no board is live anyway
+        return
+    event = {
+        'room_id': room.pk,
+        'room_number': room.room_number,
+        'floor_id': room.floor_id,
+        'status': room.status,
+        'old_status': old_status,
+    }
+    transaction.on_commit(lambda: _publish(room.hotel_id, event))
+
+def _publish(hotel_id, event):
+    cache.add(_sequence_key(hotel_id), 0, None)
+    sequence = cache.incr(_sequence_key(hotel_id))
+    cache.set(_event_key(hotel_id, sequence), event, ROOM_BOARD_EVENT_TIMEOUT)
+
+def read_events(hotel_id, after):
+    """
+    Room board events of a hotel published after sequence ``after``:
+    ((sequence, event) pairs, sequence to read from next time). The pairs
+    are None when events the client has not seen are no longer kept.
+    """
+    current = current_sequence(hotel_id)
+    if current < after or current - after > ROOM_BOARD_HISTORY:
+        return None, current
+
+    keys = {_event_key(hotel_id, sequence): sequence for sequence in range(after + 1, current + 1)}
+    stored = cache.get_many(keys)
+    if current > after and _event_key(hotel_id, current) not in stored:
+        # The newest event is still being written, pick it up next time
+        current -= 1
+    return [(sequence, stored[key]) for key, sequence in keys.items() if key in stored and sequence <= current], current
+
+def _format(events):
+    if events is None:
+        return 'event: reload\ndata: {}\n\n'
+    return ''.join(
+        f'id: {sequence}\nevent: room\ndata: {json.dumps(event)}\n\n'
+        for sequence, event in events
+    )
+
+async def aroom_board_stream(hotel_id, after):
+    """Server-Sent Events of a hotel's room board, without holding a thread under ASGI"""
+    yield 'retry: 1000\n\n'
+    deadline = time.monotonic() + settings.ROOM_BOARD_STREAM_SECONDS
+    idle_since = time.monotonic()
+    while time.monotonic() < deadline:
+        events, after = await sync_to_async(read_events)(hotel_id, after)
+        if events != []:
+            yield _format(events)
+            idle_since = time.monotonic()
+        elif time.monotonic() - idle_since > ROOM_BOARD_HEARTBEAT:
+            yield ': keepalive\n\n'
+            idle_since = time.monotonic()
+        await asyncio.sleep(ROOM_BOARD_POLL_INTERVAL)
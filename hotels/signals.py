@@ -1,22 +1,46 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import Room
 from .activity_models import RoomActivityLog
-import threading
+from .change_tracking import get_changes, track_changes
+from .room_board import publish_room_status
+import contextvars
 
 User = get_user_model()
 
-# Thread-local storage to track the current user
-_thread_locals = threading.local()
+# User behind the current request, per thread and per asyncio task. It is
+# held behind a callable: asgiref inspects and compares context variable
+# values when it copies the context between threads, which would load a
+# bare lazy request.user from inside the event loop
+_current_user = contextvars.ContextVar('current_user', default=lambda: None)
 
 def set_current_user(user):
-    """Set the current user in thread-local storage"""
-    _thread_locals.user = user
+    """Set the current user; returns a token for reset_current_user"""
+    return _current_user.set(lambda: user)
+
+def reset_current_user(token):
+    """Restore the current user from before the matching set_current_user"""
+    _current_user.reset(token)
 
 def get_current_user():
-    """Get the current user from thread-local storage"""
-    return getattr(_thread_locals, 'user', None)
+    """Get the current user, None for anonymous requests and outside requests"""
+    user = _current_user.get()()
+    # request.user is lazy: the user is only loaded when an activity is logged
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+ROOM_AMENITY_FIELDS = [
+    ('has_wifi', 'Wi-Fi'), ('has_ac', 'Air Conditioning'), ('has_tv', 'TV'),
+    ('has_minibar', 'Mini Bar'), ('has_balcony', 'Balcony'), ('has_work_desk', 'Work Desk'),
+    ('has_seating_area', 'Seating Area'), ('has_kitchenette', 'Kitchenette'), ('has_living_room', 'Living Room')
+]
+
+# Only the fields the activity log reports on are tracked, so updates cost
+# no extra SELECT
+track_changes('hotels.Room', ['status', 'price', 'room_type_id'] + [field for field, _ in ROOM_AMENITY_FIELDS])
+track_changes('reservations.Reservation', ['status'])
 
 # All room-related signals
 @receiver(post_save)
@@ -27,7 +51,9 @@ def log_all_room_activities(sender, instance, created, **kwargs):
     
     # Reservations
     if sender._meta.app_label == 'reservations' and sender._meta.model_name == 'reservation':
-        room = getattr(instance, 'room', None)
+        # Only load the room when there is something to log
+        status_changed = 'status' in get_changes(instance)
+        room = getattr(instance, 'room', None) if created or status_changed else None
         if room:
             if created:
                 RoomActivityLog.log_activity(
@@ -36,7 +62,7 @@ def log_all_room_activities(sender, instance, created, **kwargs):
                     metadata={'guest_name': getattr(instance, 'guest_name', ''), 'check_in': str(getattr(instance, 'check_in_date', '')), 
                              'check_out': str(getattr(instance, 'check_out_date', '')), 'total_amount': str(getattr(instance, 'total_amount', ''))}
                 )
-            elif hasattr(instance, '_old_status'):
+            elif status_changed:
                 if getattr(instance, 'status', '') == 'checked_in':
                     RoomActivityLog.log_activity(room=room, user=user, action='guest_checkin',
                         description=f'{getattr(instance, "guest_name", "Guest")} checked in - #{instance.id}',
@@ -88,29 +114,6 @@ def log_all_room_activities(sender, instance, created, **kwargs):
                 description=f'Staff assigned: {getattr(instance, "staff_member", "Staff")}',
                 metadata={'staff_name': str(getattr(instance, 'staff_member', '')), 'role': getattr(instance, 'role', '')})
 
-@receiver(pre_save)
-def track_all_changes(sender, instance, **kwargs):
-    """Track changes for all models"""
-    if instance.pk:
-        try:
-            old_instance = sender.objects.get(pk=instance.pk)
-            instance._old_status = getattr(old_instance, 'status', None)
-            instance._old_instance = old_instance
-        except sender.DoesNotExist:
-            pass
-
-@receiver(pre_save, sender=Room)
-def track_room_changes(sender, instance, **kwargs):
-    """Track changes to room before saving"""
-    if instance.pk:  # Only for existing rooms
-        try:
-            old_room = Room.objects.get(pk=instance.pk)
-            instance._old_room = old_room
-        except Room.DoesNotExist:
-            instance._old_room = None
-    else:
-        instance._old_room = None
-
 @receiver(post_save, sender=Room)
 def log_room_activity(sender, instance, created, **kwargs):
     """Log room activities after saving"""
@@ -127,63 +130,62 @@ def log_room_activity(sender, instance, created, **kwargs):
         )
     else:
         # Room updated - check for changes
-        old_room = getattr(instance, '_old_room', None)
-        if old_room:
-            # Check status change
-            if old_room.status != instance.status:
-                RoomActivityLog.log_activity(
-                    room=instance,
-                    user=user,
-                    action='status_change',
-                    description=f'Room status changed from {old_room.status} to {instance.status}',
-                    old_value=old_room.status,
-                    new_value=instance.status
-                )
-            
-            # Check price change
-            if old_room.price != instance.price:
-                RoomActivityLog.log_activity(
-                    room=instance,
-                    user=user,
-                    action='price_change',
-                    description=f'Room price changed from {old_room.price} to {instance.price}',
-                    old_value=str(old_room.price),
-                    new_value=str(instance.price)
-                )
-            
-            # Check room type change
-            if old_room.room_type != instance.room_type:
-                old_type = old_room.room_type.name if old_room.room_type else 'None'
-                new_type = instance.room_type.name if instance.room_type else 'None'
-                RoomActivityLog.log_activity(
-                    room=instance,
-                    user=user,
-                    action='other',
-                    description=f'Room type changed from {old_type} to {new_type}',
-                    old_value=old_type,
-                    new_value=new_type
-                )
-            
-            # Check amenity changes
-            amenity_changes = []
-            amenity_fields = [
-                ('has_wifi', 'Wi-Fi'), ('has_ac', 'Air Conditioning'), ('has_tv', 'TV'),
-                ('has_minibar', 'Mini Bar'), ('has_balcony', 'Balcony'), ('has_work_desk', 'Work Desk'),
-                ('has_seating_area', 'Seating Area'), ('has_kitchenette', 'Kitchenette'), ('has_living_room', 'Living Room')
-            ]
-            
-            for field, display_name in amenity_fields:
-                old_val = getattr(old_room, field)
-                new_val = getattr(instance, field)
-                if old_val != new_val:
-                    status = 'added' if new_val else 'removed'
-                    amenity_changes.append(f'{display_name} {status}')
-            
-            if amenity_changes:
-                RoomActivityLog.log_activity(
-                    room=instance,
-                    user=user,
-                    action='amenity_change',
-                    description=f'Amenities updated: {", ".join(amenity_changes)}',
-                    metadata={'changes': amenity_changes}
-                )
\ No newline at end of file
+        changes = get_changes(instance)
+        
+        # Check status change
+        if 'status' in changes:
+            RoomActivityLog.log_activity(
+                room=instance,
+                user=user,
+                action='status_change',
+                description=f'Room status changed from {changes["status"]} to {instance.status}',
+                old_value=changes['status'],
+                new_value=instance.status
+            )
+        
+        # Check price change
+        if 'price' in changes:
+            RoomActivityLog.log_activity(
+                room=instance,
+                user=user,
+                action='price_change',
+                description=f'Room price changed from {changes["price"]} to {instance.price}',
+                old_value=str(changes['price']),
+                new_value=str(instance.price)
+            )
+        
+        # Check room type change
+        if 'room_type_id' in changes:
+            from configurations.models import RoomType
+            old_type = RoomType.objects.filter(pk=changes['room_type_id']).values_list('name', flat=True).first() or 'None'
+            new_type = instance.room_type.name if instance.room_type else 'None'
+            RoomActivityLog.log_activity(
+                room=instance,
+                user=user,
+                action='other',
+                description=f'Room type changed from {old_type} to {new_type}',
+                old_value=old_type,
+                new_value=new_type
+            )
+        
+        # Check amenity changes
+        amenity_changes = [
+            f'{display_name} {"added" if getattr(instance, field) else "removed"}'
+            for field, display_name in ROOM_AMENITY_FIELDS if field in changes
+        ]
+        
+        if amenity_changes:
+            RoomActivityLog.log_activity(
+                room=instance,
+                user=user,
+                action='amenity_change',
+                description=f'Amenities updated: {", ".join(amenity_changes)}',
+                metadata={'changes': amenity_changes}
+            )
+
+@receiver(post_save, sender=Room)
+def push_room_status(sender, instance, created, **kwargs):
+    """Push new rooms and status changes to the live room boards"""
+    changes = get_changes(instance)
+    if created or 'status' in changes:
+        publish_room_status(instance, changes.get('status'))
@@ -0,0 +1,11 @@
+from celery import shared_task
+from django.utils.dateparse import parse_datetime
+from .activity_models import RoomActivityLog
+
+@shared_task
+def write_room_activities(entries):
+    """Background writer for buffered room activity log entries"""
+    RoomActivityLog.objects.bulk_create([
+        RoomActivityLog(**{**entry, 'created_at': parse_datetime(entry['created_at'])})
+        for entry in entries
+    ])
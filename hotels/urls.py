@@ -43,4 +43,7 @@ urlpatterns = [
     
     # Room Activity Log
     path('rooms/<int:room_id>/add-note/', views.add_room_note, name='add_room_note'),
+    
+    # Live room board
+    path('hotels/<int:hotel_id>/room-board/events/', views.room_board_events, name='room_board_events'),
 ]
\ No newline at end of file
@@ -12,8 +12,10 @@ from django.shortcuts import render, redirect, get_object_or_404
 
 from .models import Hotel, Room, Service, Floor, RoomCategory, Company
 from .activity_models import RoomActivityLog
+from .activity_log import activity_page
+from .room_board import aroom_board_stream, current_sequence, room_board_live
 from .google_drive_forms import GoogleDriveConfigForm
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 
 try:
@@ -353,13 +355,16 @@ def room_detail(request, hotel_id, room_id):
     
     room = get_object_or_404(Room, room_id=room_id, hotel=hotel_obj)
     
-    # Get room activity logs
-    activities = room.activity_logs.all()[:20]  # Last 20 activities
+    # Get room activity logs, 20 per page from ?before=<cursor>
+    cursor = request.GET.get('before')
+    activities, next_cursor = activity_page(room, cursor)
     
     return render(request, 'hotels/room_detail.html', {
         'hotel': hotel_obj,
         'room': room,
-        'activities': activities
+        'activities': activities,
+        'activity_cursor': cursor,
+        'next_activity_cursor': next_cursor,
     })
 
 @owner_or_permission_required('change_room')
@@ -989,3 +994,36 @@ def add_room_note(request, room_id):
     )
     
     return JsonResponse({'success': True})
+
+@login_required
+def room_board_events(request, hotel_id):
+    """Live room status changes of a hotel as Server-Sent Events"""
+    hotel = get_object_or_404(Hotel, hotel_id=hotel_id)
+    
+    # Check if user has access to this hotel
+    user_role = RoleManager.get_user_role(request.user)
+    has_access = (
+        user_role == 'SUPER_ADMIN' or 
+        hotel.owner_id == request.user.pk or
+        request.user.assigned_hotel_id == hotel.hotel_id
+    )
+    
+    if not has_access:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    # Reconnecting browsers resume from the last event they received,
+    # pages from the sequence they were rendered at
+    after = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    try:
+        after = int(after)
+    except (TypeError, ValueError):
+        after = current_sequence(hotel.hotel_id)
+    
+    if not room_board_live(request):
+        # No Content tells EventSource to stop reconnecting
+        return HttpResponse(status=204)
+    
+    response = StreamingHttpResponse(aroom_board_stream(hotel.hotel_id, after), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,5 +1,6 @@
 from django.db import models
 from hotels.models import Room
+from hotels.querysets import HotelScopedQuerySet
 from staff.models import Staff
 from django.conf import settings
 import uuid
@@ -20,6 +21,8 @@ class HousekeepingTask(models.Model):
         ('inspection', 'Inspection'),
     ]
     
+    HOTEL_LOOKUP = 'room__hotel'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='housekeeping_tasks')
     assigned_staff = models.ForeignKey(Staff, on_delete=models.CASCADE, related_name='housekeeping_tasks', null=True, blank=True)
@@ -33,6 +36,8 @@ class HousekeepingTask(models.Model):
     notes = models.TextField(blank=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-priority', 'created_at']
     
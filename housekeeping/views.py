@@ -5,6 +5,7 @@ from django.utils import timezone
 from django.db.models import Q, Count
 from .models import HousekeepingTask, HousekeepingSchedule
 from hotels.models import Room, Hotel
+from hotels.room_board import current_sequence, room_board_live
 from accounts.models import User
 from datetime import date, timedelta
 
@@ -261,26 +262,30 @@ def room_status_list(request):
     # Order rooms by floor and room number
     rooms = rooms.select_related('floor', 'room_type').order_by('floor__number', 'room_number')
     
-    # Get statistics
-    total_rooms = rooms.count()
-    available_rooms = rooms.filter(status='Available').count()
-    occupied_rooms = rooms.filter(status='Occupied').count()
-    dirty_rooms = rooms.filter(status='Dirty').count()
-    cleaning_rooms = rooms.filter(status='Cleaning').count()
-    maintenance_rooms = rooms.filter(status='Maintenance').count()
+    # Get statistics, in one query
+    stats = rooms.aggregate(
+        total=Count('pk'),
+        available=Count('pk', filter=Q(status='Available')),
+        occupied=Count('pk', filter=Q(status='Occupied')),
+        dirty=Count('pk', filter=Q(status='Dirty')),
+        cleaning=Count('pk', filter=Q(status='Cleaning')),
+        maintenance=Count('pk', filter=Q(status='Maintenance')),
+    )
     
     # Get unique floors for filter
     floors = rooms.values_list('floor__number', flat=True).distinct().order_by('floor__number')
     
     context = {
         'rooms': rooms,
-        'total_rooms': total_rooms,
-        'available_rooms': available_rooms,
-        'occupied_rooms': occupied_rooms,
-        'dirty_rooms': dirty_rooms,
-        'cleaning_rooms': cleaning_rooms,
-        'maintenance_rooms': maintenance_rooms,
+        'total_rooms': stats['total'],
+        'available_rooms': stats['available'],
+        'occupied_rooms': stats['occupied'],
+        'dirty_rooms': stats['dirty'],
+        'cleaning_rooms': stats['cleaning'],
+        'maintenance_rooms': stats['maintenance'],
         'user_hotel': user_hotel,
+        # Live updates start from the events published after this render
+        'room_board_since': current_sequence(user_hotel.hotel_id) if user_hotel and room_board_live(request) else None,
         'status_filter': status_filter,
         'floor_filter': floor_filter,
         'floors': floors,
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_inventorycategory_deleted_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['property', 'created_at'], name='inventory_s_propert_609193_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from hotels.models import Hotel
+from hotels.querysets import HotelScopedQuerySet
 import uuid
 
 class InventoryCategory(models.Model):
@@ -111,6 +112,8 @@ class StockMovement(models.Model):
         ('waste', 'Waste'),
     ]
     
+    HOTEL_LOOKUP = 'property'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='movements')
     property = models.ForeignKey(Hotel, on_delete=models.CASCADE)
@@ -133,6 +136,13 @@ class StockMovement(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['property', 'created_at']),
+        ]
+    
     def save(self, *args, **kwargs):
         self.total_cost = self.quantity * self.unit_cost
         super().save(*args, **kwargs)
@@ -15,7 +15,7 @@ def inventory_dashboard(request):
     )
     
     # Recent stock movements
-    recent_movements = StockMovement.objects.all().order_by('-created_at')[:10]
+    recent_movements = StockMovement.objects.for_user(request.user).alive().order_by('-created_at')[:10]
     
     # Pending purchase orders
     pending_pos = PurchaseOrder.objects.filter(status__in=['draft', 'sent', 'confirmed'])
@@ -65,7 +65,7 @@ def item_detail(request, item_id):
 @login_required
 def stock_movements(request):
     """Stock movements list"""
-    movements = StockMovement.objects.all().order_by('-created_at')
+    movements = StockMovement.objects.for_user(request.user).alive().order_by('-created_at')
     return render(request, 'inventory/stock_movements.html', {'movements': movements})
 
 @login_required
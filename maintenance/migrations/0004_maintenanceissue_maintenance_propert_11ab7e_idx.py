@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0003_maintenanceissue_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenanceissue',
+            index=models.Index(fields=['property', 'status', 'reported_at'], name='maintenance_propert_11ab7e_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from hotels.models import Hotel, Room
+from hotels.querysets import HotelScopedQuerySet
 from staff.models import Staff
 import uuid
 
@@ -29,6 +30,8 @@ class MaintenanceIssue(models.Model):
         ('other', 'Other'),
     ]
     
+    HOTEL_LOOKUP = 'property'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     property = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='maintenance_issues')
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='maintenance_issues', blank=True, null=True)
@@ -46,8 +49,13 @@ class MaintenanceIssue(models.Model):
     actual_cost = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-priority', '-reported_at']
+        indexes = [
+            models.Index(fields=['property', 'status', 'reported_at']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.property.name}"
\ No newline at end of file
@@ -131,10 +131,11 @@ def process_automated_notifications():
 def generate_daily_reports():
     """Generate daily reports"""
     from reporting.models import Report
-    from django.contrib.auth.models import User
+    from reporting.tasks import generate_report
+    from django.contrib.auth import get_user_model
     
     # Generate occupancy report
-    admin_users = User.objects.filter(is_superuser=True)
+    admin_users = get_user_model().objects.filter(is_superuser=True)
     
     for user in admin_users:
         report = Report.objects.create(
@@ -143,14 +144,9 @@ def generate_daily_reports():
             generated_by=user,
             date_from=timezone.now().date(),
             date_to=timezone.now().date(),
-            status='generating'
         )
         
-        # Generate report data (simplified)
-        # In a real implementation, this would generate actual report data
-        report.status = 'completed'
-        report.completed_at = timezone.now()
-        report.save()
+        generate_report.delay(str(report.id))
 
 @shared_task
 def cleanup_old_notifications():
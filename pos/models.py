@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 
 from crm.models import GuestProfile
+from hotels.numbering import next_number, numbering_transaction
+from hotels.querysets import HotelScopedQuerySet
 # from front_desk.models import GuestFolio
 import uuid
 
@@ -70,6 +72,10 @@ class POSOrder(models.Model):
         ('charged_to_room', 'Charged to Room'),
     ]
     
+    # Orders are attributed to the hotel of the staff member who rang them
+    # up: the one they are assigned to or, for owners, the ones they own
+    HOTEL_LOOKUP = ('created_by__assigned_hotel', 'created_by__owned_hotels')
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     order_number = models.CharField(max_length=50, unique=True)
     order_type = models.CharField(max_length=20, choices=ORDER_TYPES, default='dine_in')
@@ -105,9 +111,19 @@ class POSOrder(models.Model):
     special_instructions = models.TextField(blank=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     def __str__(self):
         return f"Order {self.order_number} - ${self.total_amount}"
     
+    def save(self, *args, **kwargs):
+        # Orders are not linked to a hotel, so they are numbered across hotels
+        if self.order_number:
+            return super().save(*args, **kwargs)
+        with numbering_transaction('pos_order'):
+            self.order_number = next_number('pos_order')
+            super().save(*args, **kwargs)
+    
     def calculate_totals(self):
         """Calculate order totals"""
         self.subtotal = sum(item.total_price for item in self.items.all())
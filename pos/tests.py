@@ -1,3 +1,49 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
+from accounts.models import User
+from hotels import numbering
+from hotels.models import Hotel
+from .models import POSOrder
 
-# Create your tests here.
+@override_settings(DOCUMENT_NUMBER_BLOCK_SIZES={'pos_order': 5})
+class POSOrderNumberingTests(TransactionTestCase):
+    def setUp(self):
+        numbering._blocks.clear()
+        self.cashier = User.objects.create_user(email='cashier@example.com', username='cashier', password='x')
+
+    def tearDown(self):
+        numbering._blocks.clear()
+
+    def test_orders_are_numbered_from_the_block_without_queries(self):
+        POSOrder.objects.create(created_by=self.cashier)
+
+        # The first order reserved the block; the rest of it only costs the insert
+        for _ in range(4):
+            with self.assertNumQueries(1):
+                POSOrder.objects.create(created_by=self.cashier)
+
+        numbers = sorted(POSOrder.objects.values_list('order_number', flat=True))
+        self.assertEqual([number[-6:] for number in numbers], ['000001', '000002', '000003', '000004', '000005'])
+
+class POSOrderScopeTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='x', role='Owner')
+        self.hotel = Hotel.objects.create(owner=self.owner, name='Test Hotel')
+        self.other_hotel = Hotel.objects.create(owner=self.owner, name='Other Hotel')
+        self.cashier = User.objects.create_user(
+            email='cashier@example.com', username='cashier', password='x', assigned_hotel=self.hotel
+        )
+
+    def test_orders_of_owners_and_assigned_staff_belong_to_the_hotel(self):
+        by_cashier = POSOrder.objects.create(created_by=self.cashier)
+        by_owner = POSOrder.objects.create(created_by=self.owner)
+
+        self.assertEqual(set(POSOrder.objects.for_hotel(self.hotel)), {by_cashier, by_owner})
+        self.assertEqual(set(POSOrder.objects.for_hotel(Hotel.objects.all())), {by_cashier, by_owner})
+        self.assertEqual(list(POSOrder.objects.for_hotel(self.other_hotel)), [by_owner])
+        self.assertEqual(set(POSOrder.objects.for_user(self.cashier)), {by_cashier, by_owner})
+
+    def test_super_admin_role_sees_every_order(self):
+        outsider = User.objects.create_user(email='admin@example.com', username='admin', password='x', role='super_admin')
+        order = POSOrder.objects.create(created_by=self.cashier)
+
+        self.assertEqual(list(POSOrder.objects.for_user(outsider)), [order])
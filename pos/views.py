@@ -27,8 +27,8 @@ def pos_dashboard(request):
 
 @login_required
 def order_list(request):
-    """List all orders"""
-    orders = POSOrder.objects.all().order_by('-order_time')
+    """List the orders of the user's hotels"""
+    orders = POSOrder.objects.for_user(request.user).alive().order_by('-order_time')
     return render(request, 'pos/order_list.html', {'orders': orders})
 
 @login_required
@@ -0,0 +1,587 @@
+from datetime import timedelta
+from io import BytesIO
+from django.db.models import Count, QuerySet, Sum
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+from accounts.pdf_utils import AuraStayDocTemplate, get_pdf_styles
+from billing.models import Invoice
+from crm.models import GuestProfile
+from hotels.models import Hotel
+from reservations.models import Reservation, Stay
+from staff.models import Staff
+from .metrics import get_period_kpis
+from .occupancy import get_room_occupancy, get_occupancy_summary
+
+# Every builder takes ``hotel``: a Hotel, a queryset or list of hotels or
+# hotel_ids, or None for every hotel
+
+def _scoped(queryset, hotel):
+    """Live rows of ``queryset`` belonging to ``hotel``"""
+    queryset = queryset.alive()
+    return queryset if hotel is None else queryset.for_hotel(hotel)
+
+def _hotels(hotel):
+    """``hotel`` as a value for an ``__in`` lookup"""
+    return hotel if isinstance(hotel, (QuerySet, list, tuple, set)) else [hotel]
+
+def _hotel_name(hotel):
+    """Title of a report on ``hotel``: the hotel's name when it covers exactly one"""
+    if isinstance(hotel, Hotel):
+        return hotel.name
+    if hotel is not None:
+        names = list(Hotel.objects.filter(pk__in=_hotels(hotel)).values_list('name', flat=True)[:2])
+        if len(names) == 1:
+            return names[0]
+    return "Hotel"
+
+def scoped_guests(hotel):
+    """Live guest profiles with a reservation at ``hotel``"""
+    guests = GuestProfile.objects.filter(deleted_at__isnull=True)
+    if hotel is None:
+        return guests
+    return guests.filter(pk__in=_scoped(Reservation.objects.all(), hotel).values('guest'))
+
+def scoped_staff(hotel):
+    """Live staff members assigned to ``hotel``"""
+    staff = Staff.objects.filter(deleted_at__isnull=True)
+    if hotel is None:
+        return staff
+    return staff.filter(user__assigned_hotel__in=_hotels(hotel))
+
+def build_revenue_pdf(hotel=None, today=None):
+    """Revenue report PDF as of ``today``"""
+    today = today or timezone.now().date()
+    hotel_name = _hotel_name(hotel)
+    invoices = _scoped(Invoice.objects.all(), hotel)
+    
+    # Get the same data as revenue report
+    month_start = today.replace(day=1)
+    week_start = today - timedelta(days=today.weekday())
+    
+    # Revenue calculations
+    total_revenue = invoices.filter(status='paid').aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    monthly_revenue = invoices.filter(
+        status='paid',
+        created_at__date__gte=month_start
+    ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    weekly_revenue = invoices.filter(
+        status='paid',
+        created_at__date__gte=week_start
+    ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    daily_revenue = invoices.filter(
+        status='paid',
+        created_at__date=today
+    ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    
+    # Invoice statistics
+    total_invoices = invoices.count()
+    paid_invoices = invoices.filter(status='paid').count()
+    pending_invoices = invoices.filter(status__in=['draft', 'sent']).count()
+    overdue_invoices = invoices.filter(status='overdue').count()
+    
+    # Recent paid invoices
+    recent_invoices = invoices.filter(status='paid').select_related(
+        'guest', 'stay__reservation__room'
+    ).order_by('-paid_date')[:10]
+    
+    # Average revenue per booking
+    avg_revenue = total_revenue / paid_invoices if paid_invoices > 0 else 0
+    
+    # Create PDF using AuraStay template
+    buffer = BytesIO()
+    doc = AuraStayDocTemplate(buffer, pagesize=A4)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    
+    # Shared styles matching invoice PDF
+    styles = get_pdf_styles()
+    title_style = styles['AuraTitle']
+    heading_style = styles['AuraHeading']
+    
+    # Add space from header
+    elements.append(Spacer(1, 10))
+    
+    # Title
+    elements.append(Paragraph(f"{hotel_name} Revenue Report", title_style))
+    elements.append(Spacer(1, 15))
+    
+    # Revenue Summary
+    elements.append(Paragraph("Revenue Summary", heading_style))
+    
+    revenue_data = [
+        ['Period', 'Amount'],
+        ['Total Revenue', f'${total_revenue:,.2f}'],
+        ['This Month', f'${monthly_revenue:,.2f}'],
+        ['This Week', f'${weekly_revenue:,.2f}'],
+        ['Today', f'${daily_revenue:,.2f}'],
+        ['Average per Booking', f'${avg_revenue:,.2f}']
+    ]
+    
+    revenue_table = Table(revenue_data, colWidths=[3*inch, 2*inch])
+    revenue_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5)
+    ]))
+    
+    elements.append(revenue_table)
+    elements.append(Spacer(1, 20))
+    
+    # Invoice Statistics
+    elements.append(Paragraph("Invoice Statistics", heading_style))
+    
+    invoice_data = [
+        ['Metric', 'Count'],
+        ['Total Invoices', str(total_invoices)],
+        ['Paid Invoices', str(paid_invoices)],
+        ['Pending Invoices', str(pending_invoices)],
+        ['Overdue Invoices', str(overdue_invoices)]
+    ]
+    
+    invoice_table = Table(invoice_data, colWidths=[3*inch, 2*inch])
+    invoice_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9)
+    ]))
+    
+    elements.append(invoice_table)
+    elements.append(Spacer(1, 20))
+    
+    # Recent Paid Invoices
+    if recent_invoices:
+        elements.append(Paragraph("Recent Paid Invoices", heading_style))
+    
+        invoice_list_data = [['Invoice #', 'Guest', 'Room', 'Amount', 'Paid Date']]
+    
+        for invoice in recent_invoices:
+            invoice_list_data.append([
+                invoice.invoice_number,
+                f"{invoice.guest.first_name} {invoice.guest.last_name}",
+                f"Room {invoice.stay.reservation.room.room_number}",
+                f"${invoice.total_amount:,.2f}",
+                invoice.paid_date.strftime('%m/%d/%Y') if invoice.paid_date else 'N/A'
+            ])
+    
+        invoice_list_table = Table(invoice_list_data, colWidths=[1.2*inch, 1.5*inch, 1*inch, 1*inch, 1*inch])
+        invoice_list_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (3, 0), (3, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ]))
+    
+        elements.append(invoice_list_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+def build_guest_pdf(hotel=None, today=None):
+    """Guest analytics report PDF as of ``today``"""
+    today = today or timezone.now().date()
+    hotel_name = _hotel_name(hotel)
+    guests = scoped_guests(hotel)
+    reservations = _scoped(Reservation.objects.all(), hotel)
+    
+    month_start = today.replace(day=1)
+    
+    # Guest statistics
+    total_guests = guests.count()
+    new_guests_this_month = guests.filter(created_at__date__gte=month_start).count()
+    total_reservations = reservations.count()
+    repeat_guests = reservations.values('guest').annotate(
+        reservation_count=Count('id')
+    ).filter(reservation_count__gt=1).count()
+    current_guests = reservations.filter(status='checked_in').count()
+    corporate_guests = guests.filter(guest_type='corporate').count()
+    individual_guests = guests.filter(guest_type='individual').count()
+    
+    # Top guests
+    top_guests = reservations.values('guest__first_name', 'guest__last_name', 'guest__email').annotate(
+        reservation_count=Count('id'),
+        total_spent=Sum('rate')
+    ).order_by('-reservation_count')[:10]
+    
+    # Create PDF using AuraStay template
+    buffer = BytesIO()
+    doc = AuraStayDocTemplate(buffer, pagesize=A4)
+    
+    elements = []
+    
+    # Shared styles matching invoice PDF
+    styles = get_pdf_styles()
+    title_style = styles['AuraTitle']
+    heading_style = styles['AuraHeading']
+    
+    # Add space from header
+    elements.append(Spacer(1, 10))
+    
+    # Title
+    elements.append(Paragraph(f"{hotel_name} Guest Analytics Report", title_style))
+    elements.append(Spacer(1, 15))
+    
+    # Guest Statistics
+    elements.append(Paragraph("Guest Statistics", heading_style))
+    
+    guest_data = [
+        ['Metric', 'Count'],
+        ['Total Guests', str(total_guests)],
+        ['New Guests This Month', str(new_guests_this_month)],
+        ['Repeat Guests', str(repeat_guests)],
+        ['Currently Staying', str(current_guests)],
+        ['Corporate Guests', str(corporate_guests)],
+        ['Individual Guests', str(individual_guests)],
+        ['Total Reservations', str(total_reservations)]
+    ]
+    
+    guest_table = Table(guest_data, colWidths=[3*inch, 2*inch])
+    guest_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9)
+    ]))
+    
+    elements.append(guest_table)
+    elements.append(Spacer(1, 20))
+    
+    # Top Guests
+    if top_guests:
+        elements.append(Paragraph("Top Guests by Reservations", heading_style))
+    
+        top_guest_data = [['Guest Name', 'Email', 'Reservations', 'Total Spent']]
+    
+        for guest in top_guests:
+            top_guest_data.append([
+                f"{guest['guest__first_name']} {guest['guest__last_name']}",
+                guest['guest__email'],
+                str(guest['reservation_count']),
+                f"${guest['total_spent']:,.2f}" if guest['total_spent'] else "$0.00"
+            ])
+    
+        top_guest_table = Table(top_guest_data, colWidths=[1.5*inch, 2*inch, 1*inch, 1.2*inch])
+        top_guest_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (2, 0), (3, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ]))
+    
+        elements.append(top_guest_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+def build_occupancy_pdf(hotel=None, today=None):
+    """Occupancy report PDF as of ``today``"""
+    today = today or timezone.now().date()
+    hotel_name = _hotel_name(hotel)
+    
+    
+    # Get rooms with occupancy data
+    rooms = get_room_occupancy(hotel, day=today)
+    
+    room_data = []
+    
+    for room in rooms:
+        if room.occupancy_status == 'Occupied':
+            stay = room.current_reservation
+            check_in = stay.actual_check_in.strftime('%m/%d/%Y') if stay.actual_check_in else 'N/A'
+            check_out = stay.actual_check_out.strftime('%m/%d/%Y') if stay.actual_check_out else 'In Progress'
+        elif room.occupancy_status == 'Reserved':
+            check_in = room.current_reservation.check_in.strftime('%m/%d/%Y')
+            check_out = room.current_reservation.check_out.strftime('%m/%d/%Y')
+        else:
+            check_in = "-"
+            check_out = "-"
+    
+        room_data.append([
+            room.room_number,
+            room.room_type.name if room.room_type else 'N/A',
+            room.occupancy_status,
+            f"{room.current_guest.first_name} {room.current_guest.last_name}" if room.current_guest else "-",
+            check_in,
+            check_out,
+            f"${room.price:,.0f}" if room.price else "$0"
+        ])
+    
+    summary = get_occupancy_summary(rooms=rooms)
+    total_rooms = summary['total_rooms']
+    occupied_count = summary['occupied_rooms']
+    available_count = summary['available_rooms']
+    occupancy_rate = summary['occupancy_rate']
+    
+    # Create PDF using AuraStay template
+    buffer = BytesIO()
+    doc = AuraStayDocTemplate(buffer, pagesize=A4)
+    
+    elements = []
+    
+    # Shared styles matching invoice PDF
+    styles = get_pdf_styles()
+    title_style = styles['AuraTitle']
+    heading_style = styles['AuraHeading']
+    
+    # Add space from header
+    elements.append(Spacer(1, 10))
+    
+    # Title
+    elements.append(Paragraph(f"{hotel_name} Occupancy Report", title_style))
+    elements.append(Spacer(1, 15))
+    
+    # Occupancy Summary
+    elements.append(Paragraph("Occupancy Summary", heading_style))
+    
+    occupancy_summary = [
+        ['Metric', 'Value'],
+        ['Total Rooms', str(total_rooms)],
+        ['Occupied Rooms', str(occupied_count)],
+        ['Available Rooms', str(available_count)],
+        ['Occupancy Rate', f"{occupancy_rate:.1f}%"]
+    ]
+    
+    summary_table = Table(occupancy_summary, colWidths=[3*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9)
+    ]))
+    
+    elements.append(summary_table)
+    elements.append(Spacer(1, 20))
+    
+    # Room Details
+    elements.append(Paragraph("Room Details", heading_style))
+    
+    room_headers = ['Room', 'Type', 'Status', 'Guest', 'Check-in', 'Check-out', 'Rate']
+    room_table_data = [room_headers] + room_data
+    
+    room_table = Table(room_table_data, colWidths=[0.8*inch, 1*inch, 0.8*inch, 1.2*inch, 0.8*inch, 0.8*inch, 0.8*inch])
+    room_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (6, 0), (6, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+    ]))
+    
+    elements.append(room_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+def build_performance_pdf(hotel=None, today=None):
+    """Performance dashboard PDF as of ``today``"""
+    today = today or timezone.now().date()
+    hotel_name = _hotel_name(hotel)
+    stays = _scoped(Stay.objects.all(), hotel)
+    invoices = _scoped(Invoice.objects.all(), hotel)
+    reservations = _scoped(Reservation.objects.all(), hotel)
+    
+    month_start = today.replace(day=1)
+    
+    # Get performance metrics
+    occupancy = get_occupancy_summary(hotel, day=today)
+    total_rooms = occupancy['total_rooms']
+    checkins_today = stays.filter(actual_check_in__date=today).count()
+    checkouts_today = stays.filter(actual_check_out__date=today).count()
+    total_staff = scoped_staff(hotel).filter(is_active=True).count()
+    
+    monthly_revenue = invoices.filter(
+        status='paid',
+        created_at__date__gte=month_start
+    ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    
+    # Prefer the nightly KPI rollups when the night audit has run this month
+    rollup = get_period_kpis(month_start, today, hotel)
+    if rollup:
+        revpar = rollup['revpar']
+        adr = rollup['adr']
+    else:
+        days_in_month = (today - month_start).days + 1
+        revpar = (monthly_revenue / (total_rooms * days_in_month)) if total_rooms > 0 else 0
+    
+        paid_invoices_count = invoices.filter(
+            status='paid',
+            created_at__date__gte=month_start
+        ).count()
+        adr = (monthly_revenue / paid_invoices_count) if paid_invoices_count > 0 else 0
+    
+    # Occupancy calculation
+    occupied_rooms = occupancy['occupied_rooms']
+    occupancy_rate = occupancy['occupancy_rate']
+    
+    total_reservations = reservations.count()
+    repeat_guests = reservations.values('guest').annotate(
+        reservation_count=Count('id')
+    ).filter(reservation_count__gt=1).count()
+    retention_rate = (repeat_guests / total_reservations * 100) if total_reservations > 0 else 0
+    
+    # Create PDF using AuraStay template
+    buffer = BytesIO()
+    doc = AuraStayDocTemplate(buffer, pagesize=A4)
+    
+    elements = []
+    
+    # Shared styles matching invoice PDF
+    styles = get_pdf_styles()
+    title_style = styles['AuraTitle']
+    heading_style = styles['AuraHeading']
+    
+    # Add space from header
+    elements.append(Spacer(1, 10))
+    
+    # Title
+    elements.append(Paragraph(f"{hotel_name} Performance Dashboard", title_style))
+    elements.append(Spacer(1, 15))
+    
+    # Key Performance Indicators
+    elements.append(Paragraph("Key Performance Indicators", heading_style))
+    
+    kpi_data = [
+        ['Metric', 'Value'],
+        ['Occupancy Rate', f'{occupancy_rate:.1f}%'],
+        ['Revenue per Available Room (RevPAR)', f'${revpar:.2f}'],
+        ['Average Daily Rate (ADR)', f'${adr:.2f}'],
+        ['Guest Retention Rate', f'{retention_rate:.1f}%'],
+        ['Check-ins Today', str(checkins_today)],
+        ['Check-outs Today', str(checkouts_today)]
+    ]
+    
+    kpi_table = Table(kpi_data, colWidths=[3*inch, 2*inch])
+    kpi_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5)
+    ]))
+    
+    elements.append(kpi_table)
+    elements.append(Spacer(1, 20))
+    
+    # Operational Summary
+    elements.append(Paragraph("Operational Summary", heading_style))
+    
+    ops_data = [
+        ['Resource', 'Count/Status'],
+        ['Total Rooms', str(total_rooms)],
+        ['Occupied Rooms', str(occupied_rooms)],
+        ['Available Rooms', str(total_rooms - occupied_rooms)],
+        ['Active Staff', str(total_staff)],
+        ['Monthly Revenue', f'${monthly_revenue:,.2f}']
+    ]
+    
+    ops_table = Table(ops_data, colWidths=[3*inch, 2*inch])
+    ops_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0284c7')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9)
+    ]))
+    
+    elements.append(ops_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+# Report type -> (PDF builder, download file prefix)
+PDF_REPORTS = {
+    'revenue': (build_revenue_pdf, 'revenue_report'),
+    'guests': (build_guest_pdf, 'guest_report'),
+    'occupancy': (build_occupancy_pdf, 'occupancy_report'),
+    'performance': (build_performance_pdf, 'performance_report'),
+}
@@ -0,0 +1,132 @@
+import json
+import multiprocessing
+import os
+import time
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from hotels.models import Hotel
+from reporting.metrics import build_metrics, compute_daily_kpis, save_metrics
+
+
+def month_partitions(hotel_ids, start_date, end_date):
+    """Split the window into (hotel_id, first_day, last_day) chunks of at most one calendar month"""
+    partitions = []
+    for hotel_id in hotel_ids:
+        first_day = start_date
+        while first_day <= end_date:
+            if first_day.month == 12:
+                next_month = first_day.replace(year=first_day.year + 1, month=1, day=1)
+            else:
+                next_month = first_day.replace(month=first_day.month + 1, day=1)
+            last_day = min(next_month - timedelta(days=1), end_date)
+            partitions.append((hotel_id, first_day, last_day))
+            first_day = next_month
+    return partitions
+
+
+def partition_key(partition):
+    hotel_id, first_day, last_day = partition
+    return f'{hotel_id}:{first_day.isoformat()}:{last_day.isoformat()}'
+
+
+def init_worker():
+    """Give each worker process its own database connection"""
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def backfill_partition(partition):
+    """Compute and upsert the daily metrics of one (hotel, month) partition"""
+    hotel_id, first_day, last_day = partition
+    hotel = Hotel.objects.get(hotel_id=hotel_id)
+
+    metrics = []
+    day = first_day
+    while day <= last_day:
+        metrics.extend(build_metrics(hotel, day, compute_daily_kpis(hotel, day)))
+        day += timedelta(days=1)
+    save_metrics(metrics)
+    return partition, len(metrics)
+
+
+class Command(BaseCommand):
+    help = 'Compute and store daily KPI metrics for past days, partitioned by hotel and month'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Number of days to backfill, ending yesterday')
+        parser.add_argument('--start', help='First day to backfill (YYYY-MM-DD), overrides --days')
+        parser.add_argument('--end', help='Last day to backfill (YYYY-MM-DD), defaults to yesterday')
+        parser.add_argument('--hotel', type=int, action='append', help='Only backfill this hotel (hotel_id); may be repeated')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes; each holds one database connection')
+        parser.add_argument('--checkpoint',
+                            help='File recording finished partitions so an interrupted run can resume')
+        parser.add_argument('--reset', action='store_true', help='Ignore and overwrite an existing checkpoint')
+
+    def handle(self, *args, **options):
+        try:
+            end_date = datetime.strptime(options['end'], '%Y-%m-%d').date() if options['end'] else timezone.now().date() - timedelta(days=1)
+            if options['start']:
+                start_date = datetime.strptime(options['start'], '%Y-%m-%d').date()
+            else:
+                start_date = end_date - timedelta(days=options['days'] - 1)
+        except ValueError:
+            raise CommandError('Dates must be in YYYY-MM-DD format')
+
+        if start_date > end_date:
+            raise CommandError('--start must not be after --end')
+
+        workers = max(1, options['workers'])
+
+        hotels = Hotel.objects.filter(deleted_at__isnull=True)
+        if options['hotel']:
+            hotels = hotels.filter(hotel_id__in=options['hotel'])
+        hotel_ids = list(hotels.order_by('hotel_id').values_list('hotel_id', flat=True))
+
+        # Load finished partitions from a previous run
+        checkpoint_path = options['checkpoint']
+        done = set()
+        if checkpoint_path and os.path.exists(checkpoint_path) and not options['reset']:
+            with open(checkpoint_path) as f:
+                done = set(json.load(f).get('done', []))
+
+        partitions = [p for p in month_partitions(hotel_ids, start_date, end_date) if partition_key(p) not in done]
+        self.stdout.write(
+            f'{len(partitions)} partitions to backfill ({len(done)} already done) '
+            f'for {len(hotel_ids)} hotels from {start_date} to {end_date} with {workers} workers'
+        )
+
+        total_rows = 0
+        started = time.monotonic()
+
+        def record(partition, rows):
+            nonlocal total_rows
+            total_rows += rows
+            done.add(partition_key(partition))
+            if checkpoint_path:
+                with open(checkpoint_path, 'w') as f:
+                    json.dump({'done': sorted(done)}, f)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'  hotel {partition[0]} {partition[1]:%Y-%m}: {rows} rows '
+                f'({total_rows / elapsed if elapsed else 0:.0f} rows/s)'
+            )
+
+        if workers == 1:
+            for partition in partitions:
+                record(*backfill_partition(partition))
+        else:
+            # Workers must not share the parent's connection
+            connections.close_all()
+            with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+                for partition, rows in pool.imap_unordered(backfill_partition, partitions):
+                    record(partition, rows)
+
+        elapsed = time.monotonic() - started
+        rate = total_rows / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully backfilled {total_rows} metrics in {elapsed:.1f}s ({rate:.0f} rows/s)'
+        ))
@@ -0,0 +1,128 @@
+from decimal import Decimal
+from django.db.models import Count, Q, Sum
+from hotels.models import Room
+from reservations.models import Reservation, RoomNight
+from billing.models import Invoice
+from pos.models import POSOrder
+from .models import Metric
+
+# Metric types written by the nightly rollup
+DAILY_METRIC_TYPES = [
+    'available_rooms', 'occupied_rooms', 'occupancy_rate', 'room_revenue', 'adr', 'revpar',
+    'pos_revenue', 'total_revenue', 'arrivals', 'departures', 'no_shows',
+]
+
+
+def compute_daily_kpis(hotel, day):
+    """
+    Daily KPIs for one hotel, computed from the transactional tables.
+
+    Occupancy and room revenue come from the per-night inventory (the rate
+    of each sold night, so pending and no-show reservations holding a room
+    do not count); arrivals, departures
+    and no-shows from reservation statuses; total revenue is invoiced room
+    revenue plus paid POS orders for the day.
+    """
+    available_rooms = Room.objects.filter(hotel=hotel).count()
+
+    nights = RoomNight.objects.filter(
+        hotel=hotel, date=day, reservation__status__in=Reservation.SOLD_STATUSES
+    ).aggregate(
+        occupied=Count('id'),
+        revenue=Sum('reservation__rate'),
+    )
+    occupied_rooms = nights['occupied']
+    room_revenue = nights['revenue'] or Decimal('0')
+
+    movements = Reservation.objects.filter(hotel=hotel, deleted_at__isnull=True).aggregate(
+        arrivals=Count('id', filter=Q(check_in=day, status__in=['checked_in', 'checked_out'])),
+        departures=Count('id', filter=Q(check_out=day, status='checked_out')),
+        no_shows=Count('id', filter=Q(check_in=day, status='no_show')),
+    )
+
+    invoiced = Invoice.objects.filter(
+        stay__reservation__hotel=hotel,
+        date__date=day
+    ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
+
+    pos_revenue = POSOrder.objects.for_hotel(hotel).filter(
+        payment_status='paid',
+        order_time__date=day
+    ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
+
+    return {
+        'available_rooms': available_rooms,
+        'occupied_rooms': occupied_rooms,
+        'occupancy_rate': Decimal(occupied_rooms * 100) / available_rooms if available_rooms else Decimal('0'),
+        'room_revenue': room_revenue,
+        'adr': room_revenue / occupied_rooms if occupied_rooms else Decimal('0'),
+        'revpar': room_revenue / available_rooms if available_rooms else Decimal('0'),
+        'pos_revenue': pos_revenue,
+        'total_revenue': invoiced + pos_revenue,
+        'arrivals': movements['arrivals'],
+        'departures': movements['departures'],
+        'no_shows': movements['no_shows'],
+    }
+
+
+def build_metrics(hotel, day, kpis):
+    """Unsaved Metric rows for a KPI dict"""
+    return [
+        Metric(property=hotel, metric_type=metric_type, value=Decimal(kpis[metric_type]).quantize(Decimal('0.0001')), date=day)
+        for metric_type in DAILY_METRIC_TYPES
+    ]
+
+
+def save_metrics(metrics, batch_size=1000):
+    """Upsert Metric rows on (property, metric_type, date) in bulk"""
+    return Metric.objects.bulk_create(
+        metrics,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['property', 'metric_type', 'date'],
+        update_fields=['value', 'metadata'],
+    )
+
+
+def record_daily_metrics(hotel, day):
+    """Compute and store one hotel's KPIs for ``day``; returns the KPI dict"""
+    kpis = compute_daily_kpis(hotel, day)
+    save_metrics(build_metrics(hotel, day, kpis))
+    return kpis
+
+
+def get_period_kpis(start_date, end_date, hotel=None):
+    """
+    Period KPIs aggregated from the stored daily rollups.
+
+    ``hotel`` may also be a queryset of hotels. Returns ``None`` when no
+    rollups exist for the period so callers can fall back to computing
+    from transactional data.
+    """
+    metrics = Metric.objects.alive().filter(
+        date__range=[start_date, end_date],
+        metric_type__in=DAILY_METRIC_TYPES
+    )
+    if hotel is not None:
+        metrics = metrics.for_hotel(hotel)
+
+    totals = dict(metrics.values('metric_type').annotate(total=Sum('value')).values_list('metric_type', 'total'))
+    if not totals:
+        return None
+
+    available = totals.get('available_rooms') or Decimal('0')
+    occupied = totals.get('occupied_rooms') or Decimal('0')
+    room_revenue = totals.get('room_revenue') or Decimal('0')
+    return {
+        'room_nights_available': available,
+        'room_nights_sold': occupied,
+        'occupancy_rate': occupied * 100 / available if available else Decimal('0'),
+        'room_revenue': room_revenue,
+        'adr': room_revenue / occupied if occupied else Decimal('0'),
+        'revpar': room_revenue / available if available else Decimal('0'),
+        'pos_revenue': totals.get('pos_revenue') or Decimal('0'),
+        'total_revenue': totals.get('total_revenue') or Decimal('0'),
+        'arrivals': totals.get('arrivals') or Decimal('0'),
+        'departures': totals.get('departures') or Decimal('0'),
+        'no_shows': totals.get('no_shows') or Decimal('0'),
+    }
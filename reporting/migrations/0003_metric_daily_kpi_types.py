@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting', '0002_dashboard_deleted_at_metric_deleted_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='metric',
+            name='metric_type',
+            field=models.CharField(choices=[('occupancy_rate', 'Occupancy Rate'), ('adr', 'Average Daily Rate'), ('revpar', 'Revenue Per Available Room'), ('total_revenue', 'Total Revenue'), ('guest_satisfaction', 'Guest Satisfaction'), ('housekeeping_efficiency', 'Housekeeping Efficiency'), ('maintenance_response_time', 'Maintenance Response Time'), ('available_rooms', 'Available Rooms'), ('occupied_rooms', 'Occupied Rooms'), ('room_revenue', 'Room Revenue'), ('pos_revenue', 'POS Revenue'), ('arrivals', 'Arrivals'), ('departures', 'Departures'), ('no_shows', 'No-shows')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting', '0004_report_export_types'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='report',
+            name='format',
+            field=models.CharField(choices=[('pdf', 'PDF'), ('excel', 'Excel'), ('csv', 'CSV'), ('json', 'JSON'), ('zip', 'ZIP Archive')], default='pdf', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='type',
+            field=models.CharField(choices=[('occupancy', 'Occupancy Report'), ('revenue', 'Revenue Report'), ('adr', 'Average Daily Rate'), ('revpar', 'Revenue Per Available Room'), ('housekeeping', 'Housekeeping Performance'), ('maintenance', 'Maintenance Report'), ('guest_satisfaction', 'Guest Satisfaction'), ('financial', 'Financial Summary'), ('guests', 'Guest Analytics'), ('performance', 'Performance Dashboard'), ('invoices', 'Invoice Archive'), ('custom', 'Custom Report')], max_length=30),
+        ),
+    ]
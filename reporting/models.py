@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from hotels.models import Hotel
+from hotels.querysets import HotelScopedQuerySet
 import uuid
 
 class Report(models.Model):
@@ -14,6 +15,9 @@ class Report(models.Model):
         ('maintenance', 'Maintenance Report'),
         ('guest_satisfaction', 'Guest Satisfaction'),
         ('financial', 'Financial Summary'),
+        ('guests', 'Guest Analytics'),
+        ('performance', 'Performance Dashboard'),
+        ('invoices', 'Invoice Archive'),
         ('custom', 'Custom Report'),
     ]
     
@@ -22,6 +26,7 @@ class Report(models.Model):
         ('excel', 'Excel'),
         ('csv', 'CSV'),
         ('json', 'JSON'),
+        ('zip', 'ZIP Archive'),
     ]
     
     STATUS_CHOICES = [
@@ -79,8 +84,17 @@ class Metric(models.Model):
         ('guest_satisfaction', 'Guest Satisfaction'),
         ('housekeeping_efficiency', 'Housekeeping Efficiency'),
         ('maintenance_response_time', 'Maintenance Response Time'),
+        ('available_rooms', 'Available Rooms'),
+        ('occupied_rooms', 'Occupied Rooms'),
+        ('room_revenue', 'Room Revenue'),
+        ('pos_revenue', 'POS Revenue'),
+        ('arrivals', 'Arrivals'),
+        ('departures', 'Departures'),
+        ('no_shows', 'No-shows'),
     ]
     
+    HOTEL_LOOKUP = 'property'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     property = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='metrics')
     metric_type = models.CharField(max_length=30, choices=METRIC_TYPE_CHOICES)
@@ -90,6 +104,8 @@ class Metric(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['property', 'metric_type', 'date']
         ordering = ['-date']
@@ -0,0 +1,184 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db.models import Count, DateField, Exists, OuterRef, Prefetch, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+from hotels.models import Room
+from reservations.models import Reservation, RoomNight, Stay
+from billing.models import Invoice
+from .models import Metric
+
+# Database truncation and matching Python bucket start for each granularity
+GRANULARITIES = {
+    'day': (TruncDay, lambda day: day),
+    'week': (TruncWeek, lambda day: day - timedelta(days=day.weekday())),
+    'month': (TruncMonth, lambda day: day.replace(day=1)),
+}
+
+
+def current_stays(day):
+    """Stays in progress on ``day``"""
+    return Stay.objects.filter(
+        Q(actual_check_in__date__lte=day) &
+        (Q(actual_check_out__isnull=True) | Q(actual_check_out__date__gte=day))
+    )
+
+
+def current_reservations(day):
+    """Confirmed or checked-in reservations covering the night of ``day``"""
+    return Reservation.objects.filter(
+        check_in__lte=day,
+        check_out__gt=day,
+        status__in=Reservation.OCCUPYING_STATUSES
+    )
+
+
+def _rooms(hotel):
+    rooms = Room.objects.all()
+    if hotel is not None:
+        rooms = rooms.for_hotel(hotel)
+    return rooms
+
+
+def get_room_occupancy(hotel=None, day=None):
+    """
+    Rooms with their occupant for ``day`` (today by default).
+
+    Each room gets ``current_reservation`` (the stay, or the reservation
+    when the guest has not checked in yet), ``current_guest``,
+    ``is_occupied`` and ``occupancy_status`` (Occupied/Reserved/Available).
+    Everything is loaded in three queries regardless of the room count.
+    """
+    day = day or timezone.now().date()
+    rooms = _rooms(hotel).select_related('room_type').prefetch_related(
+        Prefetch(
+            'stays',
+            queryset=current_stays(day).select_related('reservation__guest'),
+            to_attr='current_stays'
+        ),
+        Prefetch(
+            'reservation_set',
+            queryset=current_reservations(day).select_related('guest'),
+            to_attr='current_reservations'
+        ),
+    )
+
+    rooms = list(rooms)
+    for room in rooms:
+        if room.current_stays:
+            stay = room.current_stays[0]
+            room.current_reservation = stay
+            room.current_guest = stay.reservation.guest
+            room.is_occupied = True
+            room.occupancy_status = 'Occupied'
+        elif room.current_reservations:
+            reservation = room.current_reservations[0]
+            room.current_reservation = reservation
+            room.current_guest = reservation.guest
+            room.is_occupied = True
+            room.occupancy_status = 'Reserved'
+        else:
+            room.current_reservation = None
+            room.current_guest = None
+            room.is_occupied = False
+            room.occupancy_status = 'Available'
+    return rooms
+
+
+def get_occupancy_summary(hotel=None, day=None, rooms=None):
+    """
+    Total, occupied and available room counts plus the occupancy rate.
+
+    Pass ``rooms`` from ``get_room_occupancy`` to summarise an already
+    loaded list; otherwise the counts come from a single aggregate query.
+    """
+    if rooms is not None:
+        total_rooms = len(rooms)
+        occupied_rooms = sum(1 for room in rooms if room.is_occupied)
+    else:
+        day = day or timezone.now().date()
+        counts = _rooms(hotel).annotate(
+            has_stay=Exists(current_stays(day).filter(room=OuterRef('pk'))),
+            has_reservation=Exists(current_reservations(day).filter(room=OuterRef('pk'))),
+        ).aggregate(
+            total=Count('pk'),
+            occupied=Count('pk', filter=Q(has_stay=True) | Q(has_reservation=True)),
+        )
+        total_rooms = counts['total']
+        occupied_rooms = counts['occupied']
+
+    occupancy_rate = (occupied_rooms / total_rooms * 100) if total_rooms > 0 else 0
+    return {
+        'total_rooms': total_rooms,
+        'occupied_rooms': occupied_rooms,
+        'available_rooms': total_rooms - occupied_rooms,
+        'occupancy_rate': occupancy_rate,
+    }
+
+
+def get_occupancy_series(hotel, start_date, end_date, granularity='day'):
+    """
+    Occupancy rate and invoiced revenue per day, week or month.
+
+    Occupied room-nights come from the nightly KPI rollups for the hotel
+    days they cover and from the sold nights of the per-night inventory
+    for the others, revenue from invoices, each in one grouped query, so
+    the cost does not grow with the window length. Buckets are clipped to
+    [start_date, end_date] when computing the number of available
+    room-nights.
+    """
+    trunc, bucket_start = GRANULARITIES[granularity]
+
+    total_rooms = _rooms(hotel).count()
+
+    nights = RoomNight.objects.filter(
+        date__range=[start_date, end_date], reservation__status__in=Reservation.SOLD_STATUSES
+    )
+    invoices = Invoice.objects.filter(date__date__range=[start_date, end_date])
+    rollups = Metric.objects.alive().filter(metric_type='occupied_rooms', date__range=[start_date, end_date])
+    if hotel is not None:
+        nights = nights.for_hotel(hotel)
+        invoices = invoices.for_hotel(hotel)
+        rollups = rollups.for_hotel(hotel)
+
+    # A hotel's day that has been rolled up is read from the rollup alone
+    occupied = dict(
+        nights.exclude(Exists(rollups.filter(property=OuterRef('hotel'), date=OuterRef('date'))))
+        .annotate(bucket=trunc('date', output_field=DateField()))
+        .values('bucket')
+        .annotate(room_nights=Count('id'))
+        .values_list('bucket', 'room_nights')
+    )
+    rolled_up = (
+        rollups.annotate(bucket=trunc('date', output_field=DateField()))
+        .values('bucket')
+        .annotate(room_nights=Sum('value'))
+        .values_list('bucket', 'room_nights')
+    )
+    for key, room_nights in rolled_up:
+        occupied[key] = occupied.get(key, 0) + int(room_nights)
+    revenue = dict(
+        invoices.annotate(bucket=trunc('date', output_field=DateField()))
+        .values('bucket')
+        .annotate(total=Sum('total_amount'))
+        .values_list('bucket', 'total')
+    )
+
+    # Count the days of each bucket that fall inside the window
+    buckets = {}
+    day = start_date
+    while day <= end_date:
+        key = bucket_start(day)
+        buckets[key] = buckets.get(key, 0) + 1
+        day += timedelta(days=1)
+
+    data = []
+    for key, days in buckets.items():
+        available = total_rooms * days
+        room_nights = occupied.get(key, 0)
+        data.append({
+            'date': key,
+            'occupancy_rate': round(room_nights / available * 100, 2) if available > 0 else 0,
+            'revenue': revenue.get(key) or Decimal('0'),
+        })
+    return data
@@ -0,0 +1,76 @@
+from decimal import Decimal
+from django.db.models import DateField, DateTimeField, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from billing.models import Invoice
+from pos.models import POSOrder
+
+
+def month_starts(months, end_date=None):
+    """First day of each of the last ``months`` calendar months, oldest first"""
+    current = (end_date or timezone.now().date()).replace(day=1)
+    starts = []
+    for i in range(months):
+        starts.insert(0, current)
+        if current.month == 1:
+            current = current.replace(year=current.year - 1, month=12)
+        else:
+            current = current.replace(month=current.month - 1)
+    return starts
+
+
+def monthly_series(queryset, date_field, aggregate, months, end_date=None):
+    """
+    Aggregate ``queryset`` per calendar month in one grouped query.
+
+    ``date_field`` may be a DateField or DateTimeField; ``aggregate`` is any
+    aggregate expression such as ``Sum('amount')`` or ``Count('pk')``.
+    Returns ``[(month_start, value), ...]`` oldest first, with months that
+    have no rows filled in as ``None``; empty when ``months`` is below 1.
+    """
+    starts = month_starts(months, end_date)
+    if not starts:
+        return []
+    end_date = end_date or timezone.now().date()
+
+    field = queryset.model._meta.get_field(date_field)
+    lookup = f'{date_field}__date' if isinstance(field, DateTimeField) else date_field
+
+    totals = dict(
+        queryset.filter(**{f'{lookup}__gte': starts[0], f'{lookup}__lte': end_date})
+        .annotate(month=TruncMonth(date_field, output_field=DateField()))
+        .values('month')
+        .annotate(value=aggregate)
+        .values_list('month', 'value')
+    )
+    return [(start, totals.get(start)) for start in starts]
+
+
+def get_monthly_revenue(hotel=None, months=12, end_date=None):
+    """
+    Room, POS and total revenue per calendar month, oldest first.
+
+    Room revenue is the invoiced total by invoice date; POS revenue is paid
+    orders by order time, attributed to the hotel of the staff member who
+    rang them up. One grouped query per source.
+    """
+    invoices = Invoice.objects.all()
+    orders = POSOrder.objects.filter(payment_status='paid')
+    if hotel is not None:
+        invoices = invoices.filter(stay__reservation__hotel=hotel)
+        orders = orders.for_hotel(hotel)
+
+    room_revenue = monthly_series(invoices, 'date', Sum('total_amount'), months, end_date)
+    pos_revenue = dict(monthly_series(orders, 'order_time', Sum('total_amount'), months, end_date))
+
+    data = []
+    for month, room_total in room_revenue:
+        room_total = room_total or Decimal('0')
+        pos_total = pos_revenue[month] or Decimal('0')
+        data.append({
+            'month': month.strftime('%Y-%m'),
+            'room_revenue': room_total,
+            'pos_revenue': pos_total,
+            'total_revenue': room_total + pos_total,
+        })
+    return data
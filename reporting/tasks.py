@@ -0,0 +1,62 @@
+from celery import shared_task
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from .exports import PDF_REPORTS
+from .models import Report
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+def report_scope(report):
+    """Hotels a queued report covers: the hotel ids it was queued for, else its property"""
+    if 'hotel_ids' in report.parameters:
+        return report.parameters['hotel_ids']
+    return report.property
+
+@shared_task
+def generate_report(report_id):
+    """Render a queued report and store the file on the Report"""
+    try:
+        report = Report.objects.select_related('property').get(id=report_id)
+    except Report.DoesNotExist:
+        logger.warning(f"Report {report_id} no longer exists")
+        return
+
+    if report.status == 'completed':
+        return
+
+    report.status = 'generating'
+    report.save(update_fields=['status'])
+
+    try:
+        if report.type == 'invoices':
+            from billing.archive import invoices_for_archive, write_invoice_archive
+
+            # Rendered in-process: Celery prefork workers cannot start a pool
+            with tempfile.TemporaryFile() as output:
+                invoices = invoices_for_archive(report_scope(report), report.date_from, report.date_to)
+                invoice_count, file_count = write_invoice_archive(invoices, output)
+                output.seek(0)
+                report.file_path.save(
+                    f'invoices_{report.date_from.strftime("%Y%m%d")}_{report.date_to.strftime("%Y%m%d")}_{report.id.hex[:8]}.zip',
+                    File(output), save=False
+                )
+            report.data = {**report.data, 'invoices': invoice_count, 'files': file_count}
+        else:
+            builder, prefix = PDF_REPORTS[report.type]
+            pdf = builder(report_scope(report), report.date_to)
+            report.file_path.save(f'{prefix}_{report.date_to.strftime("%Y%m%d")}_{report.id.hex[:8]}.pdf', ContentFile(pdf), save=False)
+
+        report.status = 'completed'
+        report.completed_at = timezone.now()
+        report.save(update_fields=['file_path', 'status', 'completed_at', 'data'])
+
+        logger.info(f"Report {report.id} generated")
+
+    except Exception as e:
+        report.status = 'failed'
+        report.data = {**report.data, 'error': str(e)}
+        report.save(update_fields=['status', 'data'])
+        logger.error(f"Failed to generate report {report.id}: {str(e)}")
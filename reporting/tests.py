@@ -0,0 +1,121 @@
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User
+from billing.models import Invoice
+from crm.models import GuestProfile
+from hotels.models import Hotel, Room
+from reservations.models import Reservation, Stay
+from .metrics import compute_daily_kpis
+from .models import Metric, Report
+from .occupancy import get_occupancy_series
+from .revenue import get_monthly_revenue
+from .tasks import generate_report
+
+class OccupancyKPITests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(email='owner@example.com', username='owner', password='x')
+        self.hotel = Hotel.objects.create(owner=owner, name='Test Hotel')
+        self.rooms = [Room.objects.create(hotel=self.hotel, room_number=str(number)) for number in (101, 102, 103, 104)]
+        self.guest = GuestProfile.objects.create(first_name='Ada', last_name='Guest', email='ada@example.com')
+
+    def book(self, room, check_in, check_out, status):
+        return Reservation.objects.create(
+            guest=self.guest, hotel=self.hotel, room=room,
+            check_in=check_in, check_out=check_out, rate=Decimal('100'), status=status,
+        )
+
+    def test_only_sold_nights_are_occupied(self):
+        self.book(self.rooms[0], date(2027, 1, 10), date(2027, 1, 11), 'confirmed')
+        self.book(self.rooms[1], date(2027, 1, 10), date(2027, 1, 11), 'pending')
+        self.book(self.rooms[2], date(2027, 1, 10), date(2027, 1, 11), 'no_show')
+
+        kpis = compute_daily_kpis(self.hotel, date(2027, 1, 10))
+
+        self.assertEqual(kpis['occupied_rooms'], 1)
+        self.assertEqual(kpis['room_revenue'], Decimal('100'))
+
+    def test_series_counts_only_sold_nights(self):
+        self.book(self.rooms[0], date(2027, 1, 10), date(2027, 1, 11), 'checked_in')
+        self.book(self.rooms[1], date(2027, 1, 10), date(2027, 1, 11), 'pending')
+        self.book(self.rooms[2], date(2027, 1, 10), date(2027, 1, 11), 'no_show')
+
+        series = get_occupancy_series(self.hotel, date(2027, 1, 10), date(2027, 1, 10))
+
+        self.assertEqual(series[0]['occupancy_rate'], 25)
+
+    def test_series_reads_rolled_up_days_from_the_rollup(self):
+        self.book(self.rooms[0], date(2027, 1, 10), date(2027, 1, 12), 'confirmed')
+        Metric.objects.create(property=self.hotel, metric_type='occupied_rooms', value=3, date=date(2027, 1, 10))
+
+        series = get_occupancy_series(self.hotel, date(2027, 1, 10), date(2027, 1, 11))
+
+        self.assertEqual([day['occupancy_rate'] for day in series], [75, 25])
+
+    def test_a_rollup_only_replaces_its_own_hotels_nights(self):
+        other_hotel = Hotel.objects.create(owner=self.hotel.owner, name='Other Hotel')
+        other_room = Room.objects.create(hotel=other_hotel, room_number='201')
+        self.book(self.rooms[0], date(2027, 1, 10), date(2027, 1, 11), 'confirmed')
+        Reservation.objects.create(
+            guest=self.guest, hotel=other_hotel, room=other_room,
+            check_in=date(2027, 1, 10), check_out=date(2027, 1, 11), rate=Decimal('100'), status='confirmed',
+        )
+        Metric.objects.create(property=self.hotel, metric_type='occupied_rooms', value=2, date=date(2027, 1, 10))
+
+        series = get_occupancy_series(None, date(2027, 1, 10), date(2027, 1, 10))
+
+        # 2 rolled-up nights of the first hotel plus the other hotel's night, out of 5 rooms
+        self.assertEqual(series[0]['occupancy_rate'], 60)
+
+class MonthlyRevenueTests(TestCase):
+    def test_no_months_is_an_empty_series(self):
+        self.assertEqual(get_monthly_revenue(months=0), [])
+
+class QueuedReportScopeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='x', role='Owner')
+        other_owner = User.objects.create_user(email='other@example.com', username='other', password='x', role='Owner')
+        self.guest = GuestProfile.objects.create(first_name='Ada', last_name='Guest', email='ada@example.com')
+        # The owner's two hotels leave the report without a single property
+        self.invoices = [
+            self.invoice_at(Hotel.objects.create(owner=self.owner, name='Hotel A')),
+            self.invoice_at(Hotel.objects.create(owner=self.owner, name='Hotel A2')),
+        ]
+        self.other_invoice = self.invoice_at(Hotel.objects.create(owner=other_owner, name='Hotel B'))
+
+    def invoice_at(self, hotel):
+        room = Room.objects.create(hotel=hotel, room_number='101')
+        reservation = Reservation.objects.create(
+            guest=self.guest, hotel=hotel, room=room,
+            check_in=date(2027, 1, 10), check_out=date(2027, 1, 11), rate=Decimal('100'), status='checked_out',
+        )
+        stay = Stay.objects.create(reservation=reservation, room=room, actual_check_in=timezone.now())
+        return Invoice.objects.create(stay=stay, guest=self.guest, due_date=date(2027, 1, 11), total_amount=Decimal('100'))
+
+    def test_worker_archives_only_the_hotels_the_report_was_queued_for(self):
+        today = timezone.now().date()
+        self.client.force_login(self.owner)
+        response = self.client.get(
+            reverse('reporting:export_invoice_archive'), {'start': today, 'end': today}, SERVER_NAME='localhost'
+        )
+        self.assertEqual(response.status_code, 202)
+
+        generate_report(response.json()['id'])
+
+        report = Report.objects.get(id=response.json()['id'])
+        self.assertEqual(report.status, 'completed')
+        with zipfile.ZipFile(report.file_path.path) as archive:
+            names = archive.namelist()
+        for invoice in self.invoices:
+            self.assertIn(f'invoices/invoice_{invoice.invoice_number}.pdf', names)
+        self.assertNotIn(f'invoices/invoice_{self.other_invoice.invoice_number}.pdf', names)
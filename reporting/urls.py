@@ -13,4 +13,7 @@ urlpatterns = [
     path('guests/export/', views.export_guest_pdf, name='export_guest_pdf'),
     path('performance/', views.performance_report, name='performance'),
     path('performance/export/', views.export_performance_pdf, name='export_performance_pdf'),
+    path('invoices/export/', views.export_invoice_archive, name='export_invoice_archive'),
+    path('jobs/<uuid:report_id>/', views.report_status, name='report_status'),
+    path('jobs/<uuid:report_id>/download/', views.download_report, name='download_report'),
 ]
\ No newline at end of file
@@ -0,0 +1,55 @@
+from django.db.models import Exists, OuterRef
+from hotels.models import Room
+from .models import RoomNight
+
+
+def booked_nights(check_in, check_out, exclude_reservation=None):
+    """Inventory rows that fall on any night of [check_in, check_out)"""
+    nights = RoomNight.objects.filter(date__gte=check_in, date__lt=check_out)
+
+    if exclude_reservation is not None:
+        nights = nights.exclude(reservation=exclude_reservation)
+
+    return nights
+
+
+def annotate_availability(rooms, check_in, check_out, exclude_reservation=None):
+    """
+    Annotate a Room queryset with ``is_booked`` for the given stay window.
+
+    The overlap test is a correlated EXISTS over the per-night inventory
+    (an index range lookup on room and date), so the whole queryset is
+    resolved in a single query regardless of the room count.
+    """
+    booked = booked_nights(check_in, check_out, exclude_reservation).filter(room=OuterRef('pk'))
+    return rooms.select_related('room_type', 'bed_type', 'floor').annotate(is_booked=Exists(booked))
+
+
+def get_available_rooms(hotel, check_in, check_out, exclude_reservation=None):
+    """
+    Rooms of ``hotel`` that are free for every night of [check_in, check_out).
+
+    Pass ``hotel=None`` to search across all hotels. ``exclude_reservation``
+    ignores that reservation's own hold, which is what check-in and edit
+    flows need when re-validating the room already on the booking.
+    """
+    rooms = Room.objects.all() if hotel is None else Room.objects.for_hotel(hotel)
+    return annotate_availability(rooms, check_in, check_out, exclude_reservation).filter(is_booked=False)
+
+
+def is_room_available(room, check_in, check_out, exclude_reservation=None):
+    """Check whether a single room is free for [check_in, check_out)"""
+    return not booked_nights(check_in, check_out, exclude_reservation).filter(room=room).exists()
+
+
+def serialize_room(room):
+    """JSON-friendly room summary used by the booking forms"""
+    return {
+        'id': str(room.room_id),
+        'number': room.room_number,
+        'type': room.room_type.name if room.room_type else 'Standard',
+        'category': room.room_type.name if room.room_type else 'Standard',
+        'price': str(room.price or 0),
+        'bed': room.bed_type.name if room.bed_type else 'Standard',
+        'floor': room.floor.name if room.floor else 'Ground Floor'
+    }
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from hotels.models import Room
+from .models import Reservation, RoomNight, Stay
+
+
+class RoomUnavailable(Exception):
+    """A reservation needs a night its room is already held for"""
+
+
+def held_nights(reservation):
+    """
+    Nights (as dates) a reservation holds its room for.
+
+    Cancelled and soft-deleted reservations hold nothing. A checked-out
+    reservation keeps the nights actually stayed so history stays intact,
+    but releases everything from the departure date on.
+    """
+    if reservation.deleted_at or reservation.status == 'cancelled':
+        return []
+
+    last_night = reservation.check_out
+    if reservation.status == 'checked_out':
+        try:
+            departed_at = reservation.stay.actual_check_out
+        except Stay.DoesNotExist:
+            departed_at = None
+        # Without a stay record the checkout save is the best departure signal
+        departed_at = departed_at or reservation.updated_at
+        if departed_at:
+            last_night = min(last_night, departed_at.date())
+
+    nights = []
+    night = reservation.check_in
+    while night < last_night:
+        nights.append(night)
+        night += timedelta(days=1)
+    return nights
+
+
+def sync_reservation_nights(reservation):
+    """
+    Bring the inventory rows of a single reservation up to date.
+
+    Called when a reservation is created or a save changes its room,
+    dates, status or deletion (create, edit, cancel, check-in and
+    check-out). Raises RoomUnavailable when another reservation holds
+    one of the nights: the (room, date) unique constraint is the
+    availability check, so concurrent bookings cannot both succeed.
+    Callers save the reservation inside ``transaction.atomic()`` so a
+    rejected booking is rolled back with it.
+    """
+    nights = held_nights(reservation)
+    try:
+        with transaction.atomic():
+            RoomNight.objects.filter(reservation=reservation).delete()
+            RoomNight.objects.bulk_create([
+                RoomNight(hotel_id=reservation.hotel_id, room_id=reservation.room_id, reservation=reservation, date=night)
+                for night in nights
+            ])
+    except IntegrityError:
+        raise RoomUnavailable(f'Room {reservation.room_id} is already booked between {reservation.check_in} and {reservation.check_out}')
+
+
+def rebuild_room_nights(hotel=None, batch_size=1000):
+    """
+    Rebuild the inventory from reservations, for one hotel or all of them.
+    Where legacy data double-books a night, the earliest reservation keeps it.
+    """
+    reservations = Reservation.objects.filter(deleted_at__isnull=True).exclude(status='cancelled')
+    nights = RoomNight.objects.all()
+    if hotel is not None:
+        reservations = reservations.filter(hotel=hotel)
+        nights = nights.filter(hotel=hotel)
+
+    created = 0
+    with transaction.atomic():
+        nights.delete()
+        batch = []
+        for reservation in reservations.select_related('stay').order_by('created_at').iterator(chunk_size=batch_size):
+            for night in held_nights(reservation):
+                batch.append(RoomNight(hotel_id=reservation.hotel_id, room_id=reservation.room_id,
+                                       reservation_id=reservation.pk, date=night))
+            if len(batch) >= batch_size:
+                RoomNight.objects.bulk_create(batch, ignore_conflicts=True)
+                created += len(batch)
+                batch = []
+        if batch:
+            RoomNight.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+def free_rooms_per_night(hotel, start_date, end_date):
+    """
+    Free and occupied room counts for every night in [start_date, end_date].
+
+    Runs two queries regardless of the window length: the room count and
+    one grouped count over the (hotel, date) index.
+    """
+    total_rooms = Room.objects.filter(hotel=hotel).count()
+    occupied = dict(
+        RoomNight.objects.filter(hotel=hotel, date__range=[start_date, end_date])
+        .values('date')
+        .annotate(rooms=Count('id'))
+        .values_list('date', 'rooms')
+    )
+
+    data = []
+    night = start_date
+    while night <= end_date:
+        occupied_rooms = occupied.get(night, 0)
+        data.append({
+            'date': night,
+            'total_rooms': total_rooms,
+            'occupied_rooms': occupied_rooms,
+            'free_rooms': max(total_rooms - occupied_rooms, 0),
+        })
+        night += timedelta(days=1)
+    return data
+
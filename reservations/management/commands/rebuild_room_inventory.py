@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from hotels.models import Hotel
+from reservations.inventory import rebuild_room_nights
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-night room inventory from reservations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotel', type=int, help='Only rebuild this hotel (hotel_id)')
+
+    def handle(self, *args, **options):
+        hotels = Hotel.objects.all()
+        if options['hotel']:
+            hotels = hotels.filter(hotel_id=options['hotel'])
+        
+        for hotel in hotels:
+            created = rebuild_room_nights(hotel)
+            self.stdout.write(f'{hotel.name}: {created} room-nights')
+        
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt room inventory'))
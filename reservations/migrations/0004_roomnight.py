@@ -0,0 +1,60 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+from datetime import timedelta
+
+
+def populate_room_nights(apps, schema_editor):
+    """Backfill the inventory from existing reservations"""
+    Reservation = apps.get_model('reservations', 'Reservation')
+    Stay = apps.get_model('reservations', 'Stay')
+    RoomNight = apps.get_model('reservations', 'RoomNight')
+
+    departures = dict(
+        Stay.objects.filter(actual_check_out__isnull=False).values_list('reservation_id', 'actual_check_out')
+    )
+
+    batch = []
+    reservations = Reservation.objects.filter(deleted_at__isnull=True).exclude(status='cancelled')
+    for reservation in reservations.order_by('created_at').iterator():
+        last_night = reservation.check_out
+        if reservation.status == 'checked_out':
+            departed_at = departures.get(reservation.pk, reservation.updated_at)
+            last_night = min(last_night, departed_at.date())
+        night = reservation.check_in
+        while night < last_night:
+            batch.append(RoomNight(hotel_id=reservation.hotel_id, room_id=reservation.room_id,
+                                   reservation_id=reservation.pk, date=night))
+            night += timedelta(days=1)
+        if len(batch) >= 1000:
+            RoomNight.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    RoomNight.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0025_alter_room_has_ac_alter_room_has_tv_and_more'),
+        ('reservations', '0003_reservationexpense'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_nights', to='hotels.hotel')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='reservations.reservation')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='hotels.room')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['hotel', 'date'], name='reservation_hotel_i_a5e4e9_idx')],
+                'unique_together': {('room', 'date')},
+            },
+        ),
+        migrations.RunPython(populate_room_nights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0004_roomnight'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['hotel', 'status', 'check_in'], name='reservation_hotel_i_bfed68_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:59
+
+from django.db import migrations, models
+import django.db.models.functions.datetime
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0005_reservation_reservation_hotel_i_bfed68_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['check_in', 'hotel'], name='reservation_arrivals_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('status__in', ['confirmed', 'checked_in'])), fields=['room', 'check_in', 'check_out'], name='reservation_room_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(condition=models.Q(('actual_check_out__isnull', True)), fields=['room', 'actual_check_in'], name='stay_room_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(django.db.models.functions.datetime.TruncDate('actual_check_in'), name='stay_check_in_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(django.db.models.functions.datetime.TruncDate('actual_check_out'), name='stay_check_out_date_idx'),
+        ),
+    ]
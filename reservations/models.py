@@ -1,8 +1,14 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from crm.models import GuestProfile
+from hotels.querysets import HotelScopedQuerySet
 import uuid
 
+# Reservations that mark a room as taken for the night even before check-in
+OCCUPYING_STATUSES = ['confirmed', 'checked_in']
+
 class Reservation(models.Model):
     """Reservation model for booking management"""
     STATUS_CHOICES = [
@@ -14,6 +20,16 @@ class Reservation(models.Model):
         ('no_show', 'No Show'),
     ]
     
+    # Statuses in which a reservation no longer holds its room
+    RELEASED_STATUSES = ['cancelled', 'checked_out']
+    
+    # Statuses in which it holds the room for the night, even before check-in
+    OCCUPYING_STATUSES = OCCUPYING_STATUSES
+    
+    # Statuses whose held nights are sold: booked, in house or stayed (a
+    # checked-out reservation only keeps the nights actually stayed)
+    SOLD_STATUSES = OCCUPYING_STATUSES + ['checked_out']
+    
     BOOKING_SOURCE_CHOICES = [
         ('direct', 'Direct'),
         ('online', 'Online'),
@@ -38,6 +54,21 @@ class Reservation(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['hotel', 'status', 'check_in']),
+            # Today's arrivals, of one hotel or all of them
+            models.Index(fields=['check_in', 'hotel'], name='reservation_arrivals_idx'),
+            # Room overlap tests only ever look at occupying reservations
+            models.Index(
+                fields=['room', 'check_in', 'check_out'],
+                condition=Q(status__in=OCCUPYING_STATUSES),
+                name='reservation_room_active_idx',
+            ),
+        ]
+    
     def __str__(self):
         return f"Reservation {self.id} - {self.guest.full_name}"
     
@@ -51,6 +82,8 @@ class Reservation(models.Model):
 
 class Stay(models.Model):
     """Actual stay record when guest checks in"""
+    HOTEL_LOOKUP = 'reservation__hotel'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, related_name='stay')
     room = models.ForeignKey('hotels.Room', on_delete=models.CASCADE, related_name='stays')
@@ -59,9 +92,42 @@ class Stay(models.Model):
     notes = models.TextField(blank=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
+    objects = HotelScopedQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['room', 'actual_check_in'],
+                condition=Q(actual_check_out__isnull=True),
+                name='stay_room_open_idx',
+            ),
+            # For the actual_check_in__date / actual_check_out__date lookups
+            models.Index(TruncDate('actual_check_in'), name='stay_check_in_date_idx'),
+            models.Index(TruncDate('actual_check_out'), name='stay_check_out_date_idx'),
+        ]
+    
     def __str__(self):
         return f"Stay {self.id} - Room {self.room.room_number}"
 
+class RoomNight(models.Model):
+    """Materialized room inventory: one row per room per night held by a reservation"""
+    hotel = models.ForeignKey('hotels.Hotel', on_delete=models.CASCADE, related_name='room_nights')
+    room = models.ForeignKey('hotels.Room', on_delete=models.CASCADE, related_name='nights')
+    reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE, related_name='nights')
+    date = models.DateField()
+    
+    objects = HotelScopedQuerySet.as_manager()
+    
+    class Meta:
+        unique_together = ['room', 'date']
+        indexes = [
+            models.Index(fields=['hotel', 'date']),
+        ]
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"Room {self.room_id} - {self.date}"
+
 class ReservationExpense(models.Model):
     """Additional expenses during guest stay"""
     EXPENSE_TYPE_CHOICES = [
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from hotels.change_tracking import get_changes, track_changes
+from .models import Reservation
+from .inventory import sync_reservation_nights
+
+# Fields that decide which nights a reservation holds
+INVENTORY_FIELDS = ['hotel_id', 'room_id', 'check_in', 'check_out', 'status', 'deleted_at']
+
+track_changes('reservations.Reservation', INVENTORY_FIELDS)
+
+@receiver(post_save, sender=Reservation)
+def update_room_inventory(sender, instance, created, **kwargs):
+    """Keep the per-night room inventory in step with the reservation"""
+    if created or get_changes(instance).keys() & set(INVENTORY_FIELDS):
+        sync_reservation_nights(instance)
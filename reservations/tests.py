@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import skipUnless
+from django.db import connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+from accounts.models import User
+from billing.models import Invoice
+from crm.models import GuestProfile
+from hotels.models import Hotel, Room
+from .availability import is_room_available
+from .inventory import RoomUnavailable
+from .models import Reservation, RoomNight, Stay
+
+class RoomInventoryTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(email='owner@example.com', username='owner', password='x')
+        self.hotel = Hotel.objects.create(owner=owner, name='Test Hotel')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101')
+        self.guest = GuestProfile.objects.create(first_name='Ada', last_name='Guest', email='ada@example.com')
+
+    def book(self, check_in, check_out, status='confirmed'):
+        with transaction.atomic():
+            return Reservation.objects.create(
+                guest=self.guest, hotel=self.hotel, room=self.room,
+                check_in=check_in, check_out=check_out, rate=Decimal('100'), status=status,
+            )
+
+    def test_overlapping_booking_is_rejected(self):
+        first = self.book(date(2027, 1, 10), date(2027, 1, 14))
+
+        with self.assertRaises(RoomUnavailable):
+            self.book(date(2027, 1, 12), date(2027, 1, 15))
+
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(set(RoomNight.objects.values_list('reservation_id', flat=True)), {first.pk})
+
+    def test_cancelled_nights_can_be_booked_again(self):
+        first = self.book(date(2027, 1, 10), date(2027, 1, 14))
+        with self.assertRaises(RoomUnavailable):
+            self.book(date(2027, 1, 12), date(2027, 1, 15))
+
+        first.status = 'cancelled'
+        first.save()
+        self.assertTrue(is_room_available(self.room, date(2027, 1, 12), date(2027, 1, 15)))
+
+        second = self.book(date(2027, 1, 12), date(2027, 1, 15))
+        self.assertEqual(
+            list(second.nights.values_list('date', flat=True)),
+            [date(2027, 1, 12), date(2027, 1, 13), date(2027, 1, 14)],
+        )
+        self.assertFalse(is_room_available(self.room, date(2027, 1, 13), date(2027, 1, 14)))
+
+@skipUnless(connection.vendor == 'postgresql', 'Index usage is checked on PostgreSQL')
+class HotQueryPlanTests(TestCase):
+    """The hottest reservation, stay and invoice predicates are served by their indexes"""
+
+    def setUp(self):
+        # Small test tables are cheaper to scan than to search, so only a
+        # missing index may leave a sequential scan in the plan
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        self.now = timezone.now()
+        self.today = self.now.date()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f'{index_name} is not used:\n{plan}')
+
+    def test_reservation_overlap(self):
+        self.assertUsesIndex(Reservation.objects.filter(
+            room_id=1, check_in__lt=self.today + timedelta(days=3), check_out__gt=self.today,
+            status__in=Reservation.OCCUPYING_STATUSES,
+        ), 'reservation_room_active_idx')
+
+    def test_arrivals_today(self):
+        self.assertUsesIndex(Reservation.objects.filter(hotel_id=1, check_in=self.today), 'reservation_arrivals_idx')
+
+    def test_open_stay_of_a_room(self):
+        self.assertUsesIndex(
+            Stay.objects.filter(room_id=1, actual_check_in__lte=self.now, actual_check_out__isnull=True),
+            'stay_room_open_idx',
+        )
+
+    def test_check_ins_today(self):
+        self.assertUsesIndex(Stay.objects.filter(actual_check_in__date=self.today), 'stay_check_in_date_idx')
+
+    def test_check_outs_today(self):
+        self.assertUsesIndex(Stay.objects.filter(actual_check_out__date=self.today), 'stay_check_out_date_idx')
+
+    def test_paid_invoices_this_month(self):
+        self.assertUsesIndex(
+            Invoice.objects.filter(status='paid', created_at__date__gte=self.today.replace(day=1)),
+            'invoice_status_created_idx',
+        )
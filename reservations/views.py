@@ -1,17 +1,38 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
 from django.http import JsonResponse
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from .models import Reservation, Stay
+from .availability import annotate_availability, is_room_available, serialize_room
+from .inventory import RoomUnavailable
 from hotels.models import Hotel, Room
 from crm.models import GuestProfile
 from billing.models import Invoice, ChargeItem, Payment
 from django.utils import timezone
-from accounts.decorators import owner_or_permission_required
+from accounts.decorators import async_login_required, owner_or_permission_required
+from accounts.export_utils import EXPORT_FORMATS, export_response
 from django.db.models import Q
 
+RESERVATION_EXPORT_COLUMNS = [
+    ('Reservation ID', 'id'),
+    ('Hotel', 'hotel__name'),
+    ('Guest First Name', 'guest__first_name'),
+    ('Guest Last Name', 'guest__last_name'),
+    ('Guest Email', 'guest__email'),
+    ('Room', 'room__room_number'),
+    ('Check-in', 'check_in'),
+    ('Check-out', 'check_out'),
+    ('Adults', 'adults'),
+    ('Children', 'children'),
+    ('Status', 'status'),
+    ('Booking Source', 'booking_source'),
+    ('Rate', 'rate'),
+    ('Created', 'created_at'),
+]
+
 @owner_or_permission_required('view_reservation')
 def reservation_list(request):
     """List reservations based on user role with filtering"""
@@ -65,6 +86,9 @@ def reservation_list(request):
     if checkin_to:
         reservations = reservations.filter(check_in__lte=checkin_to)
     
+    if request.GET.get('export') in EXPORT_FORMATS:
+        return export_response(request, reservations, RESERVATION_EXPORT_COLUMNS, 'reservations')
+    
     # Check permissions
     can_add_reservations = request.user.role == 'Owner' or request.user.can_add_reservations
     can_change_reservations = request.user.role == 'Owner' or request.user.can_change_reservations
@@ -137,30 +161,45 @@ def reservation_create(request):
             messages.error(request, f'Room with ID {room_id} not found. Please ensure rooms are created for this hotel.')
             return redirect('reservations:create')
         
+        if check_out <= check_in:
+            messages.error(request, 'Check-out date must be after check-in date.')
+            return redirect('reservations:create')
+        
+        if not is_room_available(room, check_in, check_out):
+            messages.error(request, f'Room {room.room_number} is already booked for the selected dates.')
+            return redirect('reservations:create')
+        
         # Determine status based on reservation type
         status = 'checked_in' if reservation_type == 'booking' else 'confirmed'
         
-        reservation = Reservation.objects.create(
-            guest=guest,
-            hotel=hotel,
-            room=room,
-            check_in=check_in,
-            check_out=check_out,
-            adults=adults,
-            children=children,
-            rate=room.price,
-            status=status,
-            booking_source='direct',
-            special_requests=special_requests
-        )
-        
-        # Create stay record if it's an immediate booking
-        if reservation_type == 'booking':
-            Stay.objects.create(
-                reservation=reservation,
-                room=room,
-                actual_check_in=timezone.now()
-            )
+        # Holding the room nights is the authoritative availability check:
+        # a booking that raced this one makes the whole create roll back
+        try:
+            with transaction.atomic():
+                reservation = Reservation.objects.create(
+                    guest=guest,
+                    hotel=hotel,
+                    room=room,
+                    check_in=check_in,
+                    check_out=check_out,
+                    adults=adults,
+                    children=children,
+                    rate=room.price,
+                    status=status,
+                    booking_source='direct',
+                    special_requests=special_requests
+                )
+                
+                # Create stay record if it's an immediate booking
+                if reservation_type == 'booking':
+                    Stay.objects.create(
+                        reservation=reservation,
+                        room=room,
+                        actual_check_in=timezone.now()
+                    )
+        except RoomUnavailable:
+            messages.error(request, f'Room {room.room_number} is already booked for the selected dates.')
+            return redirect('reservations:create')
         
         # Update room status
         if reservation_type == 'booking':
@@ -194,8 +233,8 @@ def reservation_create(request):
         'default_hotel': hotels.first() if hotels.exists() else None
     })
 
-@login_required
-def check_room_availability(request):
+@async_login_required
+async def check_room_availability(request):
     """Check room availability for selected dates"""
     hotel_id = request.GET.get('hotel_id')
     check_in = request.GET.get('check_in')
@@ -211,42 +250,15 @@ def check_room_availability(request):
         check_in_date = datetime.strptime(check_in, '%Y-%m-%d').date()
         check_out_date = datetime.strptime(check_out, '%Y-%m-%d').date()
         
-        # Get hotel and all its rooms
-        hotel = Hotel.objects.get(hotel_id=hotel_id)
-        all_rooms = Room.objects.filter(hotel=hotel)
-        
-        available_rooms = []
+        # Resolve availability for every room of the hotel in one query
+        hotel = await Hotel.objects.aget(hotel_id=hotel_id)
+        all_rooms = [room async for room in annotate_availability(Room.objects.filter(hotel=hotel), check_in_date, check_out_date)]
         
-        # Check each room individually
-        for room in all_rooms:
-            is_available = True
-            
-            # Check for overlapping reservations
-            overlapping_reservations = Reservation.objects.filter(
-                room=room,
-                check_in__lt=check_out_date,
-                check_out__gt=check_in_date
-            ).exclude(status__in=['cancelled', 'checked_out'])
-            
-            # If there are any overlapping reservations, room is not available
-            if overlapping_reservations.exists():
-                is_available = False
-            
-            # If room is available, add to list
-            if is_available:
-                available_rooms.append({
-                    'id': str(room.room_id),
-                    'number': room.room_number,
-                    'type': room.room_type.name if room.room_type else 'Standard',
-                    'category': room.room_type.name if room.room_type else 'Standard',
-                    'price': str(room.price or 0),
-                    'bed': room.bed_type.name if room.bed_type else 'Standard',
-                    'floor': room.floor.name if room.floor else 'Ground Floor'
-                })
+        available_rooms = [serialize_room(room) for room in all_rooms if not room.is_booked]
         
         return JsonResponse({
             'rooms': available_rooms,
-            'total_rooms': all_rooms.count(),
+            'total_rooms': len(all_rooms),
             'available_count': len(available_rooms),
             'dates': {
                 'check_in': check_in,
@@ -255,9 +267,7 @@ def check_room_availability(request):
             'debug': {
                 'hotel_id': hotel_id,
                 'hotel_name': hotel.name,
-                'all_room_numbers': [r.room_number for r in all_rooms],
-                'reservations_found': Reservation.objects.filter(hotel=hotel).count(),
-                'active_reservations': Reservation.objects.filter(hotel=hotel).exclude(status__in=['cancelled', 'checked_out']).count()
+                'all_room_numbers': [r.room_number for r in all_rooms]
             }
         })
         
@@ -533,14 +543,10 @@ def generate_invoice(stay):
     """Generate invoice for checkout with Pakistan tax system"""
     reservation = stay.reservation
     
-    # Generate unique invoice number
-    invoice_number = f"INV-{timezone.now().strftime('%Y%m%d')}-{str(stay.id)[:8].upper()}"
-    
-    # Create invoice
+    # Create invoice, numbered on save
     invoice = Invoice.objects.create(
         stay=stay,
         guest=reservation.guest,
-        invoice_number=invoice_number,
         due_date=timezone.now().date() + timedelta(days=30),
         currency='PKR',
         status='draft'
@@ -553,40 +559,36 @@ def generate_invoice(stay):
     
     room_total = reservation.rate * nights
     
-    # Add room charge item
-    ChargeItem.objects.create(
-        invoice=invoice,
-        description=f"Room {reservation.room.room_number} - {nights} night(s)",
-        charge_type='room',
-        quantity=nights,
-        unit_price=reservation.rate,
-        amount=room_total
-    )
-    
     # Pakistan tax calculations
     subtotal = room_total
     
     # Service charges (10%)
     service_charge = subtotal * Decimal('0.10')
-    ChargeItem.objects.create(
-        invoice=invoice,
-        description="Service Charges (10%)",
-        charge_type='service',
-        quantity=1,
-        unit_price=service_charge,
-        amount=service_charge
-    )
     
     # Sales Tax (17% in Pakistan)
     tax_amount = (subtotal + service_charge) * Decimal('0.17')
-    ChargeItem.objects.create(
-        invoice=invoice,
-        description="Sales Tax (17%)",
-        charge_type='tax',
-        quantity=1,
-        unit_price=tax_amount,
-        amount=tax_amount
-    )
+    
+    # Add room, service and tax charge items in one insert
+    invoice.post_charges([
+        ChargeItem(
+            description=f"Room {reservation.room.room_number} - {nights} night(s)",
+            charge_type='room',
+            quantity=nights,
+            unit_price=reservation.rate,
+        ),
+        ChargeItem(
+            description="Service Charges (10%)",
+            charge_type='service',
+            quantity=1,
+            unit_price=service_charge,
+        ),
+        ChargeItem(
+            description="Sales Tax (17%)",
+            charge_type='tax',
+            quantity=1,
+            unit_price=tax_amount,
+        ),
+    ])
     
     # Update invoice totals
     invoice.subtotal = subtotal
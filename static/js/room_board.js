@@ -0,0 +1,68 @@
+// Live Room Board: applies room status changes pushed by the server
+//
+// Markup:
+//   data-room-id="<id>" data-room-status="<status>"  room tile
+//   data-status-style="<part>"                        element (in a tile) restyled per status
+//   data-room-status-text                             element (in a tile) showing the status
+//   data-status-count="<status>"                      counter of rooms in a status
+//   data-status-column="<status>"                     container the tiles of a status move to
+class RoomBoard {
+    // styles: {part: {status: 'classes', default: 'classes'}}
+    constructor(url, styles = {}) {
+        this.url = url;
+        this.styles = styles;
+    }
+
+    // Returns false when the browser cannot receive server events
+    connect() {
+        if (!window.EventSource) return false;
+
+        this.source = new EventSource(this.url);
+        this.source.addEventListener('room', (e) => this.applyChange(JSON.parse(e.data)));
+        // Missed more changes than the server keeps
+        this.source.addEventListener('reload', () => location.reload());
+        return true;
+    }
+
+    applyChange(change) {
+        const tiles = document.querySelectorAll(`[data-room-id="${change.room_id}"]`);
+        // Rooms filtered out of this page are left alone
+        if (!tiles.length) return;
+
+        const oldStatus = tiles[0].dataset.roomStatus;
+        if (oldStatus === change.status) return;
+
+        tiles.forEach(tile => {
+            tile.dataset.roomStatus = change.status;
+            tile.querySelectorAll('[data-room-status-text]').forEach(el => {
+                el.textContent = change.status;
+            });
+            [tile, ...tile.querySelectorAll('[data-status-style]')].forEach(el => {
+                this.restyle(el, change.status);
+            });
+
+            if (tile.parentElement.dataset.statusColumn !== undefined) {
+                const column = document.querySelector(`[data-status-column="${change.status}"]`);
+                if (column) column.appendChild(tile);
+                else tile.remove();
+            }
+        });
+
+        this.adjustCount(oldStatus, -1);
+        this.adjustCount(change.status, 1);
+    }
+
+    restyle(element, status) {
+        const styles = this.styles[element.dataset.statusStyle];
+        if (!styles) return;
+
+        Object.values(styles).forEach(classes => element.classList.remove(...classes.split(' ')));
+        element.classList.add(...(styles[status] || styles.default).split(' '));
+    }
+
+    adjustCount(status, delta) {
+        document.querySelectorAll(`[data-status-count="${status}"]`).forEach(el => {
+            el.textContent = Math.max(0, parseInt(el.textContent, 10) + delta);
+        });
+    }
+}